@@ -0,0 +1,375 @@
+# ValorantTrueStretch_Backup.py
+# Content-addressed backup store: each unique file body is stored once (gzip),
+# every apply run gets a small JSON manifest, and old runs are evicted LRU-first
+# once the store goes over its size/count budget.
+# Made by GlitchFL (credit required if you share)
+#
+# Layout under the backup root:
+#   objects/<aa>/<sha256>.gz      compressed blobs (config bodies and .patch diffs)
+#   manifests/<run id>.json       {"run_id", "created", "last_used", "kind", "entries": [...]}
+#   catalog.sqlite3               index of manifest entries by source path / time / run id
+#                                 (derived data: rebuilt from manifests when missing)
+
+import os
+import json
+import time
+import hashlib
+import threading
+import uuid
+import datetime as _dt
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_RUNS = 200
+
+# One lock per process guards manifest writes against pruning (batch runs share a root)
+_LOCK = threading.RLock()
+
+def new_run_id():
+    return f"{_dt.datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+def _atomic_write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def path_key(path) -> str:
+    """Normalized source path used as catalog key (case-insensitive on Windows)."""
+    return os.path.normcase(os.path.abspath(str(path)))
+
+def parse_when(s: str) -> float:
+    """Epoch seconds from a run-id style stamp (20250131_2359[59]) or an ISO date/time."""
+    s = s.strip()
+    for fmt in ("%Y%m%d_%H%M%S", "%Y%m%d_%H%M", "%Y%m%d"):
+        try:
+            return _dt.datetime.strptime(s, fmt).timestamp()
+        except ValueError:
+            pass
+    return _dt.datetime.fromisoformat(s).timestamp()
+
+class BackupCatalog:
+    """SQLite index over the manifests; every lookup is a single indexed query."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY, created REAL NOT NULL, kind TEXT NOT NULL DEFAULT 'apply'
+        );
+        CREATE TABLE IF NOT EXISTS entries (
+            run_id TEXT NOT NULL, src_key TEXT NOT NULL, src TEXT NOT NULL, time REAL NOT NULL,
+            sha256 TEXT NOT NULL, size INTEGER NOT NULL, patch TEXT
+        );
+        CREATE INDEX IF NOT EXISTS ix_entries_src_time ON entries(src_key, time);
+        CREATE INDEX IF NOT EXISTS ix_entries_run ON entries(run_id);
+        CREATE INDEX IF NOT EXISTS ix_runs_created ON runs(created);
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def connect(self):
+        import sqlite3  # lazy: plain previews/CLI startup never open the catalog
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(self.path, timeout=30)
+        con.row_factory = sqlite3.Row
+        con.executescript(self.SCHEMA)
+        return con
+
+    def add(self, man, entries):
+        """Index a run's new manifest entries (one transaction)."""
+        with self.connect() as con:
+            con.execute("INSERT OR IGNORE INTO runs VALUES (?, ?, ?)",
+                        (man["run_id"], man["created"], man.get("kind", "apply")))
+            con.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                (man["run_id"], path_key(e["src"]), e["src"], e["time"], e["sha256"], e["size"], e.get("patch"))
+                for e in entries
+            ])
+        con.close()
+
+    def drop_runs(self, run_ids):
+        if not run_ids:
+            return
+        with self.connect() as con:
+            con.executemany("DELETE FROM entries WHERE run_id = ?", [(r,) for r in run_ids])
+            con.executemany("DELETE FROM runs WHERE run_id = ?", [(r,) for r in run_ids])
+        con.close()
+
+    def rebuild(self, manifests):
+        with self.connect() as con:
+            con.execute("DELETE FROM entries")
+            con.execute("DELETE FROM runs")
+        con.close()
+        for man in manifests:
+            if man.get("entries"):
+                self.add(man, man["entries"])
+
+    def _one(self, sql, args):
+        con = self.connect()
+        try:
+            row = con.execute(sql, args).fetchone()
+            return dict(row) if row else None
+        finally:
+            con.close()
+
+    def _all(self, sql, args=()):
+        con = self.connect()
+        try:
+            return [dict(r) for r in con.execute(sql, args).fetchall()]
+        finally:
+            con.close()
+
+    def latest(self, src, before: float | None = None, kind: str | None = None):
+        """Newest backup of `src` (optionally taken at/before `before`)."""
+        sql = "SELECT e.* FROM entries e JOIN runs r USING (run_id) WHERE e.src_key = ?"
+        args = [path_key(src)]
+        if before is not None:
+            sql += " AND e.time <= ?"; args.append(before)
+        if kind is not None:
+            sql += " AND r.kind = ?"; args.append(kind)
+        return self._one(sql + " ORDER BY e.time DESC LIMIT 1", args)
+
+    def run_entries(self, run_id):
+        """First backup per source file in `run_id` (the state before that run touched it)."""
+        return self._all(
+            # SQLite takes the bare columns from the MIN(time) row of each group
+            "SELECT *, MIN(time) AS first_time FROM entries WHERE run_id = ? GROUP BY src_key ORDER BY time",
+            (run_id,),
+        )
+
+    def history(self, src, limit=50):
+        return self._all("SELECT * FROM entries WHERE src_key = ? ORDER BY time DESC LIMIT ?",
+                         (path_key(src), limit))
+
+    def last_run(self, kind: str | None = "apply"):
+        if kind is None:
+            return self._one("SELECT * FROM runs ORDER BY created DESC LIMIT 1", ())
+        return self._one("SELECT * FROM runs WHERE kind = ? ORDER BY created DESC LIMIT 1", (kind,))
+
+    def list_runs(self, limit=50):
+        return self._all(
+            "SELECT r.run_id, r.created, r.kind, COUNT(e.src_key) AS files FROM runs r "
+            "LEFT JOIN entries e USING (run_id) GROUP BY r.run_id ORDER BY r.created DESC LIMIT ?",
+            (limit,),
+        )
+
+class BackupStore:
+    def __init__(self, root: Path, max_bytes: int | None = DEFAULT_MAX_BYTES,
+                 max_runs: int | None = DEFAULT_MAX_RUNS):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.manifests = self.root / "manifests"
+        self.max_bytes = max_bytes
+        self.max_runs = max_runs
+        self.catalog = BackupCatalog(self.root / "catalog.sqlite3")
+        if self.manifests.is_dir() and not self.catalog.path.exists():
+            with _LOCK:
+                if not self.catalog.path.exists():
+                    self.catalog.rebuild(self.runs())
+
+    # ----- Blobs
+    def blob_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}.gz"
+
+    def put_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        dst = self.blob_path(digest)
+        if not dst.is_file():
+            import gzip
+            _atomic_write(dst, gzip.compress(data, mtime=0))
+        return digest
+
+    def get_blob(self, digest: str) -> bytes:
+        import gzip
+        return gzip.decompress(self.blob_path(digest).read_bytes())
+
+    # ----- Manifests
+    def manifest_path(self, run_id: str) -> Path:
+        return self.manifests / f"{run_id}.json"
+
+    def load_manifest(self, run_id: str):
+        return json.loads(self.manifest_path(run_id).read_text(encoding="utf-8"))
+
+    def _save_manifest(self, man):
+        _atomic_write(self.manifest_path(man["run_id"]), json.dumps(man, indent=2).encode("utf-8"))
+
+    def runs(self):
+        """Manifests sorted oldest -> newest by last use."""
+        out = []
+        if self.manifests.is_dir():
+            for p in self.manifests.glob("*.json"):
+                try:
+                    out.append(json.loads(p.read_text(encoding="utf-8")))
+                except (OSError, ValueError):
+                    continue
+        out.sort(key=lambda m: (m.get("last_used", 0), m["run_id"]))
+        return out
+
+    def touch(self, run_id: str):
+        """Mark a run as recently used so eviction keeps it longer."""
+        with _LOCK:
+            man = self.load_manifest(run_id)
+            man["last_used"] = time.time()
+            self._save_manifest(man)
+
+    # ----- Backups
+    def backup(self, src_path: Path, run_id: str, diff_text: str | None = None, kind: str = "apply",
+               data: bytes | None = None):
+        """Store `src_path` (or its already-read `data`) under run `run_id`; returns the blob path."""
+        return self.backup_many([(src_path, data, diff_text)], run_id, kind)[0]
+
+    def backup_many(self, items, run_id: str, kind: str = "apply", map_func=None):
+        """Store each (src_path, data or None, diff_text or None) under run `run_id`; returns the blob paths.
+
+        Blobs are written outside the lock (`map_func(fn, items)` may run them concurrently);
+        the run manifest and the catalog are then updated once for the whole batch.
+        """
+        run = map_func or (lambda fn, xs: [fn(x) for x in xs])
+
+        def put(item):
+            src, data, diff_text = item
+            if data is None:
+                data = Path(src).read_bytes()
+            patch = diff_text.encode("utf-8") if diff_text else None
+            entry = {
+                "src": str(src),
+                "sha256": self.put_blob(data),
+                "size": len(data),
+                "patch": self.put_blob(patch) if patch else None,
+                "time": time.time(),
+            }
+            return entry, data, patch
+
+        stored = run(put, list(items))
+        if not stored:
+            return []
+        entries = [entry for entry, _, _ in stored]
+        with _LOCK:
+            # Blobs may have been pruned between put_blob and here; re-put under the lock
+            for entry, data, patch in stored:
+                if not self.blob_path(entry["sha256"]).is_file():
+                    self.put_blob(data)
+                if patch and not self.blob_path(entry["patch"]).is_file():
+                    self.put_blob(patch)
+            try:
+                man = self.load_manifest(run_id)
+            except (OSError, ValueError):
+                now = time.time()
+                man = {"run_id": run_id, "created": now, "last_used": now, "kind": kind, "entries": []}
+            man["entries"].extend(entries)
+            man["last_used"] = time.time()
+            self._save_manifest(man)
+            self.catalog.add(man, entries)
+        return [self.blob_path(e["sha256"]) for e in entries]
+
+    # ----- Restore
+    def _restore(self, entries, run_id: str | None, journal_dir: Path | None):
+        """Write cataloged backups back to their source paths in one journaled Transaction.
+
+        Current files are backed up first under `run_id` (kind "restore"), so every restore
+        can itself be rolled back. Returns the entries that changed a file.
+        """
+        from ValorantTrueStretch_Journal import Transaction, JOURNAL_DIR  # Journal imports this module
+        todo, current = [], []
+        for entry in entries:
+            src = Path(entry["src"])
+            data = self.get_blob(entry["sha256"])
+            if src.is_file():
+                old = src.read_bytes()
+                if old == data:
+                    continue
+                current.append((src, old, None))
+            todo.append((entry, src, data))
+        if not todo:
+            return []
+        if current:
+            self.backup_many(current, run_id or new_run_id(), kind="restore")
+        for _, src, _ in todo:
+            src.parent.mkdir(parents=True, exist_ok=True)
+        Transaction(journal_dir or JOURNAL_DIR).commit([(src, data) for _, src, data in todo])
+        for used in {entry["run_id"] for entry, _, _ in todo}:
+            try:
+                self.touch(used)
+            except (OSError, ValueError):
+                pass
+        return [entry for entry, _, _ in todo]
+
+    def restore_entry(self, entry, run_id: str | None = None, journal_dir: Path | None = None):
+        """Write a cataloged backup back to its source path; False if it already holds those bytes."""
+        return bool(self._restore([entry], run_id, journal_dir))
+
+    def restore(self, src, run_id: str | None = None, before: float | None = None,
+                journal_dir: Path | None = None):
+        """Restore `src` from a given run, from the newest backup at/before `before`, or the newest one.
+
+        Returns the catalog entry used, or None if nothing matched.
+        """
+        if run_id is not None:
+            entry = next((e for e in self.catalog.run_entries(run_id) if e["src_key"] == path_key(src)), None)
+        else:
+            entry = self.catalog.latest(src, before=before)
+        if entry is None:
+            return None
+        self.restore_entry(entry, journal_dir=journal_dir)
+        return entry
+
+    def rollback(self, run_id: str | None = None, journal_dir: Path | None = None):
+        """Put every file touched by `run_id` (default: the last apply) back to its pre-run state.
+
+        All files are replaced in one journaled Transaction (all or none, like an apply).
+        Returns (run id rolled back, [restored entries]).
+        """
+        if run_id is None:
+            last = self.catalog.last_run("apply")
+            if last is None:
+                return None, []
+            run_id = last["run_id"]
+        return run_id, self._restore(self.catalog.run_entries(run_id), new_run_id(), journal_dir)
+
+    # ----- Retention
+    def prune(self, keep_run: str | None = None):
+        """Evict least recently used runs until within budget, then drop unreferenced blobs.
+
+        Returns the list of evicted run ids.
+        """
+        with _LOCK:
+            runs = self.runs()
+            refcount = {}
+            for m in runs:
+                for d in _entry_blobs(m):
+                    refcount[d] = refcount.get(d, 0) + 1
+            sizes = {}
+            for d in refcount:
+                try:
+                    sizes[d] = self.blob_path(d).stat().st_size
+                except OSError:
+                    sizes[d] = 0
+            total = sum(sizes.values())
+
+            evicted = []
+            for victim in list(runs):
+                over_runs = self.max_runs is not None and len(runs) > self.max_runs
+                over_bytes = self.max_bytes is not None and total > self.max_bytes
+                if not (over_runs or over_bytes):
+                    break
+                if victim["run_id"] == keep_run:
+                    continue
+                runs.remove(victim)
+                self.manifest_path(victim["run_id"]).unlink(missing_ok=True)
+                evicted.append(victim["run_id"])
+                for d in _entry_blobs(victim):
+                    refcount[d] -= 1
+                    if refcount[d] == 0:
+                        total -= sizes.pop(d, 0)
+
+            self.catalog.drop_runs(evicted)
+            if self.objects.is_dir():
+                for p in self.objects.glob("*/*.gz"):
+                    if refcount.get(p.name[:-3], 0) <= 0:
+                        p.unlink(missing_ok=True)
+            return evicted
+
+def _entry_blobs(man):
+    for e in man.get("entries", ()):
+        yield e["sha256"]
+        if e.get("patch"):
+            yield e["patch"]
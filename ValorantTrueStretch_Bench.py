@@ -0,0 +1,176 @@
+# ValorantTrueStretch_Bench.py
+# Micro/macro benchmarks for the config-editing hot paths, with a JSON baseline.
+# Made by GlitchFL (credit required if you share)
+#
+# Examples:
+#   python ValorantTrueStretch_Bench.py --save bench_baseline.json        (record a baseline)
+#   python ValorantTrueStretch_Bench.py --compare bench_baseline.json     (exit 1 on regressions)
+#   python ValorantTrueStretch_Bench.py --quick -k diff                   (small sizes, names matching "diff")
+#
+# Startup is measured too (fresh interpreter importing each headless entry point), and
+# the run fails if a headless module pulls in Tk/ttkbootstrap/ctypes.
+
+import re
+import sys
+import json
+import time
+import timeit
+import platform
+import argparse
+import tempfile
+import subprocess
+import statistics
+from pathlib import Path
+
+from ValorantTrueStretch_Engine import (
+    update_kv_lines, ensure_hdr_and_fullscreen, native_check_ok, file_diff, safe_backup,
+    process_gus, plan_gus, run_root, make_updates_for_target,
+)
+from ValorantTrueStretch_Ini import IniDocument
+from ValorantTrueStretch_Synth import synth_gus, synth_tree, NATIVE, TARGET
+
+SIZES = (20, 1_000, 10_000, 100_000, 300_000)
+QUICK_SIZES = (20, 1_000, 10_000)
+ACCOUNTS = (1, 10, 100)
+QUICK_ACCOUNTS = (1, 10)
+DEFAULT_THRESHOLD = 1.25   # flag when min time grows by more than 25%
+
+HERE = Path(__file__).resolve().parent
+HEADLESS_MODULES = ("ValorantTrueStretch_CLI", "ValorantTrueStretch_Engine", "ValorantTrueStretch_Synth")
+GUI_ONLY_MODULES = ("tkinter", "_tkinter", "ttkbootstrap", "ctypes")
+
+# Benchmarks (name -> zero-arg callable)
+
+def _quiet(msg, tag=None):
+    pass
+
+def build_benchmarks(tmp: Path, sizes=SIZES, accounts=ACCOUNTS):
+    updates = make_updates_for_target(*TARGET)
+    benches = {}
+    for n in sizes:
+        lines = synth_gus(n).splitlines(keepends=True)
+        doc = IniDocument(lines)
+        doc.update(updates)
+        doc.ensure_hdr_and_fullscreen()
+        new = doc.lines()
+        path = tmp / f"gus_{n}.ini"
+        path.write_text("".join(lines), encoding="utf-8")
+        broot = tmp / f"backups_{n}"
+
+        benches[f"update_kv_lines[{n}]"] = lambda lines=lines: update_kv_lines(lines, updates)
+        benches[f"ensure_hdr_and_fullscreen[{n}]"] = lambda lines=lines: ensure_hdr_and_fullscreen(lines)
+        benches[f"native_check_ok[{n}]"] = lambda lines=lines: native_check_ok(lines, *NATIVE)
+        benches[f"file_diff[{n}]"] = lambda lines=lines, new=new, doc=doc: file_diff(lines, new, "bench", doc)
+        benches[f"plan_gus[{n}]"] = lambda path=path: plan_gus(path, "bench", *TARGET, native=NATIVE)
+        benches[f"process_gus[{n}]"] = lambda path=path: process_gus(path, *TARGET, False, "bench", _quiet, None)
+        benches[f"safe_backup[{n}]"] = lambda path=path, broot=broot: safe_backup(path, broot, None)
+    for a in accounts:
+        base = synth_tree(tmp / f"tree_{a}", a)
+        benches[f"run_root.all_accounts[{a}]"] = (
+            lambda base=base: run_root(base, *NATIVE, *TARGET, all_accounts=True)
+        )
+    return benches
+
+def _python(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True, capture_output=True, text=True).stdout
+
+def startup_benchmarks():
+    benches = {"startup.python": lambda: _python("pass")}
+    for mod in HEADLESS_MODULES:
+        benches[f"startup.import[{mod}]"] = lambda mod=mod: _python(f"import {mod}")
+    return benches
+
+def headless_violations():
+    """{module: [GUI-only modules it imported]} for every headless entry point."""
+    bad = {}
+    for mod in HEADLESS_MODULES:
+        out = _python(
+            f"import sys, json, {mod}; "
+            f"print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in {GUI_ONLY_MODULES!r})))"
+        )
+        loaded = json.loads(out)
+        if loaded:
+            bad[mod] = loaded
+    return bad
+
+def measure(fn, repeat=5):
+    """(min, median) seconds per call; loops per sample are calibrated like `python -m timeit`."""
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    samples = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+    return min(samples), statistics.median(samples), loops
+
+# Baselines
+
+def load_baseline(path: Path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+
+def save_baseline(path: Path, results):
+    doc = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    Path(path).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """{name: ratio} of current/baseline min time, for names both runs have."""
+    return {
+        name: r["min_s"] / baseline[name]["min_s"]
+        for name, r in results.items()
+        if name in baseline and baseline[name]["min_s"] > 0
+    }
+
+def _fmt(s):
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if s * scale >= 1:
+            return f"{s * scale:8.2f} {unit}"
+    return f"{s * 1e9:8.0f} ns"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the VALORANT true stretch config-editing paths.")
+    ap.add_argument("--quick", action="store_true", help=f"Only sizes {QUICK_SIZES} and {QUICK_ACCOUNTS} accounts")
+    ap.add_argument("-k", "--filter", help="Only run benchmarks whose name matches this regex")
+    ap.add_argument("-r", "--repeat", type=int, default=5, help="Samples per benchmark (default: %(default)s)")
+    ap.add_argument("--save", help="Write results to this JSON baseline file")
+    ap.add_argument("--compare", help="Compare against this JSON baseline and flag regressions")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="Regression if current/baseline min time exceeds this (default: %(default)s)")
+    args = ap.parse_args(argv)
+
+    baseline = load_baseline(args.compare) if args.compare else {}
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="vts_bench_") as tmp:
+        benches = build_benchmarks(Path(tmp), QUICK_SIZES if args.quick else SIZES,
+                                   QUICK_ACCOUNTS if args.quick else ACCOUNTS)
+        benches.update(startup_benchmarks())
+        for name, fn in benches.items():
+            if args.filter and not re.search(args.filter, name):
+                continue
+            best, med, loops = measure(fn, args.repeat)
+            results[name] = {"min_s": best, "median_s": med, "loops": loops, "repeat": args.repeat}
+            line = f"{name:<40} {_fmt(best)}  (median {_fmt(med).strip()})"
+            if name in baseline:
+                ratio = best / baseline[name]["min_s"] if baseline[name]["min_s"] > 0 else 1.0
+                flag = "  REGRESSION" if ratio > args.threshold else ""
+                line += f"  x{ratio:.2f} vs baseline{flag}"
+            print(line, flush=True)
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"\nBaseline saved: {args.save}")
+    failed = False
+    for mod, loaded in headless_violations().items():
+        print(f"\nHEADLESS IMPORT: {mod} imports {', '.join(loaded)}")
+        failed = True
+    regressed = [n for n, ratio in compare(results, baseline).items() if ratio > args.threshold]
+    if regressed:
+        print(f"\n{len(regressed)} regression(s) over x{args.threshold}: {', '.join(regressed)}")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
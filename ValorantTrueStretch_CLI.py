@@ -0,0 +1,268 @@
+# ValorantTrueStretch_CLI.py
+# Headless front-end: apply true stretch across many VALORANT config bases at once.
+# Made by GlitchFL (credit required if you share)
+#
+# Examples:
+#   python ValorantTrueStretch_CLI.py --native 2560x1440 --target 1280x1024 "Z:/lan/*/Config"
+#   python ValorantTrueStretch_CLI.py --native 1920x1080 --target 1080x1080 --apply -f bases.txt
+#   python ValorantTrueStretch_CLI.py rollback            (undo the last apply)
+#   python ValorantTrueStretch_CLI.py watch --native 2560x1440 --target 1280x1024   (re-apply after game rewrites)
+#   python ValorantTrueStretch_CLI.py --native 2560x1440 --target 1280x1024 --profile 240fps.toml --apply
+
+import sys
+import json
+import time
+import argparse
+import threading
+import datetime as _dt
+from pathlib import Path
+
+from ValorantTrueStretch_Engine import (
+    parse_whx, expand_bases, run_batch, get_base_config_dir,
+    STATUS_MISSING, STATUS_UNCHANGED, STATUS_PLANNED, STATUS_UPDATED,
+)
+from ValorantTrueStretch_Cache import StateCache, STATE_PATH
+from ValorantTrueStretch_Journal import recover
+from ValorantTrueStretch_Trace import Tracer, tracing
+from ValorantTrueStretch_Backup import BackupStore, parse_when, DEFAULT_MAX_BYTES, DEFAULT_MAX_RUNS
+from ValorantTrueStretch_Watch import Watcher, MIN_INTERVAL, MAX_INTERVAL
+from ValorantTrueStretch_Profiles import get_profile, DEFAULT_NAME
+import ValorantTrueStretch_Metrics as metrics
+
+DEFAULT_BACKUP_DIR = Path.home() / "Documents" / "ValorantTrueStretch_Backups"
+
+def _build_parser():
+    ap = argparse.ArgumentParser(description="Apply VALORANT true stretch to one or many config bases.")
+    sub = ap.add_subparsers(dest="cmd")
+
+    run = sub.add_parser("run", help="Verify/preview/apply over config bases (default command)")
+    run.add_argument("bases", nargs="*", help="Config base folders or globs (default: local %%LOCALAPPDATA%% base)")
+    run.add_argument("-f", "--bases-file", help="Text file with one config base/glob per line")
+    run.add_argument("--native", required=True, help="Native resolution, WIDTHxHEIGHT")
+    run.add_argument("--target", required=True, help="Target stretch resolution, WIDTHxHEIGHT")
+    run.add_argument("--apply", action="store_true", help="Write changes (default is a preview)")
+    run.add_argument("--force", action="store_true", help="Skip the native check")
+    run.add_argument("--all-accounts", action="store_true",
+                     help="Process every <user>-<region> account folder, not just LastKnownUser's")
+    run.add_argument("--backup-dir", default=str(DEFAULT_BACKUP_DIR), help="Backup folder (default: %(default)s)")
+    run.add_argument("--no-backup", action="store_true", help="Do not save backups & diffs")
+    run.add_argument("--backup-max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                     help="Backup store size budget in MiB, 0 = unlimited (default: %(default)g)")
+    run.add_argument("--backup-max-runs", type=int, default=DEFAULT_MAX_RUNS,
+                     help="Apply runs kept in the backup store, 0 = unlimited (default: %(default)s)")
+    run.add_argument("--state-cache", default=str(STATE_PATH),
+                     help="Per-file stat/hash cache; unchanged files already at target are not re-read (default: %(default)s)")
+    run.add_argument("--no-state-cache", action="store_true", help="Read every file on every run")
+    run.add_argument("--trace", metavar="PATH",
+                     help="Time each stage; print a summary and write a Chrome trace JSON to PATH")
+    run.add_argument("-j", "--workers", type=int, default=None, help="Worker threads (default: auto)")
+    run.add_argument("-v", "--verbose", action="store_true", help="Print the full per-root log")
+    run.add_argument("--json", action="store_true", help="Print results as JSON lines")
+
+    bk = sub.add_parser("backups", help="List backup runs, or the backup history of one file")
+    bk.add_argument("src", nargs="?", help="Source file to show history for")
+    bk.add_argument("-n", "--limit", type=int, default=20)
+
+    rs = sub.add_parser("restore", help="Restore one file from the backup store")
+    rs.add_argument("src", help="File to restore (e.g. .../WindowsClient/GameUserSettings.ini)")
+    grp = rs.add_mutually_exclusive_group()
+    grp.add_argument("--run", help="Restore the copy taken by this run id")
+    grp.add_argument("--at", help="Restore the newest copy taken at/before this time (20250131_2359 or ISO)")
+
+    rb = sub.add_parser("rollback", help="Undo every file change of one apply run (default: the last one)")
+    rb.add_argument("run", nargs="?", help="Run id to roll back")
+
+    wt = sub.add_parser("watch", help="Apply, then keep re-applying whenever the game rewrites the files")
+    wt.add_argument("base", nargs="?", help="Config base folder (default: local %%LOCALAPPDATA%% base)")
+    wt.add_argument("--native", required=True, help="Native resolution, WIDTHxHEIGHT")
+    wt.add_argument("--target", required=True, help="Target stretch resolution, WIDTHxHEIGHT")
+    wt.add_argument("--force", action="store_true", help="Skip the native check")
+    wt.add_argument("--all-accounts", action="store_true",
+                    help="Watch every <user>-<region> account folder, not just LastKnownUser's")
+    wt.add_argument("--no-backup", action="store_true", help="Do not save backups & diffs")
+    wt.add_argument("--interval", type=float, default=MIN_INTERVAL,
+                    help="Poll interval right after a change, seconds (default: %(default)s)")
+    wt.add_argument("--max-interval", type=float, default=MAX_INTERVAL,
+                    help="Poll interval once idle, i.e. worst-case reaction time (default: %(default)s)")
+    metrics.add_arguments(wt)
+
+    for p in (run, wt):
+        p.add_argument("--profile", default=DEFAULT_NAME,
+                       help="Edit profile: built-in name or .json/.toml file (default: %(default)s)")
+    for p in (bk, rs, rb, wt):
+        p.add_argument("--backup-dir", default=str(DEFAULT_BACKUP_DIR), help="Backup folder (default: %(default)s)")
+    return ap
+
+COMMANDS = ("run", "backups", "restore", "rollback", "watch")
+
+def _read_patterns(args):
+    pats = list(args.bases)
+    if args.bases_file:
+        for ln in Path(args.bases_file).read_text(encoding="utf-8", errors="ignore").splitlines():
+            ln = ln.strip()
+            if ln and not ln.startswith("#"):
+                pats.append(ln)
+    if not pats:
+        pats = [str(get_base_config_dir())]
+    return pats
+
+def _summary_line(r):
+    if not r.ok:
+        return f"FAIL  {r.base}  ({r.error})"
+    counts = " ".join(
+        f"{s}={r.count(s)}" for s in (STATUS_UPDATED, STATUS_PLANNED, STATUS_UNCHANGED, STATUS_MISSING)
+    )
+    return f"OK    {r.base}  {counts}"
+
+def _fmt_time(ts):
+    return _dt.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+def cmd_backups(args):
+    store = BackupStore(Path(args.backup_dir))
+    if args.src:
+        for e in store.catalog.history(args.src, args.limit):
+            print(f"{_fmt_time(e['time'])}  {e['run_id']}  {e['size']:>8} B  {e['sha256'][:12]}")
+        return 0
+    for r in store.catalog.list_runs(args.limit):
+        print(f"{_fmt_time(r['created'])}  {r['run_id']}  {r['kind']:<7}  {r['files']} file(s)")
+    return 0
+
+def cmd_restore(args):
+    recover(log_func=lambda msg, tag=None: print(msg, file=sys.stderr))
+    store = BackupStore(Path(args.backup_dir))
+    try:
+        before = parse_when(args.at) if args.at else None
+    except ValueError as e:
+        print(f"Input Error: {e}", file=sys.stderr)
+        return 2
+    entry = store.restore(args.src, run_id=args.run, before=before)
+    if entry is None:
+        print(f"No matching backup for {args.src}", file=sys.stderr)
+        return 1
+    print(f"Restored {entry['src']} from run {entry['run_id']} ({_fmt_time(entry['time'])}).")
+    return 0
+
+def cmd_rollback(args):
+    recover(log_func=lambda msg, tag=None: print(msg, file=sys.stderr))
+    store = BackupStore(Path(args.backup_dir))
+    run_id, restored = store.rollback(args.run)
+    if run_id is None:
+        print("No apply runs in the backup store.", file=sys.stderr)
+        return 1
+    for e in restored:
+        print(f"Restored {e['src']}")
+    print(f"Rolled back run {run_id}: {len(restored)} file(s) restored.")
+    return 0
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # `run` is the default command, so the plain `--native ... --target ...` form keeps working
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv.insert(0, "run")
+    args = _build_parser().parse_args(argv)
+    if args.cmd == "backups":
+        return cmd_backups(args)
+    if args.cmd == "restore":
+        return cmd_restore(args)
+    if args.cmd == "rollback":
+        return cmd_rollback(args)
+    if args.cmd == "watch":
+        return cmd_watch(args)
+    return cmd_run(args)
+
+def cmd_run(args):
+    try:
+        nx, ny = parse_whx(args.native)
+        tx, ty = parse_whx(args.target)
+        profile = get_profile(args.profile)
+    except (ValueError, OSError) as e:
+        print(f"Input Error: {e}", file=sys.stderr)
+        return 2
+
+    bases = expand_bases(_read_patterns(args))
+    if not bases:
+        print("No config bases found.", file=sys.stderr)
+        return 2
+
+    # Finish any apply that was interrupted (crash / power loss) before touching files again
+    recover(log_func=lambda msg, tag=None: print(msg, file=sys.stderr))
+
+    backup_dir = None
+    if args.apply and not args.no_backup:
+        backup_dir = Path(args.backup_dir)
+        backup_dir.mkdir(parents=True, exist_ok=True)
+
+    def on_result(r):
+        if args.json:
+            print(json.dumps(r.as_dict()), flush=True)
+            return
+        if args.verbose:
+            print(f"===== {r.base}")
+            for msg, _tag in r.log:
+                print(msg.rstrip("\n"))
+        print(_summary_line(r), flush=True)
+
+    tracer = Tracer() if args.trace else None
+    t0 = time.perf_counter()
+    with tracing(tracer):
+        results = run_batch(bases, nx, ny, tx, ty, apply_changes=args.apply, force=args.force,
+                            backup_dir=backup_dir, workers=args.workers, on_result=on_result,
+                            backup_max_bytes=int(args.backup_max_mb * 1024 * 1024) or None,
+                            backup_max_runs=args.backup_max_runs or None,
+                            cache=None if args.no_state_cache else StateCache(Path(args.state_cache)),
+                            all_accounts=args.all_accounts, profile=profile)
+    elapsed = time.perf_counter() - t0
+    if tracer is not None:
+        tracer.log_summary(lambda msg, tag=None: print(msg, file=sys.stderr))
+        print(f"Trace saved: {tracer.write(args.trace)}", file=sys.stderr)
+
+    failed = sum(1 for r in results if not r.ok)
+    if not args.json:
+        mode = "applied" if args.apply else "previewed"
+        print(f"\n{len(results)} root(s) {mode} in {elapsed:.2f}s, {failed} failed.")
+        if backup_dir is not None and results:
+            # Every root of the batch backs up under the same run id
+            print(f"Run id: {results[0].run_id}  (undo with: rollback {results[0].run_id})")
+    return 1 if failed else 0
+
+def cmd_watch(args):
+    try:
+        nx, ny = parse_whx(args.native)
+        tx, ty = parse_whx(args.target)
+        profile = get_profile(args.profile)
+    except (ValueError, OSError) as e:
+        print(f"Input Error: {e}", file=sys.stderr)
+        return 2
+
+    def log(msg, tag=None):
+        print(msg.rstrip("\n"), flush=True)
+
+    recover(log_func=lambda msg, tag=None: print(msg, file=sys.stderr))
+    backup_dir = None
+    if not args.no_backup:
+        backup_dir = Path(args.backup_dir)
+        backup_dir.mkdir(parents=True, exist_ok=True)
+    watcher = Watcher(Path(args.base) if args.base else get_base_config_dir(), nx, ny, tx, ty, log,
+                      force=args.force, all_accounts=args.all_accounts, backup_dir=backup_dir,
+                      min_interval=args.interval, max_interval=args.max_interval, profile=profile)
+    registry, stop_metrics = metrics.start_exporters(args)
+    try:
+        with metrics.collecting(registry):
+            try:
+                if not watcher.start():
+                    return 1
+            except RuntimeError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+            print("Press Ctrl+C to stop.", flush=True)
+            try:
+                watcher.run(threading.Event())
+            except KeyboardInterrupt:
+                pass
+    finally:
+        stop_metrics()
+    print(f"\nStopped watching ({watcher.reapplied} file(s) re-applied).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
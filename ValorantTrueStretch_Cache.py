@@ -0,0 +1,84 @@
+# ValorantTrueStretch_Cache.py
+# Persistent per-file state cache: lets repeat runs skip GameUserSettings.ini files
+# that haven't changed since they were last seen, with a single stat() each.
+# Made by GlitchFL (credit required if you share)
+#
+# Each entry is keyed by normalized path and holds the file's size, mtime_ns and
+# sha256 when last seen, the tracked key values (resolution/letterbox/HDR/fullscreen)
+# and `target`: the WIDTHxHEIGHT the file already fully matches (None if it needed edits;
+# "WxH@name:digest" for a non-default edit profile, so switching profiles re-reads files).
+# A stat mismatch simply means "read the file again". Entries recorded while the file's
+# mtime was still "fresh" (within RACY_NS) are not trusted, since a same-size edit in the
+# same timestamp tick would be invisible to stat().
+
+import os
+import json
+import time
+import threading
+import uuid
+from pathlib import Path
+
+from ValorantTrueStretch_Backup import path_key
+
+STATE_PATH = Path.home() / "Documents" / "ValorantTrueStretch_State.json"
+
+# Bump when the edit rules change, so old "already at target" entries are ignored
+CACHE_VERSION = 1
+
+RACY_NS = 2_000_000_000  # FAT/SMB mtimes can be 2s coarse
+
+class StateCache:
+    def __init__(self, path: Path = STATE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+        entries = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == CACHE_VERSION:
+                entries = data.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        self._entries = entries
+        return entries
+
+    def lookup(self, path: Path):
+        """stat() `path` once; returns (stat key or None if missing, cached entry if still valid)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, None
+        key = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            entry = self._load().get(path_key(path))
+        if entry and (entry["size"], entry["mtime_ns"]) == key and entry["seen_ns"] - key[1] > RACY_NS:
+            return key, entry
+        return key, None
+
+    def record(self, path: Path, size, mtime_ns, digest, target, fields):
+        with self._lock:
+            self._load()[path_key(path)] = {
+                "size": size, "mtime_ns": mtime_ns, "sha256": digest, "target": target, "fields": fields,
+                "seen_ns": time.time_ns(),
+            }
+            self._dirty = True
+
+    def forget(self, path: Path):
+        with self._lock:
+            if self._load().pop(path_key(path), None) is not None:
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex[:8]}.tmp")
+            tmp.write_text(json.dumps({"version": CACHE_VERSION, "files": self._entries}), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._dirty = False
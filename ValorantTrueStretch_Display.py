@@ -0,0 +1,229 @@
+# ValorantTrueStretch_Display.py
+# Windows desktop resolution control (user32 via ctypes). Imported on demand by the GUI,
+# so starting the tool or running it headless never loads ctypes.
+# Made by GlitchFL (credit required if you share)
+#
+# Supported modes come from one EnumDisplaySettingsW sweep per adapter, kept in a
+# ModeIndex (WIDTHxHEIGHT -> refresh rates / bit depths). Backends: Win32Display (the
+# real thing) and FakeDisplay (in-memory, for tests and non-Windows machines).
+
+import ctypes
+
+from ValorantTrueStretch_Metrics import inc
+
+# Minimal DEVMODE for width/height changes
+class DEVMODE(ctypes.Structure):
+    _fields_ = [
+        ("dmDeviceName", ctypes.c_wchar * 32),
+        ("dmSpecVersion", ctypes.c_uint16),
+        ("dmDriverVersion", ctypes.c_uint16),
+        ("dmSize", ctypes.c_uint16),
+        ("dmDriverExtra", ctypes.c_uint16),
+        ("dmFields", ctypes.c_uint32),
+        ("dmOrientation", ctypes.c_int16),
+        ("dmPaperSize", ctypes.c_int16),
+        ("dmPaperLength", ctypes.c_int16),
+        ("dmPaperWidth", ctypes.c_int16),
+        ("dmScale", ctypes.c_int16),
+        ("dmCopies", ctypes.c_int16),
+        ("dmDefaultSource", ctypes.c_int16),
+        ("dmPrintQuality", ctypes.c_int16),
+        ("dmColor", ctypes.c_int16),
+        ("dmDuplex", ctypes.c_int16),
+        ("dmYResolution", ctypes.c_int16),
+        ("dmTTOption", ctypes.c_int16),
+        ("dmCollate", ctypes.c_int16),
+        ("dmFormName", ctypes.c_wchar * 32),
+        ("dmLogPixels", ctypes.c_uint16),
+        ("dmBitsPerPel", ctypes.c_uint32),
+        ("dmPelsWidth", ctypes.c_uint32),
+        ("dmPelsHeight", ctypes.c_uint32),
+        ("dmDisplayFlags", ctypes.c_uint32),
+        ("dmDisplayFrequency", ctypes.c_uint32),
+        ("dmICMMethod", ctypes.c_uint32),
+        ("dmICMIntent", ctypes.c_uint32),
+        ("dmMediaType", ctypes.c_uint32),
+        ("dmDitherType", ctypes.c_uint32),
+        ("dmReserved1", ctypes.c_uint32),
+        ("dmReserved2", ctypes.c_uint32),
+        ("dmPanningWidth", ctypes.c_uint32),
+        ("dmPanningHeight", ctypes.c_uint32),
+    ]
+
+# Flags/consts
+ENUM_CURRENT_SETTINGS = -1
+DM_BITSPERPEL       = 0x00040000
+DM_PELSWIDTH        = 0x00080000
+DM_PELSHEIGHT       = 0x00100000
+DM_DISPLAYFREQUENCY = 0x00400000
+
+CDS_UPDATEREGISTRY = 0x00000001
+CDS_TEST           = 0x00000002
+CDS_FULLSCREEN     = 0x00000004
+
+DISP_CHANGE_SUCCESSFUL = 0
+DISP_CHANGE_RESTART    = 1
+DISP_CHANGE_FAILED     = -1
+DISP_CHANGE_BADMODE    = -2
+DISP_CHANGE_NOTUPDATED = -3
+DISP_CHANGE_BADFLAGS   = -4
+DISP_CHANGE_BADPARAM   = -5
+
+def detect_primary_resolution():
+    """Get current primary screen resolution in physical pixels."""
+    try:
+        user32 = ctypes.windll.user32
+        # Ensure pixel-accurate metrics on high-DPI systems
+        try:
+            user32.SetProcessDPIAware()
+        except Exception:
+            pass
+        w = user32.GetSystemMetrics(0)  # SM_CXSCREEN
+        h = user32.GetSystemMetrics(1)  # SM_CYSCREEN
+        if w and h:
+            return w, h
+    except Exception:
+        pass
+    return None
+
+# Mode index
+
+class ModeIndex:
+    """Every mode of one adapter: (width, height) -> {(refresh Hz, bits per pixel)}."""
+
+    def __init__(self, modes):
+        self._modes = {}
+        for w, h, hz, bpp in modes:
+            self._modes.setdefault((int(w), int(h)), set()).add((int(hz), int(bpp)))
+        # Largest first, like the built-in resolution lists
+        self.resolutions = sorted(self._modes, key=lambda r: (r[0] * r[1], r), reverse=True)
+        self.labels = [f"{w}x{h}" for w, h in self.resolutions]
+
+    def __len__(self):
+        return len(self._modes)
+
+    def supports(self, width, height):
+        return (width, height) in self._modes
+
+    def refresh_rates(self, width, height):
+        return sorted({hz for hz, _ in self._modes.get((width, height), ())}, reverse=True)
+
+    def bit_depths(self, width, height):
+        return sorted({bpp for _, bpp in self._modes.get((width, height), ())}, reverse=True)
+
+    def best(self, width, height, refresh=None, bits=None):
+        """(Hz, bpp) to use for width x height: the given ones if available, else the highest."""
+        cands = self._modes.get((width, height))
+        if not cands:
+            return None
+        return max(cands, key=lambda m: (m[0] == refresh, m[1] == bits, m[0], m[1]))
+
+    def filter(self, text=""):
+        """Labels containing `text` ("1280", "x1024", "1280x10"...), largest first."""
+        q = "".join(text.casefold().split()).replace("×", "x")
+        return [lbl for lbl in self.labels if q in lbl] if q else list(self.labels)
+
+# Backends
+
+class Win32Display:
+    name = "win32"
+
+    def _devmode(self):
+        dm = DEVMODE()
+        dm.dmSize = ctypes.sizeof(DEVMODE)
+        return dm
+
+    def _current(self):
+        dm = self._devmode()
+        if not ctypes.windll.user32.EnumDisplaySettingsW(None, ENUM_CURRENT_SETTINGS, ctypes.byref(dm)):
+            raise OSError("EnumDisplaySettingsW failed for the current mode.")
+        return dm
+
+    def adapter(self):
+        return self._current().dmDeviceName
+
+    def modes(self):
+        user32 = ctypes.windll.user32
+        dm = self._devmode()
+        i = 0
+        while user32.EnumDisplaySettingsW(None, i, ctypes.byref(dm)):
+            yield dm.dmPelsWidth, dm.dmPelsHeight, dm.dmDisplayFrequency, dm.dmBitsPerPel
+            i += 1
+
+    def current(self):
+        dm = self._current()
+        return dm.dmPelsWidth, dm.dmPelsHeight, dm.dmDisplayFrequency, dm.dmBitsPerPel
+
+    def set_mode(self, width, height, refresh, bits):
+        dm = self._current()
+        dm.dmFields = DM_PELSWIDTH | DM_PELSHEIGHT | DM_DISPLAYFREQUENCY | DM_BITSPERPEL
+        dm.dmPelsWidth, dm.dmPelsHeight = int(width), int(height)
+        dm.dmDisplayFrequency, dm.dmBitsPerPel = int(refresh), int(bits)
+        return ctypes.windll.user32.ChangeDisplaySettingsW(ctypes.byref(dm), 0)
+
+class FakeDisplay:
+    """In-memory backend: `modes` is [(width, height, Hz, bpp)]; counts enumerations."""
+    name = "fake"
+
+    def __init__(self, modes, current=None, adapter="Fake Display Adapter"):
+        self._modes = [tuple(m) for m in modes]
+        self._adapter = adapter
+        self.mode = tuple(current) if current else self._modes[0]
+        self.enumerations = 0
+        self.applied = []
+
+    def adapter(self):
+        return self._adapter
+
+    def modes(self):
+        self.enumerations += 1
+        return iter(self._modes)
+
+    def current(self):
+        return self.mode
+
+    def set_mode(self, width, height, refresh, bits):
+        mode = (width, height, refresh, bits)
+        if mode not in self._modes:
+            return DISP_CHANGE_BADMODE
+        self.mode = mode
+        self.applied.append(mode)
+        return DISP_CHANGE_SUCCESSFUL
+
+WIN32 = Win32Display()
+
+_indexes = {}  # (backend name, adapter) -> ModeIndex
+
+def mode_index(backend=None, refresh=False):
+    """The adapter's ModeIndex, enumerated once and then served from memory."""
+    backend = backend or WIN32
+    key = (backend.name, backend.adapter())
+    index = None if refresh else _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = ModeIndex(backend.modes())
+    return index
+
+def invalidate_modes():
+    """Forget cached mode tables (e.g. after a monitor or driver change)."""
+    _indexes.clear()
+
+def change_desktop_resolution(width: int, height: int, backend=None):
+    """Change primary display resolution to width x height, keeping the current refresh rate if possible."""
+    backend = backend or WIN32
+    try:
+        index = mode_index(backend)
+        if not index.supports(width, height):
+            inc("vts_desktop_changes_total", result="unsupported")
+            return False, f"{width}x{height} is not a display mode of this monitor."
+        cur = backend.current()
+        refresh, bits = index.best(width, height, cur[2], cur[3])
+        rc = backend.set_mode(width, height, refresh, bits)
+        inc("vts_desktop_changes_total", result="ok" if rc in (DISP_CHANGE_SUCCESSFUL, DISP_CHANGE_RESTART) else "failed")
+        if rc == DISP_CHANGE_SUCCESSFUL:
+            return True, f"Desktop resolution changed ({width}x{height} @ {refresh} Hz)."
+        elif rc == DISP_CHANGE_RESTART:
+            return True, "Desktop resolution changed (restart required)."
+        else:
+            return False, f"Failed to change resolution (code {rc})."
+    except Exception as e:
+        return False, f"Error changing resolution: {e}"
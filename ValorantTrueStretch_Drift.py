@@ -0,0 +1,281 @@
+# ValorantTrueStretch_Drift.py
+# Fleet drift scanner: fingerprint every GameUserSettings.ini under many config roots
+# into one columnar snapshot, then answer "which roots are not at WxH / FullscreenMode=2"
+# from the snapshot without touching the machines again.
+# Made by GlitchFL (credit required if you share)
+#
+# Fingerprint per file: size, mtime_ns, a 64-bit content hash (sha256 prefix) and the
+# tracked values (resolution, letterbox, HDR nits, FullscreenMode). The snapshot stores
+# one column per field; text columns are dictionary-encoded (distinct values + one small
+# int per row), so a query is a scan over int lists. A rescan with --previous reuses rows
+# whose size/mtime are unchanged (and were not racy when scanned).
+#
+# Examples:
+#   python ValorantTrueStretch_Drift.py scan "Z:/lan/*/Config" -o fleet.json
+#   python ValorantTrueStretch_Drift.py scan -f bases.txt -o fleet.json --previous fleet.json
+#   python ValorantTrueStretch_Drift.py query fleet.json --target 1280x1024 --where FullscreenMode=2
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+
+from ValorantTrueStretch_Engine import (
+    parse_whx, expand_bases, discover, account_targets, make_updates_for_target,
+    ROOT_LABEL, TRACKED_KEYS, FULLSCREEN_KEY, HDR_KEY, read_snapshot, parse_doc, tracked_fields,
+)
+from ValorantTrueStretch_Cache import RACY_NS
+
+SNAPSHOT_VERSION = 1
+HASH_CHARS = 16     # 64 bits of sha256: enough to tell "same bytes" across a fleet
+
+# Dictionary-encoded columns: everything except the numeric/unique ones. A file's path is
+# not stored: it is the root joined with its label.
+_PLAIN = ("root", "label", "size", "mtime_ns", "hash")
+COLUMNS = _PLAIN + TRACKED_KEYS
+
+# Scanning
+
+def fingerprint(path: Path):
+    """(size, mtime_ns, hash, {tracked key: value or None}) of one config file (one read)."""
+    raw, size, mtime_ns = read_snapshot(path)
+    doc, _ = parse_doc(raw)
+    return size, mtime_ns, hashlib.sha256(raw).hexdigest()[:HASH_CHARS], tracked_fields(doc)
+
+def _file_path(root, label):
+    return Path(root) / ("WindowsClient/GameUserSettings.ini" if label == ROOT_LABEL else label)
+
+def _root_files(base: Path):
+    found = discover(base)
+    files = [(_file_path(base, ROOT_LABEL), ROOT_LABEL)]
+    for acc, score in zip(found.accounts, found.scores):
+        if score:
+            files += account_targets(acc)
+    return files
+
+def scan_root(base: Path, previous=None, previous_ns=0):
+    """(error or None, [row dict]) for one config root. `previous` maps path -> old row."""
+    base = Path(base)
+    rows = []
+    try:
+        files = _root_files(base)
+    except OSError as e:
+        return str(e), rows
+    for path, label in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        old = previous.get(path) if previous else None
+        if (old is not None and (old["size"], old["mtime_ns"]) == (st.st_size, st.st_mtime_ns)
+                and previous_ns - st.st_mtime_ns > RACY_NS):
+            rows.append(old)
+            continue
+        try:
+            size, mtime_ns, digest, fields = fingerprint(path)
+        except OSError:
+            continue
+        rows.append({"label": label, "size": size, "mtime_ns": mtime_ns, "hash": digest} | fields)
+    if not rows or rows[0]["label"] != ROOT_LABEL:
+        return "Missing WindowsClient/GameUserSettings.ini", rows
+    return None, rows
+
+def scan(bases, workers=None, previous=None, on_root=None):
+    """Fingerprint every root (thread pool); returns a Snapshot. `previous` is an older Snapshot."""
+    bases = [Path(b) for b in bases]
+    started = time.time_ns()
+    prev_rows = previous.rows_by_path() if previous is not None else None
+    prev_ns = previous.created_ns if previous is not None else 0
+    workers = max(1, min(workers or min(32, (os.cpu_count() or 1) * 4), len(bases) or 1))
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = []
+        for base, res in zip(bases, pool.map(lambda b: scan_root(b, prev_rows, prev_ns), bases)):
+            if on_root:
+                on_root(base, *res)
+            results.append(res)
+    return Snapshot.build([str(b) for b in bases], results, started)
+
+# Snapshot
+
+class Snapshot:
+    """Columnar fingerprints of many roots. Text columns are {"dict": [values], "codes": [int per row]}."""
+
+    def __init__(self, roots, errors, columns, created_ns):
+        self.roots = roots              # root paths
+        self.errors = errors            # per root: scan error or None
+        self.columns = columns
+        self.created_ns = created_ns
+
+    @classmethod
+    def build(cls, roots, results, created_ns):
+        cols = {c: [] for c in COLUMNS}
+        for i, (_err, rows) in enumerate(results):
+            for row in rows:
+                cols["root"].append(i)
+                for c in COLUMNS[1:]:
+                    cols[c].append(row.get(c))
+        for c in COLUMNS:
+            if c not in _PLAIN:
+                cols[c] = _encode(cols[c])
+        return cls(roots, [err for err, _ in results], cols, created_ns)
+
+    def __len__(self):
+        return len(self.columns["root"])
+
+    def column(self, name):
+        col = self.columns[name]
+        if isinstance(col, dict):
+            values = col["dict"]
+            return [values[c] for c in col["codes"]]
+        return col
+
+    def rows_by_path(self):
+        cols = {c: self.column(c) for c in COLUMNS}
+        return {
+            _file_path(self.roots[r], cols["label"][i]): {c: cols[c][i] for c in COLUMNS[1:]}
+            for i, r in enumerate(cols["root"])
+        }
+
+    def mismatches(self, expected: dict):
+        """Sorted row indices where any `expected` {column: value} differs."""
+        n = len(self)
+        bad = bytearray(n)
+        for key, want in expected.items():
+            col = self.columns[key]
+            try:
+                code = col["dict"].index(want)
+            except ValueError:
+                return list(range(n))       # nobody has that value
+            for i, c in enumerate(col["codes"]):
+                if c != code:
+                    bad[i] = 1
+        return [i for i in range(n) if bad[i]]
+
+    def drifted(self, expected: dict):
+        """{root: [(label, {key: actual value})]} for roots off `expected`, plus roots that failed to scan."""
+        out = {r: [] for r, err in zip(self.roots, self.errors) if err}
+        roots, labels = self.columns["root"], self.columns["label"]
+        for i in self.mismatches(expected):
+            actual = {k: self.columns[k]["dict"][self.columns[k]["codes"][i]] for k in expected}
+            actual = {k: v for k, v in actual.items() if v != expected[k]}
+            out.setdefault(self.roots[roots[i]], []).append((labels[i], actual))
+        return out
+
+    def save(self, path: Path):
+        doc = {"version": SNAPSHOT_VERSION, "created_ns": self.created_ns, "roots": self.roots,
+               "errors": self.errors, "columns": self.columns}
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(doc, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path):
+        doc = json.loads(Path(path).read_text(encoding="utf-8"))
+        if doc.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {doc.get('version')!r}")
+        return cls(doc["roots"], doc["errors"], doc["columns"], doc["created_ns"])
+
+def _encode(values):
+    index, codes = {}, []
+    for v in values:
+        codes.append(index.setdefault(v, len(index)))
+    return {"dict": list(index), "codes": codes}
+
+def expected_for_target(tx, ty, fullscreen="2", hdr="1000"):
+    """What an applied stretch looks like (same values plan_gus writes)."""
+    return make_updates_for_target(tx, ty) | {HDR_KEY: hdr, FULLSCREEN_KEY: fullscreen}
+
+# CLI
+
+def _read_patterns(args):
+    pats = list(args.bases)
+    if args.bases_file:
+        for ln in Path(args.bases_file).read_text(encoding="utf-8", errors="ignore").splitlines():
+            ln = ln.strip()
+            if ln and not ln.startswith("#"):
+                pats.append(ln)
+    return pats
+
+def cmd_scan(args):
+    bases = expand_bases(_read_patterns(args))
+    if not bases:
+        print("No config bases found.", file=sys.stderr)
+        return 2
+    previous = None
+    if args.previous and Path(args.previous).is_file():
+        previous = Snapshot.load(args.previous)
+    t0 = time.perf_counter()
+    snap = scan(bases, args.workers, previous)
+    elapsed = time.perf_counter() - t0
+    snap.save(args.output)
+    failed = sum(1 for e in snap.errors if e)
+    print(f"Scanned {len(bases)} root(s), {len(snap)} file(s) in {elapsed:.2f}s ({failed} failed) -> {args.output}")
+    return 0
+
+def cmd_query(args):
+    expected = {}
+    if args.target:
+        try:
+            expected = expected_for_target(*parse_whx(args.target), fullscreen=args.fullscreen)
+        except ValueError as e:
+            print(f"Input Error: {e}", file=sys.stderr)
+            return 2
+    for w in args.where:
+        key, sep, value = w.partition("=")
+        if not sep or key not in TRACKED_KEYS:
+            print(f"Input Error: --where needs KEY=VALUE with KEY one of {', '.join(TRACKED_KEYS)}", file=sys.stderr)
+            return 2
+        expected[key] = value
+    if not expected:
+        print("Input Error: give --target and/or --where.", file=sys.stderr)
+        return 2
+
+    t0 = time.perf_counter()
+    snap = Snapshot.load(args.snapshot)
+    t1 = time.perf_counter()
+    drift = snap.drifted(expected)
+    t2 = time.perf_counter()
+
+    errors = dict(zip(snap.roots, snap.errors))
+    if args.json:
+        for root, files in drift.items():
+            print(json.dumps({"root": root, "error": errors.get(root),
+                              "files": [{"label": lbl, "actual": act} for lbl, act in files]}))
+    else:
+        for root, files in drift.items():
+            print(f"DRIFT {root}" + (f"  ({errors[root]})" if errors.get(root) else ""))
+            if args.files:
+                for lbl, act in files:
+                    print(f"    {lbl}: " + ", ".join(f"{k}={v}" for k, v in act.items()))
+        print(f"\n{len(drift)} of {len(snap.roots)} root(s) drifted ({len(snap)} files; "
+              f"load {(t1 - t0) * 1000:.1f} ms, query {(t2 - t1) * 1000:.1f} ms).", file=sys.stderr)
+    return 1 if drift else 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Find VALORANT config roots that lost their stretch.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sc = sub.add_parser("scan", help="Fingerprint config roots into a snapshot")
+    sc.add_argument("bases", nargs="*", help="Config base folders or globs")
+    sc.add_argument("-f", "--bases-file", help="Text file with one config base/glob per line")
+    sc.add_argument("-o", "--output", required=True, help="Snapshot file to write")
+    sc.add_argument("--previous", help="Older snapshot: unchanged files are not re-read")
+    sc.add_argument("-j", "--workers", type=int, default=None, help="Worker threads (default: auto)")
+
+    q = sub.add_parser("query", help="List roots whose files differ from the expected values")
+    q.add_argument("snapshot")
+    q.add_argument("--target", help="Expect an applied stretch to WIDTHxHEIGHT")
+    q.add_argument("--fullscreen", default="2", help="FullscreenMode expected with --target (default: %(default)s)")
+    q.add_argument("--where", action="append", default=[], metavar="KEY=VALUE", help="Extra expected value")
+    q.add_argument("--files", action="store_true", help="Also list each drifted file and its values")
+    q.add_argument("--json", action="store_true", help="Print drifted roots as JSON lines")
+    args = ap.parse_args(argv)
+    return cmd_scan(args) if args.cmd == "scan" else cmd_query(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,720 @@
+# ValorantTrueStretch_Engine.py
+# GUI-free core of the true stretch tool: config discovery, INI edits, backups.
+# Shared by ValorantTrueStretch_GUI_2.0.py and ValorantTrueStretch_CLI.py.
+# Made by GlitchFL (credit required if you share)
+
+import io
+import os
+import re
+import codecs
+import glob
+import time
+import hashlib
+import threading
+import datetime as _dt
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ValorantTrueStretch_Backup import BackupStore, new_run_id, path_key, DEFAULT_MAX_BYTES, DEFAULT_MAX_RUNS
+from ValorantTrueStretch_Journal import Transaction, JOURNAL_DIR
+from ValorantTrueStretch_Trace import span, traced
+from ValorantTrueStretch_Metrics import inc
+from ValorantTrueStretch_Ini import IniDocument, unified_diff, detect_newline, FULLSCREEN_KEY, HDR_KEY
+from ValorantTrueStretch_Profiles import Profile, DEFAULT_PROFILE
+
+# Core helpers 
+
+def parse_whx(s: str):
+    s = s.strip()
+    m = re.fullmatch(r"(\d+)[xX](\d+)", s)
+    if not m:
+        raise ValueError("Invalid format. Use WIDTHxHEIGHT (e.g., 2560x1440)")
+    return int(m.group(1)), int(m.group(2))
+
+def write_text(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+@traced("update")
+def update_kv_lines(lines, updates: dict):
+    doc = IniDocument(lines)
+    changed = doc.update(updates)
+    return doc.lines(), changed
+
+@traced("update")
+def ensure_hdr_and_fullscreen(lines, hdr_val="1000", fs_val="2"):
+    doc = IniDocument(lines)
+    doc.ensure_hdr_and_fullscreen(hdr_val, fs_val)
+    return doc.lines(), True
+
+@traced("diff")
+def file_diff(old_lines, new_lines, label, doc: IniDocument | None = None):
+    """Unified diff of a GUS edit.
+
+    With the IniDocument that produced `new_lines` the hunks come straight from its
+    edit list; difflib's whole-file matching is only used without one, or when the
+    document says difflib could align the edit differently (the output is the same).
+    """
+    if doc is not None and not doc.ambiguous():
+        return unified_diff(old_lines, new_lines, doc.opcodes(),
+                            fromfile=f"{label} (current)", tofile=f"{label} (new)", n=3)
+    import difflib  # only needed for the rare fallback; kept off the startup path
+    old_lines, new_lines = list(old_lines), list(new_lines)
+    return "".join(
+        difflib.unified_diff(
+            old_lines, new_lines, fromfile=f"{label} (current)", tofile=f"{label} (new)", n=3
+        )
+    )
+
+def get_base_config_dir():
+    local = os.environ.get("LOCALAPPDATA")
+    if not local:
+        raise RuntimeError("Couldn't resolve %LOCALAPPDATA%. Are you on Windows?")
+    return Path(local) / "VALORANT" / "Saved" / "Config"
+
+@traced("get_last_known_user")
+def get_last_known_user(windows_client_dir: Path):
+    rlmi = windows_client_dir / "RiotLocalMachine.ini"
+    if not rlmi.is_file():
+        return None
+    txt = rlmi.read_text(encoding="utf-8", errors="ignore").splitlines()
+    for ln in txt:
+        m = re.match(r"^\s*LastKnownUser\s*=\s*([A-Za-z0-9\-]+)\s*$", ln)
+        if m:
+            return m.group(1)
+    return None
+
+# Account discovery cache 
+# Picking the account folder means scanning the config base. discover() does that scan
+# once per base and reuses it until the base dir, WindowsClient dir,
+# RiotLocalMachine.ini or an account folder change (adding/removing an account folder bumps
+# the base mtime; adding Windows/ or WindowsClient/ to one bumps that folder's).
+
+def _base_inputs(base: Path):
+    wc = base / "WindowsClient"
+    return (base, wc, wc / "RiotLocalMachine.ini")
+
+def discovery_inputs(base: Path):
+    """Paths whose stat keys change when the account pick may change (account folders included)."""
+    return _base_inputs(base) + discover(base).accounts
+
+@dataclass(frozen=True)
+class Discovery:
+    base: Path
+    key: tuple              # stat keys of _base_inputs(base)
+    last_user: str | None
+    accounts: tuple         # every <user>-<region> folder, by name
+    scores: tuple           # how many of Windows/WindowsClient each account folder has
+    account_keys: tuple = ()    # stat keys of `accounts` when they were scored
+
+    def user_folder(self, last_known: str | None = None):
+        """The `last_known` (default: LastKnownUser) folder with the most of Windows/WindowsClient."""
+        last_known = last_known if last_known is not None else self.last_user
+        if not last_known:
+            return None
+        prefix = last_known.lower() + "-"
+        best = None
+        for p, sc in zip(self.accounts, self.scores):
+            if p.name.lower().startswith(prefix) and (best is None or sc > best[1]):
+                best = (p, sc)
+        return best[0] if best else None
+
+_discovery = {}
+_discovery_lock = threading.Lock()
+
+@traced("scan_accounts")
+def _scan_accounts(base: Path):
+    accounts, scores, keys = [], [], []
+    with os.scandir(base) as it:
+        entries = sorted((e for e in it if "-" in e.name and e.is_dir()), key=lambda e: e.name.lower())
+    for e in entries:
+        p = Path(e.path)
+        accounts.append(p)
+        keys.append(stat_key(p))    # before scoring: a change during the scan shows up next time
+        scores.append((p / "Windows").is_dir() + (p / "WindowsClient").is_dir())
+    return tuple(accounts), tuple(scores), tuple(keys)
+
+def discover(base: Path, refresh=False):
+    """LastKnownUser and every account folder under `base`, rescanned only when it changed."""
+    base = Path(base)
+    key = tuple(stat_key(p) for p in _base_inputs(base))
+    k = path_key(base)
+    if not refresh:
+        with _discovery_lock:
+            hit = _discovery.get(k)
+        if hit is not None and hit.key == key and tuple(map(stat_key, hit.accounts)) == hit.account_keys:
+            return hit
+    accounts, scores, account_keys = _scan_accounts(base) if key[0] is not None else ((), (), ())
+    d = Discovery(base, key, get_last_known_user(base / "WindowsClient"), accounts, scores, account_keys)
+    with _discovery_lock:
+        _discovery[k] = d
+    return d
+
+def invalidate_discovery(base: Path | None = None):
+    """Forget the cached scan of `base` (or of every base)."""
+    with _discovery_lock:
+        if base is None:
+            _discovery.clear()
+        else:
+            _discovery.pop(path_key(Path(base)), None)
+
+def account_targets(user_dir: Path):
+    """(path, label) of the two GameUserSettings.ini files of one account folder."""
+    return [
+        (user_dir / "WindowsClient" / "GameUserSettings.ini", f"{user_dir.name}/WindowsClient/GameUserSettings.ini"),
+        (user_dir / "Windows" / "GameUserSettings.ini", f"{user_dir.name}/Windows/GameUserSettings.ini"),
+    ]
+
+def native_check_ok(lines, native_x, native_y, profile: Profile | None = None):
+    """`lines` may be a line list, an IniDocument or a {key: value} dict of already-parsed values.
+
+    The expected values come from `profile`'s check rules (default: the resolution/letterbox keys).
+    """
+    want = (profile or DEFAULT_PROFILE).checks(native_x, native_y)
+    if isinstance(lines, dict):
+        for k, v in want.items():
+            if lines.get(k) != v:
+                return False, k, lines.get(k)
+        return True, None, None
+    doc = lines if isinstance(lines, IniDocument) else IniDocument(lines)
+    return doc.check(want)
+
+def make_updates_for_target(target_x, target_y):
+    """Resolution/letterbox values the default profile writes (a fresh dict)."""
+    return dict(DEFAULT_PROFILE.updates(target_x, target_y))
+
+# Keys the state cache keeps per file (enough to native-check a file without reading it)
+TRACKED_KEYS = tuple(make_updates_for_target(0, 0)) + (HDR_KEY, FULLSCREEN_KEY)
+_TRACKED = frozenset(TRACKED_KEYS)
+
+def _timestamp():
+    return _dt.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+@traced("backup")
+def safe_backup(src_path: Path, backup_root: Path, diff_text: str | None, run_id: str | None = None,
+                data: bytes | None = None):
+    """Back up `src_path` (or its already-read `data`) into the store under `backup_root`; returns the blob path."""
+    if data is None:
+        data = Path(src_path).read_bytes()
+    saved = BackupStore(backup_root).backup(src_path, run_id or new_run_id(), diff_text, data=data)
+    inc("vts_backups_total")
+    inc("vts_backup_bytes_total", len(data))
+    return saved
+
+def prune_backups(backup_root: Path, keep_run: str | None = None,
+                  max_bytes: int | None = DEFAULT_MAX_BYTES, max_runs: int | None = DEFAULT_MAX_RUNS):
+    return BackupStore(backup_root, max_bytes=max_bytes, max_runs=max_runs).prune(keep_run=keep_run)
+
+# File and run plans 
+# A plan reads every file once and holds the exact bytes to write, so preview -> apply
+# doesn't re-read or re-compute anything unless the files changed on disk in between.
+
+# Files are edited as bytes: BOM, encoding, line endings and every untouched byte survive.
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+def _sniff(raw: bytes):
+    """(BOM, encoding) of a config file; BOM-less UTF-16 is recognized by its NUL bytes."""
+    for bom, enc in _BOMS:
+        if raw.startswith(bom):
+            return bom, enc
+    if len(raw) >= 2 and (raw[0] == 0) != (raw[1] == 0):
+        return b"", "utf-16-be" if raw[0] == 0 else "utf-16-le"
+    return b"", "utf-8"
+
+def parse_doc(raw: bytes):
+    """IniDocument over a file's bytes, plus a function giving its new bytes (same BOM/encoding)."""
+    bom, enc = _sniff(raw)
+    if enc != "utf-8":
+        try:
+            text = raw[len(bom):].decode(enc, "surrogatepass")
+        except UnicodeDecodeError:
+            bom, enc = b"", "utf-8"
+        else:
+            doc = IniDocument(io.StringIO(text, newline="").readlines(), detect_newline(text))
+            return doc, lambda: bom + doc.text().encode(enc, "surrogatepass")
+    # UTF-8/ASCII: stay in bytes; only key=value lines ever get decoded
+    doc = IniDocument.from_bytes(raw[len(bom):])
+    return doc, lambda: bom + doc.text()
+
+def _text_line(ln):
+    if isinstance(ln, bytes):
+        ln = ln.decode("utf-8", errors="replace")
+    body = ln.rstrip("\r\n")
+    return body + "\n" if len(body) != len(ln) else body
+
+class _TextLines:
+    """str/LF view of a document's lines for diffs; lines are decoded only when sliced."""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [_text_line(ln) for ln in self.lines[i]]
+        return _text_line(self.lines[i])
+
+def read_snapshot(path: Path):
+    """(bytes, size, mtime_ns) of a file from one open: the stat matches the bytes read."""
+    with open(path, "rb") as f:
+        raw = f.read()
+        st = os.fstat(f.fileno())
+    return raw, st.st_size, st.st_mtime_ns
+
+def read_doc(path: Path):
+    """IniDocument of a config file, decoded like plan_gus does (BOM, UTF-16, raw UTF-8 bytes)."""
+    with span("read", file=str(path)):
+        raw = Path(path).read_bytes()
+    with span("parse", file=str(path)):
+        return parse_doc(raw)[0]
+
+def tracked_fields(doc: IniDocument):
+    """{tracked key: current value or None}, what the state cache and drift snapshots record."""
+    return {k: doc.get(k) for k in TRACKED_KEYS}
+
+def stat_key(path: Path):
+    """(size, mtime_ns) of `path`, or None if it is gone."""
+    try:
+        st = path.stat()
+        return (st.st_size, st.st_mtime_ns)
+    except OSError:
+        return None
+
+@dataclass(frozen=True)
+class FilePlan:
+    path: Path
+    label: str
+    size: int | None = None          # None: file was missing when planned
+    mtime_ns: int | None = None
+    digest: str | None = None        # sha256 of old_bytes
+    old_bytes: bytes | None = None
+    new_bytes: bytes | None = None   # None: no change needed
+    diff: str | None = None
+    target: str | None = None        # "WIDTHxHEIGHT" the plan edits towards (+ "@profile" if not the default)
+    fields: dict | None = None       # TRACKED_KEYS values after the edit (only kept with a state cache)
+
+    @property
+    def exists(self):
+        return self.size is not None
+
+    @property
+    def changed(self):
+        return self.new_bytes is not None
+
+    def is_fresh(self):
+        """True if the file on disk still holds the bytes this plan was computed from."""
+        key = stat_key(self.path)
+        if key is None or not self.exists:
+            return key is None and not self.exists
+        if key == (self.size, self.mtime_ns):
+            return True
+        return key[0] == self.size and hashlib.sha256(self.path.read_bytes()).hexdigest() == self.digest
+
+def plan_gus(path: Path, label, target_x, target_y, native=None, cache=None, profile: Profile | None = None):
+    """Read `path` once and compute its edit (the `profile`'s rules, default true stretch).
+
+    With native=(nx, ny) the untouched content is native-checked on the same parse.
+    With a StateCache, a file whose size/mtime match an entry already at this target
+    is not opened at all (one stat). Returns (FilePlan, native_check_ok result or None).
+    """
+    profile = profile or DEFAULT_PROFILE
+    target = profile.target_key(target_x, target_y)
+    if cache is not None:
+        key, entry = cache.lookup(path)
+        if key is None:
+            return FilePlan(path, label, target=target), None
+        # The cache keeps TRACKED_KEYS only; other check keys need the file itself
+        if entry is not None and entry["target"] == target and (not native or profile.check_keys <= _TRACKED):
+            check = native_check_ok(entry["fields"], *native, profile) if native else None
+            return FilePlan(path, label, key[0], key[1], entry["sha256"], target=target, fields=entry["fields"]), check
+    elif not path.is_file():
+        return FilePlan(path, label, target=target), None
+    with span("read", file=label):
+        raw, size, mtime_ns = read_snapshot(path)
+    digest = hashlib.sha256(raw).hexdigest()
+    with span("parse", file=label):
+        doc, encode = parse_doc(raw)
+    check = native_check_ok(doc, *native, profile) if native else None
+    fields = tracked_fields(doc) if cache is not None else None
+    with span("update", file=label):
+        profile.apply(doc, target_x, target_y)
+    new_bytes = diff = None
+    if doc.changed:
+        with span("encode", file=label):
+            new_bytes = encode()
+        if new_bytes == raw:
+            new_bytes = None
+        else:
+            diff = file_diff(_TextLines(doc.src), _TextLines(doc.lines()), str(path), doc)
+    if cache is not None:
+        cache.record(path, size, mtime_ns, digest, None if new_bytes else target, fields)
+        fields = tracked_fields(doc)
+    return FilePlan(path, label, size, mtime_ns, digest, raw, new_bytes, diff, target, fields), check
+
+# process_gus outcomes (used for batch summaries)
+STATUS_MISSING = "missing"
+STATUS_UNCHANGED = "unchanged"
+STATUS_PLANNED = "planned"
+STATUS_UPDATED = "updated"
+
+def report_file(fp: FilePlan, log_func):
+    if not fp.exists:
+        log_func(f"- Skipping (not found): {fp.label} -> {fp.path}", tag="warning")
+        return STATUS_MISSING
+    if not fp.changed:
+        log_func(f"- No changes needed: {fp.label}", tag="muted")
+        return STATUS_UNCHANGED
+    log_func(f"\n>>> {fp.label}\n{fp.diff if fp.diff.strip() else '(content replaced)'}", tag="info")
+    return STATUS_PLANNED
+
+def _backup_file(fp: FilePlan, log_func, backup_dir: Path | None, run_id: str | None):
+    if backup_dir:
+        try:
+            saved = safe_backup(fp.path, backup_dir, fp.diff, run_id, data=fp.old_bytes)
+            log_func(f"-> Backup saved: {saved}", tag="success")
+        except Exception as be:
+            log_func(f"[!] Backup failed: {be}", tag="error")
+
+def _backup_files(fps, backup_dir: Path | None, run_id: str):
+    """Back up every planned file under `run_id` in one store update; {path: [(msg, tag)]}."""
+    if not backup_dir or not fps:
+        return {}
+    try:
+        with span("backup", files=len(fps)):
+            saved = BackupStore(backup_dir).backup_many(
+                [(fp.path, fp.old_bytes, fp.diff) for fp in fps], run_id, map_func=_map_files)
+    except Exception as be:
+        return {fp.path: [(f"[!] Backup failed: {be}", "error")] for fp in fps}
+    inc("vts_backups_total", len(fps))
+    inc("vts_backup_bytes_total", sum(len(fp.old_bytes) for fp in fps))
+    return {fp.path: [(f"-> Backup saved: {blob}", "success")] for fp, blob in zip(fps, saved)}
+
+def _committed(fp: FilePlan, log_func, cache):
+    if cache is not None:
+        st = fp.path.stat()
+        cache.record(fp.path, st.st_size, st.st_mtime_ns, hashlib.sha256(fp.new_bytes).hexdigest(),
+                     fp.target, fp.fields)
+    log_func(f"-> Updated {fp.label}.", tag="success")
+    return STATUS_UPDATED
+
+def commit_file(fp: FilePlan, log_func, backup_dir: Path | None, run_id: str | None = None, cache=None,
+                journal_dir: Path = JOURNAL_DIR):
+    _backup_file(fp, log_func, backup_dir, run_id)
+    with span("write", files=1):
+        Transaction(journal_dir).commit([(fp.path, fp.new_bytes)])
+    return _committed(fp, log_func, cache)
+
+def process_gus(path: Path, target_x, target_y, apply_changes, label, log_func, backup_dir: Path | None,
+                run_id: str | None = None, profile: Profile | None = None, journal_dir: Path = JOURNAL_DIR):
+    fp, _ = plan_gus(path, label, target_x, target_y, profile=profile)
+    status = report_file(fp, log_func)
+    if status == STATUS_PLANNED:
+        if apply_changes:
+            status = commit_file(fp, log_func, backup_dir, run_id, journal_dir=journal_dir)
+        else:
+            log_func("-> Dry run (no write).", tag="muted")
+    inc("vts_files_total", status=status)
+    return status
+
+def root_gus(base: Path):
+    """The root WindowsClient/GameUserSettings.ini; RuntimeError if VALORANT never wrote it."""
+    gus_root = base / "WindowsClient" / "GameUserSettings.ini"
+    if not gus_root.is_file():
+        raise RuntimeError(
+            "Missing GameUserSettings.ini in WindowsClient.\nLaunch VALORANT once (native Fullscreen+Fill), then close."
+        )
+    return gus_root
+
+def native_gate(gus_root, check, nx, ny, force, log_func):
+    """Log a native_check_ok() result; False if the run must stop (failed and not forced)."""
+    ok, bad_key, bad_val = check
+    if not ok:
+        inc("vts_native_check_failures_total", key=bad_key, forced=str(bool(force)).lower())
+    if not ok and not force:
+        log_func(f"[!] Native check failed on {gus_root}", tag="error")
+        log_func(f"    Expected {bad_key} to match native {nx}x{ny} / flags False. Got '{bad_val}'.", tag="error")
+        log_func("    -> Open VALORANT on Fullscreen+Fill at native, then close and rerun.", tag="warning")
+        return False
+    elif not ok and force:
+        log_func(f"[!] Native check failed but continuing (--force). Key {bad_key} got '{bad_val}'", tag="warning")
+    return True
+
+def user_targets(base: Path, log_func):
+    """(path, label) targets of the LastKnownUser account folder (logs what was picked)."""
+    found = discover(base)
+    last_user = found.last_user
+    user_dir = found.user_folder()
+
+    log_func(f"Base config: {base}", tag="info")
+    log_func(f"LastKnownUser: {last_user or '??'}", tag="info")
+    log_func(f"User folder: {user_dir if user_dir else 'NOT FOUND (will still update root)'}",
+             tag="info" if user_dir else "warning")
+
+    if not user_dir:
+        return []
+    return account_targets(user_dir)
+
+def all_account_targets(base: Path, log_func):
+    """(path, label) targets of every account folder that has config files."""
+    found = discover(base)
+    accounts = [p for p, sc in zip(found.accounts, found.scores) if sc]
+    log_func(f"Base config: {base}", tag="info")
+    log_func(f"Accounts: {len(accounts)} (all accounts mode, LastKnownUser: {found.last_user or '??'})",
+             tag="info" if accounts else "warning")
+    return [t for p in accounts for t in account_targets(p)]
+
+ROOT_LABEL = "Root WindowsClient/GameUserSettings.ini"
+
+# Account files are independent, so with many of them reads/writes overlap on a small pool
+FILE_WORKERS = 8
+
+def _map_files(fn, items, workers=FILE_WORKERS):
+    """[fn(x) for x in items], on a thread pool once there are enough items; keeps order."""
+    items = list(items)
+    if len(items) < 4 or workers <= 1:
+        return [fn(x) for x in items]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+def resolve_targets(base: Path, nx, ny, force, log_func, profile: Profile | None = None):
+    """Native-check the root GUS file and list (path, label) targets under `base`.
+
+    Returns None when the native check fails and `force` is off.
+    """
+    gus_root = root_gus(base)
+    if not native_gate(gus_root, native_check_ok(read_doc(gus_root), nx, ny, profile), nx, ny, force, log_func):
+        return None
+    return [(gus_root, ROOT_LABEL)] + user_targets(base, log_func)
+
+@dataclass(frozen=True)
+class Plan:
+    base: Path
+    nx: int
+    ny: int
+    tx: int
+    ty: int
+    force: bool
+    files: tuple            # FilePlan per target, root first
+    deps: tuple             # ((path, stat key)) of discovery inputs
+    all_accounts: bool = False
+    profile: Profile = DEFAULT_PROFILE
+    created: float = field(default_factory=time.time)
+
+    @property
+    def targets(self):
+        return [(f.path, f.label) for f in self.files]
+
+    def matches(self, base, nx, ny, tx, ty, force, all_accounts=False, profile: Profile | None = None):
+        return ((Path(base), nx, ny, tx, ty, bool(force), bool(all_accounts), profile or DEFAULT_PROFILE)
+                == (self.base, self.nx, self.ny, self.tx, self.ty, self.force, self.all_accounts, self.profile))
+
+    def is_fresh(self):
+        return all(stat_key(p) == k for p, k in self.deps) and all(f.is_fresh() for f in self.files)
+
+def build_plan(base: Path, nx, ny, tx, ty, force, log_func, cache=None, all_accounts=False,
+               profile: Profile | None = None):
+    """Resolve targets and compute every edit, reading each file at most once
+    (not at all if `cache` knows it is unchanged and already at the target).
+
+    With `all_accounts`, every account folder under `base` is planned, not just LastKnownUser's.
+    `profile` (compiled once by the caller) supplies the edit and native-check rules.
+
+    Returns None when the native check fails and `force` is off.
+    """
+    base = Path(base)
+    profile = profile or DEFAULT_PROFILE
+    gus_root = root_gus(base)
+    deps = tuple((p, stat_key(p)) for p in discovery_inputs(base))
+    root_fp, check = plan_gus(gus_root, ROOT_LABEL, tx, ty, native=(nx, ny), cache=cache, profile=profile)
+    if check is None:
+        raise RuntimeError(f"Could not read {gus_root}")
+    if not native_gate(gus_root, check, nx, ny, force, log_func):
+        return None
+    targets = all_account_targets(base, log_func) if all_accounts else user_targets(base, log_func)
+    files = [root_fp] + _map_files(
+        lambda t: plan_gus(t[0], t[1], tx, ty, cache=cache, profile=profile)[0], targets)
+    return Plan(base, nx, ny, tx, ty, bool(force), tuple(files), deps, bool(all_accounts), profile)
+
+
+def _log_targets(targets, log_func):
+    log_func("\nPlanned updates:", tag="info")
+    for p, lbl in targets:
+        log_func(f" - {lbl} -> {p}", tag="muted")
+
+def _log_accounts(plan: Plan, statuses, log_func):
+    """One line per account folder with its file counts (all accounts mode)."""
+    per = {}
+    for fp in plan.files:
+        if fp.path in statuses:
+            acc = "(root)" if fp.label == ROOT_LABEL else fp.label.split("/", 1)[0]
+            counts = per.setdefault(acc, {})
+            counts[statuses[fp.path]] = counts.get(statuses[fp.path], 0) + 1
+    log_func(f"\nAccounts report ({len(per) - ('(root)' in per)} accounts):", tag="info")
+    for acc, counts in per.items():
+        log_func(f" - {acc}: " + ", ".join(f"{s}={n}" for s, n in sorted(counts.items())), tag="muted")
+
+def report_plan(plan: Plan, log_func, should_stop=None):
+    """Preview: log every file's diff; returns {path: status}."""
+    _log_targets(plan.targets, log_func)
+    statuses = {}
+    for fp in plan.files:
+        if should_stop is not None and should_stop():
+            break
+        statuses[fp.path] = report_file(fp, log_func)
+        if statuses[fp.path] == STATUS_PLANNED:
+            log_func("-> Dry run (no write).", tag="muted")
+        inc("vts_files_total", status=statuses[fp.path])
+    if plan.all_accounts:
+        _log_accounts(plan, statuses, log_func)
+    return statuses
+
+def apply_plan(plan: Plan, log_func, backup_dir: Path | None, run_id: str | None = None, cache=None,
+               journal_dir: Path = JOURNAL_DIR):
+    """Write a plan's bytes. If any input changed on disk since it was built, it is rebuilt first.
+
+    Every changed file is backed up, then all of them are replaced in one Transaction:
+    either every file gets its new bytes or (after a crash, on the next start) none do.
+
+    Returns (plan actually applied or None if the native check now fails, {path: status}).
+    """
+    if not plan.is_fresh():
+        log_func("[!] Config files changed since the preview; re-planning.", tag="warning")
+        plan = build_plan(plan.base, plan.nx, plan.ny, plan.tx, plan.ty, plan.force, log_func, cache,
+                          plan.all_accounts, plan.profile)
+        if plan is None:
+            return None, {}
+    run_id = run_id or new_run_id()
+    _log_targets(plan.targets, log_func)
+
+    def prepare(fp):
+        out = []
+        status = report_file(fp, lambda msg, tag=None: out.append((msg, tag)))
+        return status, out
+
+    reports = [prepare(fp) for fp in plan.files]
+    changed = [fp for fp, (status, _) in zip(plan.files, reports) if status == STATUS_PLANNED]
+    # One backup update for the whole plan (blobs written concurrently); each file's log stays in order
+    backed_up = _backup_files(changed, backup_dir, run_id)
+    statuses = {}
+    for fp, (status, out) in zip(plan.files, reports):
+        for msg, tag in out + backed_up.get(fp.path, []):
+            log_func(msg, tag=tag)
+        statuses[fp.path] = status
+    with span("write", files=len(changed)):
+        # Own journal per plan: the roots of one batch share `run_id` and commit concurrently
+        Transaction(journal_dir).commit([(fp.path, fp.new_bytes) for fp in changed], _map_files)
+    for fp in changed:
+        statuses[fp.path] = _committed(fp, log_func, cache)
+    if changed:
+        inc("vts_applies_total")
+    for status in statuses.values():
+        inc("vts_files_total", status=status)
+    if plan.all_accounts:
+        _log_accounts(plan, statuses, log_func)
+    return plan, statuses
+
+# Batch (headless) runs 
+
+@dataclass
+class RootResult:
+    base: Path
+    ok: bool = False
+    error: str | None = None
+    run_id: str | None = None
+    statuses: dict = field(default_factory=dict)
+    log: list = field(default_factory=list)
+    elapsed: float = 0.0    # seconds spent in run_root
+
+    def count(self, status):
+        return sum(1 for s in self.statuses.values() if s == status)
+
+    def as_dict(self):
+        return {
+            "base": str(self.base),
+            "ok": self.ok,
+            "error": self.error,
+            "run_id": self.run_id,
+            "files": {str(p): s for p, s in self.statuses.items()},
+            "elapsed": round(self.elapsed, 6),
+        }
+
+def run_root(base: Path, nx, ny, tx, ty, apply_changes=False, force=False, backup_dir: Path | None = None,
+             cache=None, all_accounts=False, profile: Profile | None = None, run_id: str | None = None,
+             journal_dir: Path = JOURNAL_DIR):
+    """Resolve and process one config base; never raises, logs are kept on the result.
+
+    Backups go under `run_id` (default: a new one); run_batch passes one id for the whole batch.
+    """
+    t0 = time.perf_counter()
+    res = RootResult(base=Path(base), run_id=run_id or new_run_id())
+    def log(msg, tag=None):
+        res.log.append((msg, tag))
+    try:
+        plan = build_plan(res.base, nx, ny, tx, ty, force, log, cache, all_accounts, profile)
+        if plan is not None and apply_changes:
+            plan, res.statuses = apply_plan(plan, log, backup_dir, res.run_id, cache, journal_dir)
+        elif plan is not None:
+            res.statuses = report_plan(plan, log)
+        if plan is None:
+            res.error = "Native check failed"
+        else:
+            res.ok = True
+    except Exception as e:
+        log(f"Error: {e}", tag="error")
+        res.error = str(e)
+    res.elapsed = time.perf_counter() - t0
+    return res
+
+def expand_bases(patterns):
+    """Expand config base paths/globs into an ordered, de-duplicated list of directories."""
+    seen = {}
+    for pat in patterns:
+        hits = sorted(glob.glob(pat)) if glob.has_magic(pat) else [pat]
+        for h in hits:
+            p = Path(h)
+            if p.is_dir():
+                seen.setdefault(p.resolve(), p)
+    return list(seen.values())
+
+def run_batch(bases, nx, ny, tx, ty, apply_changes=False, force=False, backup_dir: Path | None = None,
+              workers: int | None = None, on_result=None,
+              backup_max_bytes: int | None = DEFAULT_MAX_BYTES, backup_max_runs: int | None = DEFAULT_MAX_RUNS,
+              cache=None, all_accounts=False, profile: Profile | None = None, journal_dir: Path = JOURNAL_DIR):
+    """Process many config bases on a bounded thread pool; results keep input order.
+
+    One compiled `profile` is shared by every base and file (see ValorantTrueStretch_Profiles).
+
+    Every base backs up under one run id (so a rollback undoes the whole batch). The backup
+    store is pruned to its budget, keeping that run, and the state cache saved, once after
+    every base is done.
+    """
+    bases = [Path(b) for b in bases]
+    if not bases:
+        return []
+    run_id = new_run_id()
+    workers = max(1, min(workers or min(32, (os.cpu_count() or 1) * 4), len(bases)))
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_root, b, nx, ny, tx, ty, apply_changes, force, backup_dir, cache, all_accounts, profile,
+                        run_id, journal_dir)
+            for b in bases
+        ]
+        results = []
+        for f in futures:
+            r = f.result()
+            if on_result:
+                on_result(r)
+            results.append(r)
+    if apply_changes and backup_dir:
+        prune_backups(backup_dir, keep_run=run_id, max_bytes=backup_max_bytes, max_runs=backup_max_runs)
+    if cache is not None:
+        cache.save()
+    return results
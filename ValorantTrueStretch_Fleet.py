@@ -0,0 +1,396 @@
+# ValorantTrueStretch_Fleet.py
+# Push true stretch to many PCs: a small asyncio agent on each machine and an
+# orchestrator that fans one job out to all of them.
+# Made by GlitchFL (credit required if you share)
+#
+# Protocol: newline-delimited JSON over one TCP connection per agent (reused for every
+# job). Request {"id", "op", "token"?, ...}, reply {"id", "ok", "result" | "error"}.
+#   ping                                   -> {"host", "base"}
+#   check    native, profile?              -> {"native_ok", "key", "value"}  (root GUS native check)
+#   run      native, target, apply, force, all_accounts, profile? -> RootResult.as_dict() + "log"
+#   desktop  target                        -> {"changed", "message"}  (Windows only)
+#   metrics                                -> {"text"}  (Prometheus text; agent started with a --metrics-* option)
+# `profile` is an edit profile document (see ValorantTrueStretch_Profiles); agents compile
+# each distinct one once. Without it the built-in true-stretch rules apply.
+# `key` (sent by the orchestrator, one per job) makes run/desktop idempotent: a retry after a
+# timeout gets the first attempt's result (waiting for it if still running) instead of a rerun.
+#
+# Examples:
+#   python ValorantTrueStretch_Fleet.py agent --listen 0.0.0.0 --token SECRET
+#   python ValorantTrueStretch_Fleet.py push -f hosts.txt --token SECRET --native 2560x1440 --target 1280x1024 --apply
+
+import os
+import sys
+import hmac
+import json
+import time
+import uuid
+import socket
+import asyncio
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ValorantTrueStretch_Engine import (
+    parse_whx, read_doc, native_check_ok, run_root, prune_backups, get_base_config_dir, root_gus,
+)
+from ValorantTrueStretch_Journal import recover, JOURNAL_DIR
+from ValorantTrueStretch_Profiles import get_profile, compile_profile, DEFAULT_PROFILE, DEFAULT_NAME
+import ValorantTrueStretch_Metrics as metrics
+
+DEFAULT_PORT = 8765
+DEFAULT_BACKUP_DIR = Path.home() / "Documents" / "ValorantTrueStretch_Backups"
+MAX_MESSAGE = 4 * 1024 * 1024   # one JSON line (run replies carry the per-file log)
+DEDUPE_JOBS = 256               # idempotency keys an agent remembers
+
+class FleetError(Exception):
+    """The agent answered, but the job failed there (not retried)."""
+
+# Agent
+
+class Agent:
+    """Serves one machine's config base. Jobs run one at a time on a worker thread."""
+
+    def __init__(self, base: Path, token: str | None = None, backup_dir: Path | None = DEFAULT_BACKUP_DIR,
+                 registry=None, journal_dir: Path = JOURNAL_DIR):
+        self.base = Path(base)
+        self.token = token
+        self.backup_dir = backup_dir
+        self.registry = registry
+        self.journal_dir = journal_dir
+        self._busy = asyncio.Lock()
+        self._jobs = {}         # (op, key) -> Future of the result, oldest first
+
+    def _profile(self, req):
+        data = req.get("profile")
+        return None if data is None else compile_profile(data)
+
+    def _check(self, req):
+        nx, ny = parse_whx(req["native"])
+        ok, key, value = native_check_ok(read_doc(root_gus(self.base)), nx, ny, self._profile(req))
+        return {"native_ok": ok, "key": key, "value": value}
+
+    def _run(self, req):
+        nx, ny = parse_whx(req["native"])
+        tx, ty = parse_whx(req["target"])
+        apply_changes = bool(req.get("apply"))
+        backup_dir = self.backup_dir if apply_changes else None
+        if backup_dir:
+            backup_dir.mkdir(parents=True, exist_ok=True)
+        r = run_root(self.base, nx, ny, tx, ty, apply_changes, bool(req.get("force")), backup_dir,
+                     all_accounts=bool(req.get("all_accounts")), profile=self._profile(req),
+                     journal_dir=self.journal_dir)
+        if backup_dir and r.statuses:
+            try:
+                prune_backups(backup_dir, keep_run=r.run_id)
+            except OSError as e:
+                r.log.append((f"[!] Backup prune failed: {e}", "error"))
+        return r.as_dict() | {"log": [msg.rstrip("\n") for msg, _tag in r.log]}
+
+    def _desktop(self, req):
+        if os.name != "nt":
+            raise FleetError("Changing the desktop resolution is only supported on Windows.")
+        from ValorantTrueStretch_Display import change_desktop_resolution
+        changed, message = change_desktop_resolution(*parse_whx(req["target"]))
+        return {"changed": changed, "message": message}
+
+    async def _dispatch(self, req):
+        op = req.get("op")
+        if op == "ping":
+            return {"host": socket.gethostname(), "base": str(self.base)}
+        if op == "metrics":
+            if self.registry is None:
+                raise FleetError("Metrics are off on this agent.")
+            return {"text": self.registry.prometheus_text()}
+        fn = {"check": self._check, "run": self._run, "desktop": self._desktop}.get(op)
+        if fn is None:
+            raise FleetError(f"Unknown op {op!r}")
+        key = req.get("key")
+        if key is None or op == "check":
+            return await self._locked(fn, req)
+        fut = self._jobs.get((op, key))
+        if fut is None:
+            fut = self._jobs[(op, key)] = asyncio.ensure_future(self._locked(fn, req))
+            while len(self._jobs) > DEDUPE_JOBS:
+                del self._jobs[next(iter(self._jobs))]
+        return await asyncio.shield(fut)    # a dropped connection must not cancel the job
+
+    async def _locked(self, fn, req):
+        async with self._busy:
+            return await asyncio.to_thread(fn, req)
+
+    def _authorized(self, req):
+        return self.token is None or hmac.compare_digest(str(req.get("token", "")), self.token)
+
+    async def handle(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                reply = {"id": None, "ok": False}
+                try:
+                    req = json.loads(line)
+                    reply["id"] = req.get("id")
+                    if not self._authorized(req):
+                        raise FleetError("Bad or missing token.")
+                    reply["result"] = await self._dispatch(req)
+                    reply["ok"] = True
+                except Exception as e:
+                    reply["error"] = f"{type(e).__name__}: {e}" if not isinstance(e, FleetError) else str(e)
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass    # client went away or sent an over-long line
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_MESSAGE)
+
+# Orchestrator
+
+def parse_host(s: str, default_port=DEFAULT_PORT):
+    host, sep, port = s.strip().rpartition(":")
+    return (host, int(port)) if sep and port.isdigit() else (s.strip(), default_port)
+
+class AgentClient:
+    """One persistent connection to an agent; reconnects on the next call after a failure."""
+
+    def __init__(self, host, port=DEFAULT_PORT, token: str | None = None):
+        self.host, self.port, self.token = host, port, token
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._next_id = 0
+
+    @property
+    def name(self):
+        return f"{self.host}:{self.port}"
+
+    async def call(self, op, **params):
+        async with self._lock:
+            try:
+                if self._conn is None:
+                    self._conn = await asyncio.open_connection(self.host, self.port, limit=MAX_MESSAGE)
+                reader, writer = self._conn
+                self._next_id += 1
+                req = {"id": self._next_id, "op": op, **params}
+                if self.token is not None:
+                    req["token"] = self.token
+                writer.write(json.dumps(req).encode("utf-8") + b"\n")
+                await writer.drain()
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("Agent closed the connection.")
+                reply = json.loads(line)
+            except BaseException:
+                await self.close()   # half-used connection (incl. timeouts): start clean next time
+                raise
+        if reply.get("id") != req["id"]:
+            await self.close()
+            raise ConnectionError("Reply out of sequence.")
+        if not reply.get("ok"):
+            raise FleetError(reply.get("error") or "Agent error")
+        return reply["result"]
+
+    async def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn[1].close()
+            try:
+                await conn[1].wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+@dataclass
+class HostResult:
+    host: str
+    ok: bool = False
+    result: dict | None = None
+    error: str | None = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    def as_dict(self):
+        return {"host": self.host, "ok": self.ok, "result": self.result, "error": self.error,
+                "attempts": self.attempts, "elapsed": round(self.elapsed, 6)}
+
+@dataclass
+class Orchestrator:
+    """Fans jobs out to agents: at most `concurrency` in flight, `timeout` seconds per
+    attempt, up to `retries` more attempts (exponential backoff) on network errors.
+    Every job carries one idempotency key, so retrying an apply never runs it twice."""
+    hosts: list
+    token: str | None = None
+    concurrency: int = 64
+    timeout: float = 60.0
+    retries: int = 2
+    backoff: float = 0.5
+    clients: dict = field(default_factory=dict)
+
+    def _client(self, host):
+        c = self.clients.get(host)
+        if c is None:
+            c = self.clients[host] = AgentClient(*parse_host(host), token=self.token)
+        return c
+
+    async def _one(self, sem, host, op, params):
+        res = HostResult(host)
+        t0 = time.perf_counter()
+        async with sem:
+            client = self._client(host)
+            for attempt in range(self.retries + 1):
+                res.attempts = attempt + 1
+                try:
+                    res.result = await asyncio.wait_for(client.call(op, **params), self.timeout)
+                    res.ok, res.error = True, None
+                    break
+                except FleetError as e:
+                    res.error = str(e)
+                    break
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                    res.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                    if attempt < self.retries:
+                        await asyncio.sleep(self.backoff * 2 ** attempt)
+        res.elapsed = time.perf_counter() - t0
+        return res
+
+    async def stream(self, op, **params):
+        """Yield a HostResult per host as each one finishes."""
+        sem = asyncio.Semaphore(self.concurrency)
+        params = {"key": uuid.uuid4().hex, **params}
+        tasks = [asyncio.create_task(self._one(sem, h, op, params)) for h in self.hosts]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    async def run(self, op, on_result=None, **params):
+        """Every host's HostResult, in host order."""
+        by_host = {}
+        async for r in self.stream(op, **params):
+            if on_result:
+                on_result(r)
+            by_host[r.host] = r
+        return [by_host[h] for h in self.hosts]
+
+    async def close(self):
+        await asyncio.gather(*(c.close() for c in self.clients.values()))
+
+# CLI
+
+def _read_hosts(args):
+    hosts = list(args.hosts)
+    if args.hosts_file:
+        for ln in Path(args.hosts_file).read_text(encoding="utf-8", errors="ignore").splitlines():
+            ln = ln.strip()
+            if ln and not ln.startswith("#"):
+                hosts.append(ln)
+    return list(dict.fromkeys(hosts))
+
+def _summary_line(r: HostResult):
+    if not r.ok:
+        return f"FAIL  {r.host}  ({r.error}, {r.attempts} attempt(s))"
+    res = r.result
+    if "files" in res:
+        if not res["ok"]:
+            return f"FAIL  {r.host}  ({res['error']})"
+        counts = {}
+        for s in res["files"].values():
+            counts[s] = counts.get(s, 0) + 1
+        return f"OK    {r.host}  " + " ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+    return f"OK    {r.host}  {json.dumps(res)}"
+
+async def _serve(args):
+    base = Path(args.base) if args.base else get_base_config_dir()
+    recover(log_func=lambda msg, tag=None: print(msg, file=sys.stderr))
+    registry, stop_metrics = metrics.start_exporters(args)
+    agent = Agent(base, args.token, None if args.no_backup else Path(args.backup_dir), registry)
+    server = await agent.serve(args.listen, args.port)
+    addrs = ", ".join(f"{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets)
+    print(f"Agent for {base} listening on {addrs}", flush=True)
+    try:
+        with metrics.collecting(registry):
+            async with server:
+                await server.serve_forever()
+    finally:
+        stop_metrics()
+
+async def _push(args):
+    hosts = _read_hosts(args)
+    if not hosts:
+        print("No hosts given.", file=sys.stderr)
+        return 2
+    orch = Orchestrator(hosts, args.token, args.concurrency, args.timeout, args.retries)
+
+    def on_result(r):
+        print(json.dumps(r.as_dict()) if args.json else _summary_line(r), flush=True)
+
+    t0 = time.perf_counter()
+    try:
+        params = {"native": args.native, "target": args.target, "apply": args.apply,
+                  "force": args.force, "all_accounts": args.all_accounts}
+        if args.profile is not DEFAULT_PROFILE:
+            params["profile"] = args.profile.data
+        results = await orch.run("run", on_result, **params)
+        if args.desktop and args.apply:
+            ok_hosts = [r.host for r in results if r.ok and r.result.get("ok")]
+            desk = Orchestrator(ok_hosts, args.token, args.concurrency, args.timeout, args.retries,
+                                clients=orch.clients)   # same connections
+            await desk.run("desktop", on_result, target=args.target)
+    finally:
+        await orch.close()
+    failed = sum(1 for r in results if not (r.ok and r.result.get("ok")))
+    if not args.json:
+        print(f"\n{len(results)} host(s) in {time.perf_counter() - t0:.2f}s, {failed} failed.")
+    return 1 if failed else 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Push VALORANT true stretch to many PCs.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ag = sub.add_parser("agent", help="Serve this PC's config base to the orchestrator")
+    ag.add_argument("--listen", default="127.0.0.1", help="Address to bind (default: %(default)s)")
+    ag.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ag.add_argument("--base", help="Config base folder (default: local %%LOCALAPPDATA%% base)")
+    ag.add_argument("--token", help="Shared secret every request must carry (required off localhost)")
+    ag.add_argument("--backup-dir", default=str(DEFAULT_BACKUP_DIR), help="Backup folder (default: %(default)s)")
+    ag.add_argument("--no-backup", action="store_true", help="Do not save backups & diffs")
+    metrics.add_arguments(ag)
+
+    ps = sub.add_parser("push", help="Run one verify/preview/apply on every agent")
+    ps.add_argument("hosts", nargs="*", help=f"Agents as HOST or HOST:PORT (default port {DEFAULT_PORT})")
+    ps.add_argument("-f", "--hosts-file", help="Text file with one agent per line")
+    ps.add_argument("--native", required=True, help="Native resolution, WIDTHxHEIGHT")
+    ps.add_argument("--target", required=True, help="Target stretch resolution, WIDTHxHEIGHT")
+    ps.add_argument("--apply", action="store_true", help="Write changes (default is a preview)")
+    ps.add_argument("--force", action="store_true", help="Skip the native check")
+    ps.add_argument("--all-accounts", action="store_true", help="Every account folder, not just LastKnownUser's")
+    ps.add_argument("--profile", default=DEFAULT_NAME,
+                    help="Edit profile: built-in name or .json/.toml file, sent to every agent (default: %(default)s)")
+    ps.add_argument("--desktop", action="store_true", help="With --apply, also switch each PC's desktop to the target")
+    ps.add_argument("--token", help="Shared secret configured on the agents")
+    ps.add_argument("-c", "--concurrency", type=int, default=64, help="Agents contacted at once (default: %(default)s)")
+    ps.add_argument("--timeout", type=float, default=60.0, help="Seconds per attempt (default: %(default)s)")
+    ps.add_argument("--retries", type=int, default=2, help="Extra attempts on network errors (default: %(default)s)")
+    ps.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "agent":
+        if args.token is None and args.listen not in ("127.0.0.1", "localhost", "::1"):
+            print("Refusing to listen off localhost without --token.", file=sys.stderr)
+            return 2
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    try:
+        parse_whx(args.native); parse_whx(args.target)
+        args.profile = get_profile(args.profile)
+    except (ValueError, OSError) as e:
+        print(f"Input Error: {e}", file=sys.stderr)
+        return 2
+    return asyncio.run(_push(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
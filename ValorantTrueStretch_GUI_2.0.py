@@ -4,28 +4,30 @@
 # Made by GlitchFL (credit required if you share)
 
 import os
-import re
-import difflib
-import shutil
-import json
-import threading
-import ctypes
-import datetime as _dt
+import queue
 from pathlib import Path
 
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import messagebox, filedialog
 
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.scrolled import ScrolledText
 
+from ValorantTrueStretch_Engine import (
+    parse_whx, write_text, build_plan, report_plan, apply_plan, get_base_config_dir, _timestamp,
+    prune_backups, new_run_id, invalidate_discovery,
+)
+from ValorantTrueStretch_Cache import StateCache
+from ValorantTrueStretch_Journal import recover
+from ValorantTrueStretch_Trace import Tracer, tracing, trace_path
+from ValorantTrueStretch_Jobs import JobRunner, JobCancelled, CANCELLED, FAILED
+from ValorantTrueStretch_Presets import PresetStore, PresetIndex, preset_label
+
 APP_TITLE = "VALORANT Configuration Tool"
 VERSION = "2.4 GlitchFL"
 
-FULLSCREEN_KEY = "FullscreenMode"
-HDR_KEY = "HDRDisplayOutputNits"
-
 RESOLUTIONS = {
     "native": ["3840x2160", "2560x1440", "1920x1080", "2560x1080", "3440x1440"],
     "target": [
@@ -34,279 +36,17 @@ RESOLUTIONS = {
     ],
 }
 
-PRESETS_PATH = Path.home() / "Documents" / "ValorantTrueStretch_Presets.json"
-
-# Core helpers 
-
-def parse_whx(s: str):
-    s = s.strip()
-    m = re.fullmatch(r"(\d+)[xX](\d+)", s)
-    if not m:
-        raise ValueError("Invalid format. Use WIDTHxHEIGHT (e.g., 2560x1440)")
-    return int(m.group(1)), int(m.group(2))
-
-def read_lines(path: Path):
-    return path.read_text(encoding="utf-8", errors="ignore").splitlines(keepends=True)
-
-def write_text(path: Path, text: str):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding="utf-8")
-
-def write_lines(path: Path, lines):
-    write_text(path, "".join(lines))
-
-def update_kv_lines(lines, updates: dict):
-    changed = False
-    found = set()
-    out = []
-    for ln in lines:
-        m = re.match(r"^\s*([A-Za-z0-9_]+)\s*=\s*(.*)\s*$", ln)
-        if m:
-            k = m.group(1)
-            if k in updates and updates[k] is not None:
-                v = str(updates[k])
-                new_ln = f"{k}={v}\n"
-                if ln != new_ln:
-                    changed = True
-                    ln = new_ln
-                found.add(k)
-        out.append(ln)
-    for k, v in updates.items():
-        if v is None:
-            continue
-        if k not in found:
-            out.append(f"{k}={v}\n")
-            changed = True
-    return out, changed
-
-def ensure_hdr_and_fullscreen(lines, hdr_val="1000", fs_val="2"):
-    out = []
-    seen_hdr = False
-    for ln in lines:
-        if re.match(rf"^\s*{HDR_KEY}\s*=\s*\d+\s*$", ln):
-            seen_hdr = True
-            ln = f"{HDR_KEY}={hdr_val}\n"
-            out.append(ln)
-            out.append(f"{FULLSCREEN_KEY}={fs_val}\n")
-        elif re.match(rf"^\s*{FULLSCREEN_KEY}\s*=\s*\d+\s*$", ln):
-            continue
-        else:
-            out.append(ln)
-    if not seen_hdr:
-        if len(out) == 0 or not out[-1].endswith("\n"):
-            out.append("\n")
-        out.append(f"{HDR_KEY}={hdr_val}\n")
-        out.append(f"{FULLSCREEN_KEY}={fs_val}\n")
-    return out, True
-
-def file_diff(old_lines, new_lines, label):
-    return "".join(
-        difflib.unified_diff(
-            old_lines, new_lines, fromfile=f"{label} (current)", tofile=f"{label} (new)", n=3
-        )
-    )
-
-def get_base_config_dir():
-    local = os.environ.get("LOCALAPPDATA")
-    if not local:
-        raise RuntimeError("Couldn't resolve %LOCALAPPDATA%. Are you on Windows?")
-    return Path(local) / "VALORANT" / "Saved" / "Config"
-
-def get_last_known_user(windows_client_dir: Path):
-    rlmi = windows_client_dir / "RiotLocalMachine.ini"
-    if not rlmi.is_file():
-        return None
-    txt = rlmi.read_text(encoding="utf-8", errors="ignore").splitlines()
-    for ln in txt:
-        m = re.match(r"^\s*LastKnownUser\s*=\s*([A-Za-z0-9\-]+)\s*$", ln)
-        if m:
-            return m.group(1)
-    return None
-
-def find_user_folder(base: Path, last_known: str):
-    if not last_known:
-        return None
-    candidates = [
-        p for p in base.iterdir() if p.is_dir() and p.name.lower().startswith(last_known.lower() + "-")
-    ]
-    def score(p):
-        s = 0
-        if (p / "Windows").is_dir(): s += 1
-        if (p / "WindowsClient").is_dir(): s += 1
-        return s
-    if not candidates:
-        return None
-    candidates.sort(key=score, reverse=True)
-    return candidates[0]
-
-def native_check_ok(lines, native_x, native_y):
-    want = {
-        "ResolutionSizeX": str(native_x),
-        "ResolutionSizeY": str(native_y),
-        "LastUserConfirmedResolutionSizeX": str(native_x),
-        "LastUserConfirmedResolutionSizeY": str(native_y),
-        "bShouldLetterbox": "False",
-        "bLastConfirmedShouldLetterbox": "False",
-    }
-    got = {}
-    for ln in lines:
-        m = re.match(r"^\s*([A-Za-z0-9_]+)\s*=\s*(.*)\s*$", ln)
-        if m:
-            got[m.group(1)] = m.group(2).strip()
-    for k, v in want.items():
-        if got.get(k) != v:
-            return False, k, got.get(k)
-    return True, None, None
-
-def make_updates_for_target(target_x, target_y):
-    return {
-        "ResolutionSizeX": str(target_x),
-        "ResolutionSizeY": str(target_y),
-        "LastUserConfirmedResolutionSizeX": str(target_x),
-        "LastUserConfirmedResolutionSizeY": str(target_y),
-        "bShouldLetterbox": "False",
-        "bLastConfirmedShouldLetterbox": "False",
-    }
-
-def _timestamp():
-    return _dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-
-def safe_backup(src_path: Path, backup_root: Path, diff_text: str | None):
-    rel = src_path.as_posix().replace(":", "")
-    dst_dir = backup_root / _timestamp() / Path(rel).parent
-    dst_dir.mkdir(parents=True, exist_ok=True)
-    dst_file = dst_dir / (src_path.name + ".bak")
-    shutil.copy2(src_path, dst_file)
-    if diff_text:
-        write_text(dst_dir / (src_path.stem + ".patch"), diff_text)
-    return dst_file
-
-def process_gus(path: Path, target_x, target_y, apply_changes, label, log_func, backup_dir: Path | None):
-    if not path.is_file():
-        log_func(f"- Skipping (not found): {label} -> {path}", tag="warning")
-        return
-    old = read_lines(path)
-    updates = make_updates_for_target(target_x, target_y)
-    temp, changed_a = update_kv_lines(old, updates)
-    temp2, _ = ensure_hdr_and_fullscreen(temp, "1000", "2")
-    changed = changed_a or (temp2 != old)
-    if not changed:
-        log_func(f"- No changes needed: {label}", tag="muted")
-        return
-    diff = file_diff(old, temp2, str(path))
-    log_func(f"\n>>> {label}\n{diff if diff.strip() else '(content replaced)'}", tag="info")
-    if apply_changes:
-        if backup_dir:
-            try:
-                saved = safe_backup(path, backup_dir, diff)
-                log_func(f"-> Backup saved: {saved}", tag="success")
-            except Exception as be:
-                log_func(f"[!] Backup failed: {be}", tag="error")
-        write_lines(path, temp2)
-        log_func(f"-> Updated {label}.", tag="success")
-    else:
-        log_func("-> Dry run (no write).", tag="muted")
-
-# Windows desktop resolution control 
-
-# Minimal DEVMODE for width/height changes
-class DEVMODE(ctypes.Structure):
-    _fields_ = [
-        ("dmDeviceName", ctypes.c_wchar * 32),
-        ("dmSpecVersion", ctypes.c_uint16),
-        ("dmDriverVersion", ctypes.c_uint16),
-        ("dmSize", ctypes.c_uint16),
-        ("dmDriverExtra", ctypes.c_uint16),
-        ("dmFields", ctypes.c_uint32),
-        ("dmOrientation", ctypes.c_int16),
-        ("dmPaperSize", ctypes.c_int16),
-        ("dmPaperLength", ctypes.c_int16),
-        ("dmPaperWidth", ctypes.c_int16),
-        ("dmScale", ctypes.c_int16),
-        ("dmCopies", ctypes.c_int16),
-        ("dmDefaultSource", ctypes.c_int16),
-        ("dmPrintQuality", ctypes.c_int16),
-        ("dmColor", ctypes.c_int16),
-        ("dmDuplex", ctypes.c_int16),
-        ("dmYResolution", ctypes.c_int16),
-        ("dmTTOption", ctypes.c_int16),
-        ("dmCollate", ctypes.c_int16),
-        ("dmFormName", ctypes.c_wchar * 32),
-        ("dmLogPixels", ctypes.c_uint16),
-        ("dmBitsPerPel", ctypes.c_uint32),
-        ("dmPelsWidth", ctypes.c_uint32),
-        ("dmPelsHeight", ctypes.c_uint32),
-        ("dmDisplayFlags", ctypes.c_uint32),
-        ("dmDisplayFrequency", ctypes.c_uint32),
-        ("dmICMMethod", ctypes.c_uint32),
-        ("dmICMIntent", ctypes.c_uint32),
-        ("dmMediaType", ctypes.c_uint32),
-        ("dmDitherType", ctypes.c_uint32),
-        ("dmReserved1", ctypes.c_uint32),
-        ("dmReserved2", ctypes.c_uint32),
-        ("dmPanningWidth", ctypes.c_uint32),
-        ("dmPanningHeight", ctypes.c_uint32),
-    ]
-
-# Flags/consts
-ENUM_CURRENT_SETTINGS = -1
-DM_PELSWIDTH  = 0x00080000
-DM_PELSHEIGHT = 0x00100000
-
-CDS_UPDATEREGISTRY = 0x00000001
-CDS_TEST           = 0x00000002
-CDS_FULLSCREEN     = 0x00000004
-
-DISP_CHANGE_SUCCESSFUL = 0
-DISP_CHANGE_RESTART    = 1
-DISP_CHANGE_FAILED     = -1
-DISP_CHANGE_BADMODE    = -2
-DISP_CHANGE_NOTUPDATED = -3
-DISP_CHANGE_BADFLAGS   = -4
-DISP_CHANGE_BADPARAM   = -5
-
-def detect_primary_resolution():
-    """Get current primary screen resolution in physical pixels."""
-    try:
-        user32 = ctypes.windll.user32
-        # Ensure pixel-accurate metrics on high-DPI systems
-        try:
-            user32.SetProcessDPIAware()
-        except Exception:
-            pass
-        w = user32.GetSystemMetrics(0)  # SM_CXSCREEN
-        h = user32.GetSystemMetrics(1)  # SM_CYSCREEN
-        if w and h:
-            return w, h
-    except Exception:
-        pass
-    return None
-
-def change_desktop_resolution(width: int, height: int):
-    """Change primary display resolution to width x height using ChangeDisplaySettings."""
-    try:
-        devmode = DEVMODE()
-        devmode.dmSize = ctypes.sizeof(DEVMODE)
-        ctypes.windll.user32.EnumDisplaySettingsW(None, ENUM_CURRENT_SETTINGS, ctypes.byref(devmode))
-        devmode.dmFields = DM_PELSWIDTH | DM_PELSHEIGHT
-        devmode.dmPelsWidth = int(width)
-        devmode.dmPelsHeight = int(height)
-
-        # Test first
-        test = ctypes.windll.user32.ChangeDisplaySettingsW(ctypes.byref(devmode), CDS_TEST)
-        if test != DISP_CHANGE_SUCCESSFUL:
-            return False, f"Mode not supported by Windows (code {test})."
-
-        # Apply
-        rc = ctypes.windll.user32.ChangeDisplaySettingsW(ctypes.byref(devmode), 0)
-        if rc == DISP_CHANGE_SUCCESSFUL:
-            return True, "Desktop resolution changed."
-        elif rc == DISP_CHANGE_RESTART:
-            return True, "Desktop resolution changed (restart required)."
-        else:
-            return False, f"Failed to change resolution (code {rc})."
-    except Exception as e:
-        return False, f"Error changing resolution: {e}"
+# Output panel: UI queue drain period, max events per drain, on-screen line cap
+LOG_FLUSH_MS = 40
+LOG_BATCH_MAX = 5000
+LOG_MAX_LINES = 5000
+
+# Preset edits are written this long after the last one (and on exit)
+PRESET_FLUSH_MS = 1000
+
+# Quick-button bar: buttons per page, row wrap width (px)
+QUICK_PAGE_SIZE = 24
+QUICK_ROW_WIDTH = 760
 
 # -------------------- ttkbootstrap UI --------------------
 
@@ -321,11 +61,24 @@ class App(tb.Window):
         self.native_var = tk.StringVar()
         self.target_var = tk.StringVar()
         self.force_var = tk.BooleanVar(value=False)
+        self.all_accounts_var = tk.BooleanVar(value=False)  # every <user>-<region> folder, not just LastKnownUser
+        self.trace_var = tk.BooleanVar(value=False)  # per-stage timings in the Output panel + trace file
         self.backup_var = tk.BooleanVar(value=True)
         self.change_desktop_var = tk.BooleanVar(value=False)  # NEW: change Windows desktop on Apply
         self.backup_dir_var = tk.StringVar(value=str(Path.home() / "Documents" / "ValorantTrueStretch_Backups"))
         self.cfg_base_var = tk.StringVar(value="")
-        self.presets = self._load_presets()
+        self._preset_store = PresetStore()
+        self._preset_flush_id = None
+        self.presets = []  # the store's list, loaded after the window is shown (_finish_startup)
+        self.quick_filter_var = tk.StringVar()
+        self._quick_page = 0
+        self._quick_rows = []  # [(row frame, [[button, shown preset key], ...])], reused across renders
+        self._preset_index = None  # PresetIndex over self.presets, rebuilt lazily after edits
+        self._modes = None  # ModeIndex of the primary display (Windows only), loaded at startup
+        self._ui_q = queue.SimpleQueue()
+        self._jobs = JobRunner(on_change=self._on_job_change)
+        self._plan = None  # last verify/preview Plan, reused by apply while still fresh
+        self._state = StateCache()  # skips re-reading configs unchanged since the last run
 
         # UI
         self._build_header()
@@ -336,13 +89,32 @@ class App(tb.Window):
         self.native_var.set("2560x1440")
         self.target_var.set("1280x1024")
         self._log("Ready. Make sure VALORANT is completely closed (Riot Client can remain open).", tag="muted")
-        self._detect_base_config_dir()
 
         # Shortcuts
         self.bind("<F1>", lambda e: self.preflight())
         self.bind("<F2>", lambda e: self.dry_run())
         self.bind("<Control-Return>", lambda e: self.apply())
         self.bind("<Control-l>", lambda e: self._clear_log())
+        self.bind("<Escape>", lambda e: self.cancel_job())
+
+        self.after(LOG_FLUSH_MS, self._drain_ui)
+        # Everything not needed for the first frame runs once the window is on screen
+        self._started = False
+        self.bind("<Map>", self._on_first_map, add="+")
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_first_map(self, event):
+        if self._started or event.widget is not self:
+            return
+        self._started = True
+        self.after_idle(self._finish_startup)
+
+    def _finish_startup(self):
+        self.presets = self._preset_store.presets
+        self._presets_changed()
+        self._load_display_modes()
+        self._detect_base_config_dir()
+        self._run_job("recover", lambda job: recover(log_func=self._log))  # finish an interrupted apply
 
     # ----- Layout
     def _build_header(self):
@@ -394,11 +166,11 @@ class App(tb.Window):
         )
         native_combo.grid(row=1, column=0, sticky=EW, padx=(0, 10), pady=(4, 8))
 
-        target_combo = tb.Combobox(
+        self.target_combo = tb.Combobox(
             grid, textvariable=self.target_var, values=RESOLUTIONS["target"], width=20,
             bootstyle=INFO, state="readonly"
         )
-        target_combo.grid(row=1, column=2, sticky=EW, padx=(0, 10), pady=(4, 8))
+        self.target_combo.grid(row=1, column=2, sticky=EW, padx=(0, 10), pady=(4, 8))
 
         # NEW: Detect native button (small)
         tb.Button(grid, text="Detect", bootstyle=SECONDARY, command=self._detect_native)\
@@ -416,15 +188,29 @@ class App(tb.Window):
         self.native_entry.grid(row=3, column=0, sticky=EW, pady=(2, 4))
         self.target_entry = tb.Entry(grid)
         self.target_entry.grid(row=3, column=2, sticky=EW, pady=(2, 4))
+        self.target_entry.bind("<KeyRelease>", lambda e: self._refresh_target_choices())
 
         # Quick Buttons (user-defined)
         self.quick_row = tb.Frame(card)
         self.quick_row.pack(fill=X, pady=(8, 2))
         tb.Label(self.quick_row, text="Quick buttons:", bootstyle=SECONDARY).pack(side=LEFT)
+        self.quick_next = tb.Button(self.quick_row, text="›", width=2, bootstyle=LINK,
+                                    command=lambda: self._page_quick(1))
+        self.quick_next.pack(side=RIGHT)
+        self.quick_page_lbl = tb.Label(self.quick_row, text="", bootstyle=SECONDARY)
+        self.quick_page_lbl.pack(side=RIGHT)
+        self.quick_prev = tb.Button(self.quick_row, text="‹", width=2, bootstyle=LINK,
+                                    command=lambda: self._page_quick(-1))
+        self.quick_prev.pack(side=RIGHT)
+        quick_filter = tb.Entry(self.quick_row, textvariable=self.quick_filter_var, width=18)
+        quick_filter.pack(side=RIGHT, padx=6)
+        quick_filter.bind("<Return>", self._apply_first_quick)
+        tb.Label(self.quick_row, text="Filter:", bootstyle=SECONDARY).pack(side=RIGHT)
+        self.quick_filter_var.trace_add("write", lambda *_: self._on_quick_filter())
 
         self.quick_btns_wrap = tb.Frame(card)
         self.quick_btns_wrap.pack(fill=X, pady=(4, 0))
-        self._render_quick_buttons()
+        self.quick_empty = tb.Label(self.quick_btns_wrap, text="", bootstyle=SECONDARY)
 
         # Controls to manage quick buttons
         manage = tb.Frame(card)
@@ -442,6 +228,13 @@ class App(tb.Window):
             toggles, text="Also change Windows desktop to target on Apply",  # NEW
             variable=self.change_desktop_var, bootstyle="success-round-toggle",
         ).pack(side=LEFT, padx=12)
+        tb.Checkbutton(
+            toggles, text="All accounts on this PC", variable=self.all_accounts_var,
+            bootstyle="info-round-toggle",
+        ).pack(side=LEFT)
+        tb.Checkbutton(
+            toggles, text="Record timings", variable=self.trace_var, bootstyle="secondary-round-toggle",
+        ).pack(side=LEFT, padx=12)
 
     def _build_paths_card(self, parent, col):
         card = tb.Labelframe(parent, text="Paths & Backups", padding=12)
@@ -463,6 +256,9 @@ class App(tb.Window):
         tb.Button(row2, text="Browse", bootstyle=SECONDARY, command=self._browse_backup_dir).pack(side=LEFT, padx=4)
         tb.Button(row2, text="Open", bootstyle=LINK, command=self._open_backup_dir).pack(side=LEFT, padx=4)
 
+        row3 = tb.Frame(card); row3.pack(fill=X, pady=(4, 0))
+        tb.Button(row3, text="Undo last apply", bootstyle=WARNING, command=self.rollback_last).pack(side=LEFT)
+
     def _build_actions(self, parent, col):
         card = tb.Labelframe(parent, text="Actions", padding=12)
         card.grid(row=0, column=col, sticky=EW, pady=(0, 10), padx=(8, 0) if col == 1 else (0, 8))
@@ -471,6 +267,7 @@ class App(tb.Window):
         tb.Button(row, text="VERIFY (F1)", command=self.preflight, bootstyle=SECONDARY).pack(side=LEFT, padx=4)
         tb.Button(row, text="PREVIEW (F2)", command=self.dry_run, bootstyle=INFO).pack(side=LEFT, padx=4)
         tb.Button(row, text="APPLY (Ctrl+Enter)", command=self.apply, bootstyle=SUCCESS).pack(side=LEFT, padx=4)
+        tb.Button(row, text="Cancel (Esc)", command=self.cancel_job, bootstyle=LINK).pack(side=LEFT, padx=4)
 
         tb.Label(card, text="Tip: Manual entries override comboboxes.", bootstyle=SECONDARY)\
             .pack(anchor=W, pady=(8, 0))
@@ -506,46 +303,101 @@ class App(tb.Window):
         self.prog.pack(side=RIGHT)
 
     # Quick Buttons (presets)
-    def _load_presets(self):
-        if PRESETS_PATH.is_file():
-            try:
-                data = json.loads(PRESETS_PATH.read_text(encoding="utf-8"))
-                if isinstance(data, list):
-                    return [p for p in data if {"name","native","target"} <= set(p.keys())]
-            except Exception:
-                pass
-        return [
-            {"name": "1080→1080x1080", "native": "1920x1080", "target": "1080x1080"},
-            {"name": "1440p→1280x1024", "native": "2560x1440", "target": "1280x1024"},
-            {"name": "1440p→1440x1080", "native": "2560x1440", "target": "1440x1080"},
-        ]
-
     def _save_presets(self):
+        # Debounced: a burst of edits (e.g. reordering) becomes one append to the preset log
+        if self._preset_flush_id is not None:
+            self.after_cancel(self._preset_flush_id)
+        self._preset_flush_id = self.after(PRESET_FLUSH_MS, self._flush_presets)
+
+    def _flush_presets(self):
+        self._preset_flush_id = None
         try:
-            write_text(PRESETS_PATH, json.dumps(self.presets, indent=2, ensure_ascii=False))
-        except Exception as e:
+            self._preset_store.flush()
+        except OSError as e:
             messagebox.showerror("Save presets", f"Failed to save presets:\n{e}")
 
+    def _on_close(self):
+        if self._preset_flush_id is not None:
+            self.after_cancel(self._preset_flush_id)
+        self._flush_presets()
+        self.destroy()
+
+    def _presets_changed(self):
+        self._preset_index = None
+        self._render_quick_buttons()
+
+    def _quick_matches(self):
+        if self._preset_index is None:
+            self._preset_index = PresetIndex(self.presets)
+        return self._preset_index.search(self.quick_filter_var.get())
+
+    def _on_quick_filter(self):
+        self._quick_page = 0
+        self._render_quick_buttons()
+
+    def _page_quick(self, delta):
+        self._quick_page = max(0, self._quick_page + delta)
+        self._render_quick_buttons()
+
+    def _apply_first_quick(self, event=None):
+        hits = self._quick_matches()
+        if hits:
+            p = self.presets[hits[0]]
+            self._apply_preset(p["native"], p["target"])
+
     def _render_quick_buttons(self):
-        for w in self.quick_btns_wrap.winfo_children():
-            w.destroy()
-        if not self.presets:
-            tb.Label(self.quick_btns_wrap, text="No quick buttons yet. Click 'Add Quick Button'.",
-                     bootstyle=SECONDARY).pack(anchor=W)
-            return
-        row = tb.Frame(self.quick_btns_wrap); row.pack(fill=X, pady=(2, 2))
-        cur_width = 0
-        max_width = 760
-        for p in self.presets:
-            btn = tb.Button(row, text=p["name"], bootstyle=INFO,
-                            command=lambda n=p["native"], t=p["target"]: self._apply_preset(n, t))
-            btn.update_idletasks()
-            w = btn.winfo_reqwidth() + 8
-            if cur_width + w > max_width:
-                row = tb.Frame(self.quick_btns_wrap); row.pack(fill=X, pady=(2, 2))
-                cur_width = 0
-            btn.pack(side=LEFT, padx=4, pady=2)
+        # One page of the filtered presets; existing row/button widgets are reused and
+        # only reconfigured where the preset in that slot changed.
+        hits = self._quick_matches()
+        pages = max(1, -(-len(hits) // QUICK_PAGE_SIZE))
+        self._quick_page = min(self._quick_page, pages - 1)
+        start = self._quick_page * QUICK_PAGE_SIZE
+        shown = [self.presets[i] for i in hits[start:start + QUICK_PAGE_SIZE]]
+
+        self.quick_page_lbl.configure(text=f"{self._quick_page + 1}/{pages}" if pages > 1 else "")
+        self.quick_prev.configure(state=NORMAL if self._quick_page > 0 else DISABLED)
+        self.quick_next.configure(state=NORMAL if self._quick_page < pages - 1 else DISABLED)
+        if shown:
+            self.quick_empty.pack_forget()
+        else:
+            self.quick_empty.configure(text="No quick buttons match the filter." if self.presets
+                                       else "No quick buttons yet. Click 'Add Quick Button'.")
+            self.quick_empty.pack(anchor=W)
+
+        # Wrap by font metrics: no per-button layout pass
+        font = tkfont.nametofont("TkDefaultFont")
+        rows, cur, cur_width = [], [], 0
+        for p in shown:
+            w = font.measure(p["name"]) + 30
+            if cur and cur_width + w > QUICK_ROW_WIDTH:
+                rows.append(cur)
+                cur, cur_width = [], 0
+            cur.append(p)
             cur_width += w
+        if cur:
+            rows.append(cur)
+
+        for r, row_presets in enumerate(rows):
+            if r == len(self._quick_rows):
+                self._quick_rows.append((tb.Frame(self.quick_btns_wrap), []))
+            frame, slots = self._quick_rows[r]
+            if not frame.winfo_manager():
+                frame.pack(fill=X, pady=(2, 2))
+            for c, p in enumerate(row_presets):
+                if c == len(slots):
+                    slots.append([tb.Button(frame, bootstyle=INFO), None])
+                slot = slots[c]
+                key = (p["name"], p["native"], p["target"])
+                if slot[1] != key:
+                    slot[0].configure(text=p["name"],
+                                      command=lambda n=p["native"], t=p["target"]: self._apply_preset(n, t))
+                    slot[1] = key
+                if not slot[0].winfo_manager():
+                    slot[0].pack(side=LEFT, padx=4, pady=2)
+            for btn, _ in slots[len(row_presets):]:
+                btn.pack_forget()
+        for frame, _ in self._quick_rows[len(rows):]:
+            frame.pack_forget()
 
     def _apply_preset(self, native_wh: str, target_wh: str):
         self.native_entry.delete(0, tk.END)
@@ -591,8 +443,8 @@ class App(tb.Window):
                 parse_whx(native); parse_whx(target)
             except ValueError as e:
                 messagebox.showerror("Add Quick Button", str(e)); return
-            self.presets.append({"name": name, "native": native, "target": target})
-            self._save_presets(); self._render_quick_buttons(); top.destroy()
+            self._preset_store.add({"name": name, "native": native, "target": target})
+            self._save_presets(); self._presets_changed(); top.destroy()
 
         tb.Button(btns, text="Cancel", bootstyle=SECONDARY, command=top.destroy).pack(side=RIGHT, padx=6)
         tb.Button(btns, text="Add", bootstyle=SUCCESS, command=add_and_close).pack(side=RIGHT)
@@ -609,8 +461,7 @@ class App(tb.Window):
         tb.Label(frm, text="Your quick buttons").grid(row=0, column=0, sticky=W)
 
         lb = tk.Listbox(frm, selectmode=tk.SINGLE); lb.grid(row=1, column=0, sticky=NSEW, pady=(6,6))
-        for p in self.presets:
-            lb.insert(tk.END, f"{p['name']}   [{p['native']} → {p['target']}]")
+        lb.insert(tk.END, *[preset_label(p) for p in self.presets])
 
         btns = tb.Frame(frm); btns.grid(row=2, column=0, sticky=E)
 
@@ -618,8 +469,8 @@ class App(tb.Window):
             i = lb.curselection()
             if not i: return
             idx = i[0]
-            del self.presets[idx]
-            self._save_presets(); self._render_quick_buttons()
+            self._preset_store.remove(idx)
+            self._save_presets(); self._presets_changed()
             lb.delete(idx)
 
         def move(up=True):
@@ -627,12 +478,11 @@ class App(tb.Window):
             if not i: return
             idx = i[0]; new = idx-1 if up else idx+1
             if new < 0 or new >= len(self.presets): return
-            self.presets[idx], self.presets[new] = self.presets[new], self.presets[idx]
-            self._save_presets(); self._render_quick_buttons()
-            lb.delete(0, tk.END)
-            for p in self.presets:
-                lb.insert(tk.END, f"{p['name']}   [{p['native']} → {p['target']}]")
-            lb.selection_set(new)
+            self._preset_store.move(idx, new)
+            self._save_presets(); self._presets_changed()
+            for j in (idx, new):  # only the two swapped rows
+                lb.delete(j); lb.insert(j, preset_label(self.presets[j]))
+            lb.selection_set(new); lb.see(new)
 
         tb.Button(btns, text="Up", bootstyle=SECONDARY, command=lambda: move(True)).pack(side=LEFT, padx=4)
         tb.Button(btns, text="Down", bootstyle=SECONDARY, command=lambda: move(False)).pack(side=LEFT, padx=4)
@@ -642,8 +492,10 @@ class App(tb.Window):
         top.grab_set(); top.transient(self)
 
     # Generic utilities
+    # Workers never touch Tk: _log/_clear_log/_set_status only enqueue UI events,
+    # and _drain_ui (main loop, every LOG_FLUSH_MS) applies them in batches.
     def _log(self, msg: str, tag: str | None = None):
-        """Log a message with optional color tagging.
+        """Log a message with optional color tagging. Safe to call from any thread.
         
         Tags: success (green), error (red), warning (yellow), info (blue), muted (gray), highlight (pink/bold)
         Auto-detects tag if not specified based on message content.
@@ -663,16 +515,49 @@ class App(tb.Window):
             elif any(x in msg for x in ["->", "Detected", "Base config:", "User folder:", "Planned"]):
                 tag = "info"
         
-        if tag:
-            self.output.insert(tk.END, msg, tag)
-        else:
-            self.output.insert(tk.END, msg)
-        
-        self.output.see(tk.END)
-        self.update_idletasks()
+        self._ui_q.put(("log", msg, tag))
 
     def _clear_log(self):
-        self.output.delete("1.0", tk.END)
+        self._ui_q.put(("clear",))
+
+    def _drain_ui(self):
+        try:
+            runs = []  # [(tag, [msg, ...])] - consecutive same-tag lines go in one insert
+            for _ in range(LOG_BATCH_MAX):
+                try:
+                    ev = self._ui_q.get_nowait()
+                except queue.Empty:
+                    break
+                kind = ev[0]
+                if kind == "log":
+                    _, msg, tag = ev
+                    if runs and runs[-1][0] == tag:
+                        runs[-1][1].append(msg)
+                    else:
+                        runs.append((tag, [msg]))
+                    continue
+                self._flush_log_runs(runs); runs = []
+                if kind == "clear":
+                    self.output.delete("1.0", tk.END)
+                elif kind == "status":
+                    self._apply_status(*ev[1:])
+            self._flush_log_runs(runs)
+        finally:
+            self.after(LOG_FLUSH_MS, self._drain_ui)
+
+    def _flush_log_runs(self, runs):
+        if not runs:
+            return
+        for tag, msgs in runs:
+            if tag:
+                self.output.insert(tk.END, "".join(msgs), tag)
+            else:
+                self.output.insert(tk.END, "".join(msgs))
+        # Ring buffer: keep only the newest LOG_MAX_LINES lines on screen
+        lines = int(self.output.index("end-1c").split(".")[0])
+        if lines > LOG_MAX_LINES:
+            self.output.delete("1.0", f"{lines - LOG_MAX_LINES + 1}.0")
+        self.output.see(tk.END)
 
     def _copy_log(self):
         txt = self.output.get("1.0", tk.END)
@@ -688,12 +573,14 @@ class App(tb.Window):
             write_text(Path(p), self.output.get("1.0", tk.END))
 
     def _set_status(self, text: str, style=SECONDARY, busy=False):
+        self._ui_q.put(("status", text, style, busy))
+
+    def _apply_status(self, text: str, style=SECONDARY, busy=False):
         self.status.configure(text=text, bootstyle=style)
         try:
             self.prog.start(12) if busy else self.prog.stop()
         except Exception:
             pass
-        self.update_idletasks()
 
     def _parse_inputs(self):
         native = (self.native_entry.get().strip() or self.native_var.get().strip())
@@ -706,46 +593,113 @@ class App(tb.Window):
             messagebox.showerror("Input Error", str(e))
             return None
 
-    def _get_targets_and_check(self, nx, ny, force=False):
-        base = Path(self.cfg_base_var.get().strip() or get_base_config_dir())
-        winclient = base / "WindowsClient"
-        gus_root = winclient / "GameUserSettings.ini"
-        if not gus_root.is_file():
-            raise RuntimeError(
-                "Missing GameUserSettings.ini in WindowsClient.\nLaunch VALORANT once (native Fullscreen+Fill), then close."
-            )
-        root_lines = read_lines(gus_root)
-        ok, bad_key, bad_val = native_check_ok(root_lines, nx, ny)
-        if not ok and not force:
-            self._log(f"[!] Native check failed on {gus_root}", tag="error")
-            self._log(f"    Expected {bad_key} to match native {nx}x{ny} / flags False. Got '{bad_val}'.", tag="error")
-            self._log("    -> Open VALORANT on Fullscreen+Fill at native, then close and rerun.", tag="warning")
+    def _plan_for(self, opts):
+        """Reuse the last verify/preview plan if the inputs match and nothing changed on disk."""
+        base = Path(opts["base"] or get_base_config_dir())
+        key = (base, opts["nx"], opts["ny"], opts["tx"], opts["ty"], opts["force"], opts["all_accounts"])
+        plan = self._plan
+        if plan is not None and plan.matches(*key) and plan.is_fresh():
+            self._log("Using the plan from the last verify/preview (no config files changed).", tag="muted")
+            return plan
+        plan = self._plan = build_plan(*key[:6], self._log, self._state, all_accounts=key[6])
+        self._save_state()
+        if plan is None:
             self._set_status("Native check failed", DANGER)
-            return None
-        elif not ok and force:
-            self._log(f"[!] Native check failed but continuing (--force). Key {bad_key} got '{bad_val}'", tag="warning")
-
-        last_user = get_last_known_user(winclient)
-        user_dir = find_user_folder(base, last_user) if last_user else None
+        return plan
 
-        self._log(f"Base config: {base}", tag="info")
-        self._log(f"LastKnownUser: {last_user or '??'}", tag="info")
-        self._log(f"User folder: {user_dir if user_dir else 'NOT FOUND (will still update root)'}", 
-                tag="info" if user_dir else "warning")
-
-        targets = [(gus_root, "Root WindowsClient/GameUserSettings.ini")]
-        if user_dir:
-            targets += [
-                (user_dir / "WindowsClient" / "GameUserSettings.ini", f"{user_dir.name}/WindowsClient/GameUserSettings.ini"),
-                (user_dir / "Windows" / "GameUserSettings.ini", f"{user_dir.name}/Windows/GameUserSettings.ini"),
-            ]
-        return targets
+    def _save_state(self):
+        try:
+            self._state.save()
+        except OSError as e:
+            self._log(f"[!] Could not save state cache: {e}", tag="warning")
 
-    def _run_async(self, fn):
-        t = threading.Thread(target=fn, daemon=True); t.start()
+    def _load_display_modes(self):
+        if os.name != "nt":
+            return
+        from ValorantTrueStretch_Display import mode_index
+        try:
+            self._modes = mode_index()
+        except Exception as e:
+            self._log(f"[!] Could not list display modes: {e}", tag="warning")
+            return
+        if self._modes:
+            self._refresh_target_choices()
+
+    def _refresh_target_choices(self):
+        # Target list = this monitor's modes (or the built-in list), narrowed by the manual entry
+        text = self.target_entry.get()
+        if self._modes:
+            values = self._modes.filter(text)
+        else:
+            q = "".join(text.split()).lower()
+            values = [r for r in RESOLUTIONS["target"] if q in r]
+        self.target_combo.configure(values=values)
+
+    def _snapshot_inputs(self):
+        """Read every input on the Tk thread; jobs only get this plain dict."""
+        parsed = self._parse_inputs()
+        if not parsed:
+            self._set_status("Invalid input", DANGER, busy=False)
+            return None
+        nx, ny, tx, ty = parsed
+        mode_ok = self._modes.supports(tx, ty) if self._modes else None
+        if mode_ok is False and self.change_desktop_var.get():
+            # Checked before any config is touched: the desktop switch could never succeed
+            messagebox.showerror(
+                "Input Error",
+                f"{tx}x{ty} is not a display mode of this monitor, so Windows can't switch to it.\n\n"
+                "Pick a target from the list or turn off 'Also change Windows desktop'.",
+            )
+            self._set_status("Invalid input", DANGER, busy=False)
+            return None
+        return {
+            "nx": nx, "ny": ny, "tx": tx, "ty": ty,
+            "base": self.cfg_base_var.get().strip(),
+            "force": self.force_var.get(),
+            "all_accounts": self.all_accounts_var.get(),
+            "backup_root": self._backup_root_if_enabled(),
+            "change_desktop": self.change_desktop_var.get(),
+            "target_mode_ok": mode_ok,  # None = unknown (no mode list)
+        }
+
+    def _run_job(self, name, fn, cancellable=False):
+        if self._jobs.busy():
+            self._set_status(f"{name.capitalize()} queued...", INFO, busy=True)
+        tracer = Tracer() if self.trace_var.get() else None
+        if tracer is None:
+            self._jobs.submit(name, fn, cancellable=cancellable)
+            return
+        def traced_fn(job):
+            try:
+                with tracing(tracer):
+                    fn(job)
+            finally:
+                self._report_timings(name, tracer)
+        self._jobs.submit(name, traced_fn, cancellable=cancellable)
+
+    def _report_timings(self, name, tracer):
+        tracer.log_summary(self._log, f"{name.capitalize()} timings")
+        try:
+            self._log(f"Trace saved: {tracer.write(trace_path(new_run_id()))}", tag="muted")
+        except OSError as e:
+            self._log(f"[!] Could not save trace: {e}", tag="warning")
+
+    def _on_job_change(self, job):
+        # Called on the job thread; only the running/finished job reports here
+        if job.state == CANCELLED:
+            self._log(f"\n{job.name.capitalize()} cancelled.", tag="warning")
+            self._set_status(f"{job.name.capitalize()} cancelled", WARNING, busy=False)
+        elif job.state == FAILED:
+            self._log(f"Error: {job.error}", tag="error")
+            self._set_status("Error occurred", DANGER, busy=False)
+
+    def cancel_job(self, *_):
+        if not self._jobs.cancel_current():
+            self._set_status("Nothing to cancel (applies cannot be interrupted)", SECONDARY)
 
     #native detect + desktop change
     def _detect_native(self):
+        from ValorantTrueStretch_Display import detect_primary_resolution
         res = detect_primary_resolution()
         if not res:
             messagebox.showerror("Detect native", "Could not detect screen resolution.")
@@ -758,55 +712,48 @@ class App(tb.Window):
 
     # Actions
     def preflight(self, *_):
-        def _run():
+        opts = self._snapshot_inputs()
+        if not opts: return
+        def _run(job):
             self._clear_log()
             self._set_status("Verifying configuration...", INFO, busy=True)
-            parsed = self._parse_inputs()
-            if not parsed:
-                self._set_status("Invalid input", DANGER, busy=False); return
-            nx, ny, tx, ty = parsed
             try:
-                targets = self._get_targets_and_check(nx, ny, force=self.force_var.get())
-                if targets is None:
+                plan = self._plan_for(opts)
+                if plan is None:
                     self._set_status("Native check failed", DANGER, busy=False); return
+                job.check()
                 self._log("\nPlanned updates:", tag="info")
-                for p, lbl in targets: 
+                for p, lbl in plan.targets: 
                     self._log(f" - {lbl} -> {p}", tag="muted")
                 self._log("\nVerification complete.", tag="success")
                 self._set_status("Verification complete", SUCCESS, busy=False)
+            except JobCancelled:
+                raise
             except Exception as e:
                 self._log(f"Error: {e}", tag="error")
                 self._set_status("Error occurred", DANGER, busy=False)
-        self._run_async(_run)
-
+        self._run_job("verify", _run, cancellable=True)
 
     def dry_run(self, *_):
-        def _run():
+        opts = self._snapshot_inputs()
+        if not opts: return
+        def _run(job):
             self._clear_log()
             self._set_status("Running preview...", INFO, busy=True)
-            parsed = self._parse_inputs()
-            if not parsed:
-                self._set_status("Invalid input", DANGER, busy=False); return
-            nx, ny, tx, ty = parsed
             try:
-                targets = self._get_targets_and_check(nx, ny, force=self.force_var.get())
-                if targets is None:
+                plan = self._plan_for(opts)
+                if plan is None:
                     self._set_status("Native check failed", DANGER, busy=False); return
-                self._log("\nPlanned updates:", tag="info")
-                for p, lbl in targets: 
-                    self._log(f" - {lbl} -> {p}", tag="muted")
-                for p, lbl in targets:
-                    if p.exists():
-                        process_gus(p, tx, ty, apply_changes=False, label=lbl, log_func=self._log,
-                                    backup_dir=self._backup_root_if_enabled())
-                    else:
-                        self._log(f"- Not found: {lbl} -> {p} (skipped)", tag="warning")
+                report_plan(plan, self._log, should_stop=job.cancelled)
+                job.check()
                 self._log("\nDry run complete.", tag="success")
                 self._set_status("Preview complete", SUCCESS, busy=False)
+            except JobCancelled:
+                raise
             except Exception as e:
                 self._log(f"Error: {e}", tag="error")
                 self._set_status("Error occurred", DANGER, busy=False)
-        self._run_async(_run)
+        self._run_job("preview", _run, cancellable=True)
 
     def apply(self, *_):
         result = messagebox.askquestion(
@@ -816,42 +763,72 @@ class App(tb.Window):
             icon="warning",
         )
         if result != "yes": return
-        def _run():
+        opts = self._snapshot_inputs()
+        if not opts: return
+        def _run(job):
+            tx, ty = opts["tx"], opts["ty"]
             self._clear_log()
             self._set_status("Applying configuration...", INFO, busy=True)
-            parsed = self._parse_inputs()
-            if not parsed:
-                self._set_status("Invalid input", DANGER, busy=False); return
-            nx, ny, tx, ty = parsed
             try:
-                targets = self._get_targets_and_check(nx, ny, force=self.force_var.get())
-                if targets is None:
+                plan = self._plan_for(opts)
+                if plan is None:
                     self._set_status("Native check failed", DANGER, busy=False); return
-                self._log("\nPlanned updates:", tag="info")
-                for p, lbl in targets: 
-                    self._log(f" - {lbl} -> {p}", tag="muted")
-                for p, lbl in targets:
-                    if p.exists():
-                        process_gus(p, tx, ty, apply_changes=True, label=lbl, log_func=self._log,
-                                    backup_dir=self._backup_root_if_enabled())
-                    else:
-                        self._log(f"- Not found: {lbl} -> {p} (skipped)", tag="warning")
+                backup_root = opts["backup_root"]
+                run_id = new_run_id()
+                plan, _ = apply_plan(plan, self._log, backup_root, run_id, self._state)
+                self._save_state()
+                self._plan = None
+                if plan is None:
+                    self._set_status("Native check failed", DANGER, busy=False); return
+                if backup_root:
+                    prune_backups(backup_root, keep_run=run_id)
 
                 # NEW: optionally change Windows desktop resolution
-                if self.change_desktop_var.get():
+                if opts["change_desktop"]:
                     self._log(f"\nChanging Windows desktop to {tx}x{ty} ...", tag="info")
+                    from ValorantTrueStretch_Display import change_desktop_resolution
                     ok, msg = change_desktop_resolution(tx, ty)
                     self._log(("✔ " if ok else "✖ ") + msg, tag="success" if ok else "error")
 
                 self._log("\nDone.", tag="highlight")
                 self._log("Next steps:", tag="info")
                 self._log(f"  1) Ensure your Windows desktop resolution is {tx}x{ty} (toggled above can do this).")
+                if opts["target_mode_ok"] is False:
+                    self._log(f"     {tx}x{ty} is not a display mode of this monitor yet: add it as a custom "
+                              "resolution in your GPU control panel.", tag="warning")
                 self._log("  2) Launch VALORANT.")
                 self._set_status("Configuration applied successfully", SUCCESS, busy=False)
             except Exception as e:
                 self._log(f"Error: {e}", tag="error")
                 self._set_status("Error occurred", DANGER, busy=False)
-        self._run_async(_run)
+        self._run_job("apply", _run)
+
+    def rollback_last(self, *_):
+        root = Path(self.backup_dir_var.get().strip())
+        result = messagebox.askquestion(
+            "Undo last apply",
+            "This restores every file changed by the last apply from the backup store.\n\n"
+            "Make sure VALORANT is completely closed.\n\nProceed?",
+            icon="warning",
+        )
+        if result != "yes": return
+        def _run(job):
+            self._clear_log()
+            self._set_status("Rolling back...", INFO, busy=True)
+            try:
+                from ValorantTrueStretch_Backup import BackupStore
+                run_id, restored = BackupStore(root).rollback()
+                if run_id is None:
+                    self._log("No apply runs found in the backup store.", tag="warning")
+                    self._set_status("Nothing to undo", WARNING, busy=False); return
+                for e in restored:
+                    self._log(f"-> Restored {e['src']}", tag="success")
+                self._log(f"\nRolled back run {run_id}: {len(restored)} file(s) restored.", tag="highlight")
+                self._set_status("Rollback complete", SUCCESS, busy=False)
+            except Exception as e:
+                self._log(f"Error: {e}", tag="error")
+                self._set_status("Error occurred", DANGER, busy=False)
+        self._run_job("rollback", _run)
 
     def _backup_root_if_enabled(self) -> Path | None:
         if not self.backup_var.get(): return None
@@ -863,6 +840,7 @@ class App(tb.Window):
     def _detect_base_config_dir(self):
         try:
             base = get_base_config_dir()
+            invalidate_discovery(base)
             self.cfg_base_var.set(str(base))
             self._log(f"Config base detected: {base}", tag="info")
         except Exception as e:
@@ -0,0 +1,404 @@
+# ValorantTrueStretch_Ini.py
+# Indexed GameUserSettings.ini document: parsed once, edited by key, re-serialized by span.
+# Made by GlitchFL (credit required if you share)
+#
+# A document holds either str lines or raw bytes lines (IniDocument.from_bytes, for UTF-8
+# files): in bytes mode only key=value lines are decoded, every other byte is passed
+# through untouched, and new lines reuse the line ending of the line they replace.
+
+import re
+from bisect import bisect_right
+
+FULLSCREEN_KEY = "FullscreenMode"
+HDR_KEY = "HDRDisplayOutputNits"
+
+_KV_RE = re.compile(r"^\s*([A-Za-z0-9_]+)\s*=\s*(.*)\s*$")
+_SECTION_RE = re.compile(r"^\s*\[([^\]]*)\]\s*$")
+_KV_RE_B = re.compile(rb"^\s*([A-Za-z0-9_]+)\s*=\s*(.*)\s*$")
+_SECTION_RE_B = re.compile(rb"^\s*\[([^\]]*)\]\s*$")
+
+def _dec(b):
+    return b.decode("utf-8", "surrogateescape")
+
+def _split_kv(ln):
+    if isinstance(ln, bytes):
+        m = _KV_RE_B.match(ln)
+        return (m.group(1).decode("ascii"), _dec(m.group(2).strip())) if m else (None, None)
+    m = _KV_RE.match(ln)
+    return (m.group(1), m.group(2).strip()) if m else (None, None)
+
+def _ending(ln):
+    """The line break `ln` ends with ("" if none), same type as `ln`."""
+    stripped = ln.rstrip(b"\r\n" if isinstance(ln, bytes) else "\r\n")
+    return ln[len(stripped):]
+
+def _body(ln):
+    """`ln` without its line break (diffs are shown with normalized line breaks)."""
+    return ln[:len(ln) - len(_ending(ln))]
+
+def detect_newline(data):
+    """Line break new lines should use: CRLF if the file has any, else LF."""
+    return "\r\n" if (b"\r\n" if isinstance(data, bytes) else "\r\n") in data else "\n"
+
+class IniDocument:
+    """Line-preserving view of an INI file.
+
+    The file is scanned once into a key -> line indices map (plus section starts).
+    Edits are recorded against original line indices, so reads and updates cost
+    O(keys touched) and `lines()` only splices the edited positions back in.
+    """
+
+    def __init__(self, lines, newline="\n", binary=False):
+        self.src = lines if isinstance(lines, list) else list(lines)
+        self.binary = binary
+        self.newline = newline # line break for appended lines (and lines that had none)
+        self.index = {}        # key -> [line idx, ...] in file order
+        self.values = {}       # line idx -> stripped value
+        self.sections = []     # [(line idx, section name)]
+        kv_re, section_re = (_KV_RE_B, _SECTION_RE_B) if binary else (_KV_RE, _SECTION_RE)
+        for i, ln in enumerate(self.src):
+            m = kv_re.match(ln)
+            if m:
+                key, val = m.group(1), m.group(2).strip()
+                if binary:
+                    key, val = key.decode("ascii"), _dec(val)
+                self.index.setdefault(key, []).append(i)
+                self.values[i] = val
+                continue
+            m = section_re.match(ln)
+            if m:
+                self.sections.append((i, _dec(m.group(1)) if binary else m.group(1)))
+        self._section_starts = [i for i, _ in self.sections]
+        self.replaced = {}     # line idx -> new line text
+        self.dropped = set()   # line idx
+        self.inserted = {}     # line idx -> [lines inserted right after it]
+        self.appended = []     # [[key, line]] added at end of file
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Document over the raw lines of UTF-8 (or ASCII) `data`; nothing is decoded up front."""
+        data = bytes(data)
+        return cls(data.splitlines(keepends=True), detect_newline(data), binary=True)
+
+    def _line(self, key, value, like=None):
+        """`key=value` plus the line break of src[like] (or the document's), in the document's type."""
+        end = _ending(self.src[like]) if like is not None else ""
+        if self.binary:
+            return f"{key}={value}".encode("utf-8", "surrogateescape") + (end or self.newline.encode("ascii"))
+        return f"{key}={value}" + (end or self.newline)
+
+    # ----- Queries
+    def section_of(self, idx):
+        pos = bisect_right(self._section_starts, idx) - 1
+        return self.sections[pos][1] if pos >= 0 else None
+
+    def get(self, key, section=None):
+        """Current value of `key` (last occurrence wins, like the game does)."""
+        if self.appended and (section is None or section == self.section_of(len(self.src))):
+            for k, ln in reversed(self.appended):
+                if k == key:
+                    return _split_kv(ln)[1]
+        cands = [i for i in self.index.get(key, ()) if i not in self.dropped]
+        cands += [i for i, extra in self.inserted.items() if any(_split_kv(ln)[0] == key for ln in extra)]
+        if section is not None:
+            cands = [i for i in cands if self.section_of(i) == section]
+        if not cands:
+            return None
+        i = max(cands)
+        for ln in reversed(self.inserted.get(i, ())):
+            k, v = _split_kv(ln)
+            if k == key:
+                return v
+        if i in self.replaced:
+            return _split_kv(self.replaced[i])[1]
+        return self.values[i]
+
+    def check(self, want: dict):
+        """(ok, bad_key, bad_val) for the first key in `want` whose value differs."""
+        for k, v in want.items():
+            got = self.get(k)
+            if got != v:
+                return False, k, got
+        return True, None, None
+
+    @property
+    def changed(self):
+        return bool(self.replaced or self.dropped or self.inserted or self.appended)
+
+    # ----- Edits
+    def set(self, key, value):
+        """Rewrite every `key=` line as `key=value`, appending it if absent."""
+        idxs = self.index.get(key)
+        if idxs:
+            for i in idxs:
+                new_ln = self._line(key, value, like=i)
+                if self.src[i] != new_ln:
+                    self.replaced[i] = new_ln
+                else:
+                    self.replaced.pop(i, None)
+            return
+        new_ln = self._line(key, value)
+        for entry in self.appended:
+            if entry[0] == key:
+                entry[1] = new_ln
+                return
+        self.appended.append([key, new_ln])
+
+    def update(self, updates: dict):
+        for k, v in updates.items():
+            if v is not None:
+                self.set(k, str(v))
+        return self.changed
+
+    def ensure_hdr_and_fullscreen(self, hdr_val="1000", fs_val="2"):
+        """Pin HDR output nits and put FullscreenMode right after every HDR line."""
+        self.pin_after(HDR_KEY, hdr_val, FULLSCREEN_KEY, fs_val)
+
+    def pin_after(self, key, value, follow, follow_value, numeric=True):
+        """Set every `key` line to `value` with exactly one `follow=follow_value` line right after it.
+
+        Other `follow` lines are dropped; with no `key` line both are appended. With `numeric`
+        only lines whose current value is all digits count (as the game writes them).
+        """
+        valid = str.isdigit if numeric else (lambda v: True)
+        key_idx = [i for i in self.index.get(key, ()) if valid(self.values[i])]
+        follow_idx = {i for i in self.index.get(follow, ()) if valid(self.values[i])}
+        keep = set()
+        for i in key_idx:
+            key_ln = self._line(key, value, like=i)
+            if self.src[i] != key_ln:
+                self.replaced[i] = key_ln
+            nxt = i + 1
+            if nxt in follow_idx and self.src[nxt] == self._line(follow, follow_value, like=nxt) and nxt not in keep:
+                keep.add(nxt)
+            else:
+                self.inserted.setdefault(i, []).append(self._line(follow, follow_value, like=i))
+        for i in follow_idx:
+            if i not in keep:
+                self.replaced.pop(i, None)
+                self.dropped.add(i)
+        self.appended = [e for e in self.appended if e[0] != follow]
+        if not key_idx:
+            self.appended = [e for e in self.appended if e[0] != key]
+            self.appended += [
+                [key, self._line(key, value)],
+                [follow, self._line(follow, follow_value)],
+            ]
+
+    # ----- Output
+    def edit_positions(self):
+        return sorted(set(self.replaced) | self.dropped | set(self.inserted))
+
+    def lines(self):
+        """New line list; untouched spans are copied as slices."""
+        src = self.src
+        out = []
+        start = 0
+        for i in self.edit_positions():
+            out.extend(src[start:i])
+            if i not in self.dropped:
+                out.append(self.replaced.get(i, src[i]))
+            out.extend(self.inserted.get(i, ()))
+            start = i + 1
+        out.extend(src[start:])
+        out.extend(self.tail())
+        return out
+
+    def text(self):
+        """The new content as str (or bytes for a binary document)."""
+        return (b"" if self.binary else "").join(self.lines())
+
+    def tail(self):
+        """Lines `lines()` adds after the last original line."""
+        if not self.appended:
+            return []
+        nl = self.newline.encode("ascii") if self.binary else self.newline
+        guard = [] if self._ends_with_newline() else [nl]
+        return guard + [ln for _, ln in self.appended]
+
+    def _ends_with_newline(self):
+        n = len(self.src) - 1
+        while n >= 0:
+            extra = self.inserted.get(n)
+            if extra:
+                return bool(_ending(extra[-1]))
+            if n not in self.dropped:
+                return bool(_ending(self.replaced.get(n, self.src[n])))
+            n -= 1
+        return True
+
+    def ambiguous(self):
+        """True if difflib could align this edit differently from the edit list.
+
+        That happens when an added line already exists (line break aside) in the file, when
+        an edit sits next to a blank line or a copy of one of its lines (difflib may slide
+        it onto the copy), or when a long file has an untouched span of only very common
+        lines (difflib's autojunk). file_diff() lets difflib align those, so every diff
+        is the one difflib would print.
+        """
+        added = list(self.replaced.values())
+        for extra in self.inserted.values():
+            added.extend(extra)
+        added.extend(ln for _, ln in self.appended)
+        for ln in added:
+            k, _ = _split_kv(ln)
+            if any(_body(self.src[i]) == _body(ln) for i in self.index.get(k, ())):
+                return True
+        # Each run of adjacent edits: difflib may slide it if a line next to it (or an untouched
+        # line inside it) is blank or equals a removed/added line, or if it removes and adds one line
+        n = len(self.src)
+        edits = self.edit_positions() + ([n] if self.appended else [])
+        runs, run = [], []
+        for p in edits:
+            if run and p != run[-1] + 1:
+                runs.append(run)
+                run = []
+            run.append(p)
+        if run:
+            runs.append(run)
+        for run in runs:
+            old, new, ctx = set(), set(), [run[0] - 1, run[-1] + 1]
+            for p in run:
+                if p == n:
+                    new.update(_body(ln) for ln in self.tail())
+                    continue
+                if p in self.dropped or p in self.replaced:
+                    old.add(_body(self.src[p]))
+                else:
+                    ctx.append(p)
+                if p in self.replaced:
+                    new.add(_body(self.replaced[p]))
+                new.update(_body(ln) for ln in self.inserted.get(p, ()))
+            near = {_body(self.src[i]) for i in ctx if 0 <= i < n}
+            if not all(near) or near & (old | new) or old & new:
+                return True
+        # difflib's autojunk: in a 200+ line file, lines seen more than 1% of the time can't anchor
+        # a match, so every untouched span needs one rarer key line or difflib folds it into the change
+        nb = n - len(self.dropped) + sum(map(len, self.inserted.values())) + len(self.tail())
+        if nb >= 200:
+            limit = nb // 100 + 1
+            for tag, i1, i2, _, _ in self.opcodes():
+                if tag == "equal" and not any(self._new_count(i) <= limit for i in range(i1, i2)):
+                    return True
+        return False
+
+    def _new_count(self, idx):
+        """How many lines of lines() read like untouched src[idx] (key=value and section lines;
+        any other line counts as common)."""
+        body = _body(self.src[idx])
+        same = lambda ln: _body(ln) == body
+        key, _ = _split_kv(self.src[idx])
+        if key is None:
+            pos = bisect_right(self._section_starts, idx) - 1
+            if pos < 0 or self._section_starts[pos] != idx:
+                return len(self.src) + 1
+            return sum(same(self.src[i]) for i in self._section_starts)
+        count = sum(same(self.replaced.get(i, self.src[i])) for i in self.index[key] if i not in self.dropped)
+        for extra in self.inserted.values():
+            count += sum(map(same, extra))
+        return count + sum(same(ln) for _, ln in self.appended)
+
+    def opcodes(self):
+        """difflib-style (tag, i1, i2, j1, j2) opcodes built from the edit list."""
+        codes = []
+        i = j = 0
+        blk = None  # [i1, i2, j1, j2] of the pending change block
+
+        def equal(upto):
+            nonlocal i, j
+            if upto <= i:
+                return
+            flush()
+            if codes and codes[-1][0] == "equal":
+                _, i1, _, j1, _ = codes.pop()
+            else:
+                i1, j1 = i, j
+            j += upto - i
+            i = upto
+            codes.append(("equal", i1, i, j1, j))
+
+        def change(dels, ins):
+            nonlocal i, j, blk
+            if blk is None:
+                blk = [i, i, j, j]
+            i += dels; j += ins
+            blk[1] = i; blk[3] = j
+
+        def flush():
+            nonlocal blk
+            if blk is None:
+                return
+            i1, i2, j1, j2 = blk
+            tag = "replace" if i2 > i1 and j2 > j1 else ("delete" if i2 > i1 else "insert")
+            codes.append((tag, i1, i2, j1, j2))
+            blk = None
+
+        for p in self.edit_positions():
+            equal(p)
+            if p in self.dropped:
+                change(1, 0)
+            elif p in self.replaced:
+                change(1, 1)
+            else:
+                equal(p + 1)
+            change(0, len(self.inserted.get(p, ())))
+            if blk is not None and blk[0] == blk[1] and blk[2] == blk[3]:
+                blk = None
+        equal(len(self.src))
+        tail = self.tail()
+        if tail:
+            change(0, len(tail))
+        flush()
+        return codes
+
+def _format_range(start, stop):
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+def unified_diff(a, b, codes, fromfile="", tofile="", n=3):
+    """difflib.unified_diff(a, b, ...) output from precomputed opcodes (no matching pass).
+
+    Identical to difflib's as long as difflib would find the same opcodes; see
+    IniDocument.ambiguous() for when it might not.
+    """
+    if not codes:
+        codes = [("equal", 0, 1, 0, 1)]
+    codes = list(codes)
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    groups, group = [], []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+
+    out = []
+    for group in groups:
+        if not out:
+            out.append(f"--- {fromfile}\n")
+            out.append(f"+++ {tofile}\n")
+        first, last = group[0], group[-1]
+        out.append(f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + ln for ln in a[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                out.extend("-" + ln for ln in a[i1:i2])
+            if tag in ("replace", "insert"):
+                out.extend("+" + ln for ln in b[j1:j2])
+    return "".join(out)
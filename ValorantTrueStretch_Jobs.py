@@ -0,0 +1,110 @@
+# ValorantTrueStretch_Jobs.py
+# Single-lane job runner for the GUI actions (VERIFY / PREVIEW / APPLY / undo).
+# Made by GlitchFL (credit required if you share)
+#
+# - One worker thread runs jobs strictly one at a time (applies never overlap anything).
+# - Submitting a job whose name is already pending replaces the pending one (coalescing),
+#   so mashing F2 queues a single preview with the latest inputs.
+# - A new submission cancels the running job if that job is cancellable (previews/verifies);
+#   the job sees it through job.cancelled() / job.check() between steps.
+
+import threading
+from collections import deque
+
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    def __init__(self, name, fn, cancellable):
+        self.name = name
+        self.fn = fn
+        self.cancellable = cancellable
+        self.state = QUEUED
+        self.error = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.name)
+
+    def __repr__(self):
+        return f"<Job {self.name} {self.state}>"
+
+class JobRunner:
+    def __init__(self, on_change=None):
+        """`on_change(job)` is called (from the worker thread) whenever a job changes state."""
+        self.on_change = on_change
+        self._pending = deque()
+        self._current = None
+        self._cv = threading.Condition()
+        self._worker = threading.Thread(target=self._loop, name="jobs", daemon=True)
+        self._worker.start()
+
+    @property
+    def current(self):
+        return self._current
+
+    def submit(self, name, fn, cancellable=False):
+        """Queue `fn(job)` under `name`; returns the (possibly coalesced) Job."""
+        with self._cv:
+            cur = self._current
+            if cur is not None and cur.cancellable and not cur.cancelled():
+                cur.cancel()
+            for job in self._pending:
+                if job.name == name:
+                    job.fn = fn
+                    job.cancellable = cancellable
+                    return job
+            job = Job(name, fn, cancellable)
+            self._pending.append(job)
+            self._cv.notify()
+        return job
+
+    def cancel_current(self):
+        """Cancel the running job if it allows it; returns True if a cancel was requested."""
+        with self._cv:
+            cur = self._current
+            if cur is not None and cur.cancellable:
+                cur.cancel()
+                return True
+        return False
+
+    def busy(self):
+        with self._cv:
+            return self._current is not None or bool(self._pending)
+
+    def _notify(self, job):
+        if self.on_change:
+            try:
+                self.on_change(job)
+            except Exception:
+                pass
+
+    def _loop(self):
+        while True:
+            with self._cv:
+                while not self._pending:
+                    self._cv.wait()
+                job = self._pending.popleft()
+                self._current = job
+                job.state = RUNNING
+            self._notify(job)
+            try:
+                job.fn(job)
+                job.state = CANCELLED if job.cancelled() else DONE
+            except JobCancelled:
+                job.state = CANCELLED
+            except Exception as e:
+                job.state = FAILED
+                job.error = e
+            with self._cv:
+                self._current = None
+            self._notify(job)
@@ -0,0 +1,225 @@
+# ValorantTrueStretch_Journal.py
+# Crash-safe multi-file writes: stage every new file next to its target, fsync the
+# batch, then rename them all into place. A small journal makes an interrupted apply
+# finish (or undo itself) the next time the tool starts.
+# Made by GlitchFL (credit required if you share)
+#
+# Journal life cycle (one JSON file per transaction under the journal dir):
+#   "staging"   temp files may be partly written     -> recover() deletes the temps (rollback)
+#   "prepared"  every temp is complete and fsynced   -> recover() renames the rest (roll-forward)
+#   (deleted)   every target holds its new bytes
+#
+# Every tool (GUI, CLI, watch, fleet agent) shares the journal dir and calls recover() at
+# startup, so a committing process holds an exclusive lock on <id>.lock until its journal
+# is gone; recover() skips journals whose lock it cannot take (their owner is still alive).
+
+import os
+import json
+import socket
+import hashlib
+from pathlib import Path
+
+from ValorantTrueStretch_Backup import new_run_id
+
+JOURNAL_DIR = Path.home() / "Documents" / "ValorantTrueStretch_Journal"
+
+STAGING, PREPARED = "staging", "prepared"
+
+def _fsync_dir(path: Path):
+    # Makes renames durable on POSIX; Windows can't open directories (NTFS journals metadata itself)
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _write_durable(path: Path, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+def _write_journal(path: Path, doc: dict):
+    tmp = path.with_name(path.name + ".tmp")
+    _write_durable(tmp, json.dumps(doc).encode("utf-8"))
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+def _temp_for(path: Path, txid: str):
+    return path.with_name(f".{path.name}.{txid}.tmp")
+
+def _lock_path(journal_dir: Path, txid: str):
+    return Path(journal_dir) / f"{txid}.lock"
+
+def _try_lock(path: Path):
+    """Open `path` and lock it exclusively without waiting; None if another owner holds it."""
+    f = open(path, "a+b")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+def _unlock(f, path: Path):
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    f.close()
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        pass    # someone else has it open (Windows); the next recover() removes it
+
+class Transaction:
+    """All-or-nothing replacement of several files' contents.
+
+        txn = Transaction()
+        txn.commit([(path, new_bytes), ...])
+
+    commit() raises if staging fails (nothing was replaced) or if a rename fails
+    (the journal stays "prepared" and recover() finishes the job later).
+    """
+
+    def __init__(self, journal_dir: Path = JOURNAL_DIR, txid: str | None = None):
+        self.journal_dir = Path(journal_dir)
+        self.id = txid or new_run_id()
+        self.journal = self.journal_dir / f"{self.id}.json"
+
+    def _doc(self, state, files):
+        return {"id": self.id, "state": state, "files": files,
+                "owner": {"pid": os.getpid(), "host": socket.gethostname()}}
+
+    def commit(self, items, map_func=None):
+        """Replace each (path, data); `map_func(fn, items)` may run the temp writes concurrently."""
+        items = [(Path(p), data) for p, data in items]
+        if not items:
+            return []
+        run = map_func or (lambda fn, xs: [fn(x) for x in xs])
+        files = [
+            {"path": str(p), "tmp": str(_temp_for(p, self.id)), "sha256": hashlib.sha256(data).hexdigest()}
+            for p, data in items
+        ]
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        lock_path = _lock_path(self.journal_dir, self.id)
+        lock = _try_lock(lock_path)
+        if lock is None:
+            raise RuntimeError(f"Transaction {self.id} is already in progress.")
+        try:
+            return self._commit(items, files, run)
+        finally:
+            _unlock(lock, lock_path)
+
+    def _commit(self, items, files, run):
+        _write_journal(self.journal, self._doc(STAGING, files))
+
+        def stage(item):
+            path, data = item
+            tmp = _temp_for(path, self.id)
+            _write_durable(tmp, data)   # fsync on the write handle (Windows needs write access)
+            try:
+                os.chmod(tmp, path.stat().st_mode)
+            except OSError:
+                pass
+            return tmp
+
+        try:
+            run(stage, items)
+            for d in {p.parent for p, _ in items}:
+                _fsync_dir(d)
+        except BaseException:
+            _rollback(files)
+            self.journal.unlink(missing_ok=True)
+            raise
+
+        _write_journal(self.journal, self._doc(PREPARED, files))
+        _roll_forward(files)
+        for d in {p.parent for p, _ in items}:
+            _fsync_dir(d)
+        self.journal.unlink(missing_ok=True)
+        return [p for p, _ in items]
+
+def _rollback(files):
+    for f in files:
+        Path(f["tmp"]).unlink(missing_ok=True)
+
+def _roll_forward(files):
+    for f in files:
+        tmp = Path(f["tmp"])
+        if tmp.exists():
+            os.replace(tmp, f["path"])
+
+def pending(journal_dir: Path = JOURNAL_DIR):
+    """Journals left behind by interrupted applies."""
+    d = Path(journal_dir)
+    return sorted(d.glob("*.json")) if d.is_dir() else []
+
+def recover(journal_dir: Path = JOURNAL_DIR, log_func=None):
+    """Finish or undo interrupted transactions; returns [(txid, "rolled forward" | "rolled back" | error)].
+
+    Journals still locked by a live transaction (this or another process) are left alone.
+    """
+    log = log_func or (lambda msg, tag=None: None)
+    done = []
+    for jp in pending(journal_dir):
+        lock_path = _lock_path(jp.parent, jp.stem)
+        try:
+            lock = _try_lock(lock_path)
+        except OSError:
+            continue
+        if lock is None:
+            continue    # owner is still committing
+        try:
+            if not jp.exists():
+                continue    # finished between listing and locking
+            doc = json.loads(jp.read_text(encoding="utf-8"))
+            files = doc.get("files", [])
+            if doc.get("state") == PREPARED:
+                # Temps were fsynced before "prepared" was written; a temp that fails
+                # its hash check means the disk lied, so leave the target alone.
+                for f in files:
+                    tmp = Path(f["tmp"])
+                    if tmp.exists() and hashlib.sha256(tmp.read_bytes()).hexdigest() != f["sha256"]:
+                        tmp.unlink()
+                _roll_forward(files)
+                outcome = "rolled forward"
+            else:
+                _rollback(files)
+                outcome = "rolled back"
+            jp.unlink()
+            log(f"[i] Recovered interrupted apply {doc.get('id', jp.stem)}: {outcome} ({len(files)} file(s)).",
+                tag="warning")
+        except (OSError, ValueError) as e:
+            outcome = f"failed: {e}"
+            log(f"[!] Could not recover interrupted apply {jp.stem}: {e}", tag="error")
+        finally:
+            _unlock(lock, lock_path)
+        done.append((jp.stem, outcome))
+    d = Path(journal_dir)
+    if d.is_dir():
+        # Half-written journals and locks of dead owners (a live owner's lock can't be taken)
+        for stray in list(d.glob("*.json.tmp")) + list(d.glob("*.lock")):
+            txid = stray.name[:-len(".json.tmp")] if stray.name.endswith(".json.tmp") else stray.stem
+            lock_path = _lock_path(d, txid)
+            if (d / f"{txid}.json").exists():
+                continue
+            try:
+                lock = _try_lock(lock_path)
+            except OSError:
+                continue
+            if lock is not None:
+                stray.unlink(missing_ok=True)
+                _unlock(lock, lock_path)
+    return done
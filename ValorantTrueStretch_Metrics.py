@@ -0,0 +1,224 @@
+# ValorantTrueStretch_Metrics.py
+# Operational counters and latency histograms for unattended runs (watch mode, fleet
+# agent), exported as Prometheus text over HTTP or to a periodically rewritten file.
+# Made by GlitchFL (credit required if you share)
+#
+# Off by default: inc() costs one global lookup until a Registry is activated with
+# `with collecting(Registry()):`. Stage latencies (read, parse, diff, backup, write...)
+# come from the existing trace spans, so no extra timing code runs when disabled.
+
+import os
+import time
+import threading
+
+import ValorantTrueStretch_Trace as _trace
+
+# Seconds; covers a cached stat (~µs) up to a slow network share write
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "vts_applies_total": ("counter", "Apply operations that wrote at least one file (one per apply run or watch pass)."),
+    "vts_files_total": ("counter", "Config files processed, by outcome (updated = written, unchanged/missing = skipped)."),
+    "vts_backups_total": ("counter", "Files backed up before being changed."),
+    "vts_backup_bytes_total": ("counter", "Bytes of original file content backed up (before dedup/compression)."),
+    "vts_native_check_failures_total": ("counter", "Native checks that failed, by the first mismatching key."),
+    "vts_desktop_changes_total": ("counter", "Desktop resolution changes, by result."),
+    "vts_stage_seconds": ("histogram", "Time spent per pipeline stage."),
+}
+
+_active = None
+
+def _labels_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _fmt_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in items) + "}"
+
+def _fmt_num(v):
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+class Registry:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started = time.time()
+        self.counters = {}      # name -> {labels key: value}
+        self.histograms = {}    # name -> {labels key: [bucket counts..., +Inf count, sum]}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, labels=None):
+        key = _labels_key(labels or {})
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, seconds, labels=None):
+        key = _labels_key(labels or {})
+        with self._lock:
+            h = self.histograms.setdefault(name, {}).get(key)
+            if h is None:
+                h = self.histograms[name][key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, b in enumerate(self.buckets):
+                if seconds <= b:
+                    h[i] += 1
+                    break
+            else:
+                h[len(self.buckets)] += 1
+            h[-1] += seconds
+
+    def add(self, name, start_ns, end_ns, args=None):
+        # Trace sink (see collecting()): every span becomes a stage latency sample
+        self.observe("vts_stage_seconds", (end_ns - start_ns) / 1e9, {"stage": name})
+
+    def prometheus_text(self):
+        with self._lock:
+            counters = {n: dict(s) for n, s in self.counters.items()}
+            hists = {n: {k: list(h) for k, h in s.items()} for n, s in self.histograms.items()}
+        out = []
+        def header(name, kind):
+            kind, text = HELP.get(name, (kind, ""))
+            if text:
+                out.append(f"# HELP {name} {text}")
+            out.append(f"# TYPE {name} {kind}")
+        header("vts_start_time_seconds", "gauge")
+        out.append(f"vts_start_time_seconds {self.started:.3f}")
+        for name in sorted(counters):
+            header(name, "counter")
+            for key, v in sorted(counters[name].items()):
+                out.append(f"{name}{_fmt_labels(key)} {_fmt_num(v)}")
+        for name in sorted(hists):
+            header(name, "histogram")
+            for key, h in sorted(hists[name].items()):
+                cum = 0
+                for b, n in zip(self.buckets + ("+Inf",), h[:-1]):
+                    cum += n
+                    out.append(f"{name}_bucket{_fmt_labels(key, [('le', str(b))])} {cum}")
+                out.append(f"{name}_sum{_fmt_labels(key)} {h[-1]!r}")
+                out.append(f"{name}_count{_fmt_labels(key)} {cum}")
+        return "\n".join(out) + "\n"
+
+    def write(self, path):
+        """Atomically replace `path` with the current Prometheus text (node_exporter textfile style)."""
+        path = os.fspath(path)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+# Recording (no-ops unless collecting)
+
+def inc(name, value=1, **labels):
+    r = _active
+    if r is not None:
+        r.inc(name, value, labels)
+
+class _Tee:
+    __slots__ = ("sinks",)
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def add(self, *a):
+        for s in self.sinks:
+            s.add(*a)
+
+class collecting:
+    """`with collecting(registry):` counts events and times trace spans into `registry`
+    (alongside any Tracer already active). None = off."""
+
+    def __init__(self, registry):
+        self.registry = registry
+
+    def __enter__(self):
+        global _active
+        self._prev, _active = _active, self.registry
+        sink = self.registry
+        if sink is not None and _trace._active is not None:
+            sink = _Tee(_trace._active, sink)
+        self._tracing = _trace.tracing(sink if sink is not None else _trace._active)
+        self._tracing.__enter__()
+        return self.registry
+
+    def __exit__(self, *exc):
+        global _active
+        self._tracing.__exit__(*exc)
+        _active = self._prev
+        return False
+
+# Export
+
+def serve_http(registry, host="127.0.0.1", port=9464):
+    """Serve GET /metrics on a daemon thread; returns the server (call .shutdown() to stop)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *a):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+class FileExporter:
+    """Rewrite `path` every `interval` seconds on a daemon thread, and once more on stop()."""
+
+    def __init__(self, registry, path, interval=15.0):
+        self.registry, self.path, self.interval = registry, path, interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="metrics-file", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._flush()
+
+    def _flush(self):
+        try:
+            self.registry.write(self.path)
+        except OSError:
+            pass
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._flush()
+
+# Command-line wiring shared by the watch mode and the fleet agent
+
+def add_arguments(ap):
+    ap.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port (GET /metrics)")
+    ap.add_argument("--metrics-listen", default="127.0.0.1", help="Address for --metrics-port (default: %(default)s)")
+    ap.add_argument("--metrics-file", help="Rewrite Prometheus metrics to this file periodically")
+    ap.add_argument("--metrics-interval", type=float, default=15.0,
+                    help="Seconds between --metrics-file rewrites (default: %(default)s)")
+
+def start_exporters(args):
+    """(Registry or None if no metrics option was given, stop function)."""
+    if args.metrics_port is None and not args.metrics_file:
+        return None, lambda: None
+    registry = Registry()
+    server = serve_http(registry, args.metrics_listen, args.metrics_port) if args.metrics_port is not None else None
+    exporter = FileExporter(registry, args.metrics_file, args.metrics_interval).start() if args.metrics_file else None
+    def stop():
+        if server is not None:
+            server.shutdown()
+        if exporter is not None:
+            exporter.stop()
+    return registry, stop
@@ -0,0 +1,188 @@
+# ValorantTrueStretch_Presets.py
+# Quick-button presets ({"name", "native", "target"}): an append-only store and the
+# in-memory index behind the GUI's type-ahead filter.
+# Made by GlitchFL (credit required if you share)
+#
+# Storage: ValorantTrueStretch_Presets.json is a snapshot {"version", "seq", "presets"}
+# (a bare list from older versions also loads), and ValorantTrueStretch_Presets.log holds
+# one JSON edit per line ({"seq", "op": add/remove/move, ...}) appended since then.
+# flush() appends only the pending edits; once the log grows past COMPACT_OPS lines the
+# snapshot is rewritten atomically and the log emptied. Log lines at or below the
+# snapshot's seq are skipped, so a crash between those two steps replays nothing twice.
+
+import os
+import json
+import uuid
+from pathlib import Path
+
+PRESETS_PATH = Path.home() / "Documents" / "ValorantTrueStretch_Presets.json"
+
+PRESETS_VERSION = 1
+COMPACT_OPS = 256
+
+DEFAULT_PRESETS = [
+    {"name": "1080→1080x1080", "native": "1920x1080", "target": "1080x1080"},
+    {"name": "1440p→1280x1024", "native": "2560x1440", "target": "1280x1024"},
+    {"name": "1440p→1440x1080", "native": "2560x1440", "target": "1440x1080"},
+]
+
+def _valid(p):
+    return isinstance(p, dict) and all(isinstance(p.get(k), str) for k in ("name", "native", "target"))
+
+def _preset(p):
+    return {"name": p["name"], "native": p["native"], "target": p["target"]}
+
+class PresetStore:
+    """Preset list with batched, append-only persistence.
+
+        store = PresetStore()
+        store.presets            # loaded (and validated) on first access
+        store.add(p); store.move(3, 2); store.remove(0)
+        store.flush()            # call on a debounce timer and on exit
+    """
+
+    def __init__(self, path: Path = PRESETS_PATH):
+        self.path = Path(path)
+        self.log_path = self.path.with_suffix(".log")
+        self._presets = None
+        self._seq = 0            # last edit applied to self._presets
+        self._log_ops = 0        # lines currently in the log
+        self._pending = []       # edits not yet appended to the log
+
+    @property
+    def presets(self):
+        if self._presets is None:
+            self._load()
+        return self._presets
+
+    @property
+    def dirty(self):
+        return bool(self._pending)
+
+    def _load(self):
+        presets, seq = None, 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                seq = int(data.get("seq", 0))
+                data = data.get("presets")
+            if isinstance(data, list):
+                presets = [_preset(p) for p in data if _valid(p)]
+        except (OSError, ValueError, TypeError):
+            pass
+        if presets is None:
+            presets = [dict(p) for p in DEFAULT_PRESETS]
+        ops = 0
+        try:
+            log = self.log_path.read_bytes()
+        except OSError:
+            log = b""
+        whole = log[:log.rfind(b"\n") + 1]
+        if len(whole) != len(log):
+            try:
+                os.truncate(self.log_path, len(whole))  # drop a torn line from an interrupted append
+            except OSError:
+                pass    # read-only/locked: the torn line is ignored either way
+        for line in whole.splitlines():
+            try:
+                op = json.loads(line)
+            except ValueError:
+                continue
+            ops += 1
+            if isinstance(op, dict) and isinstance(op.get("seq"), int) and op["seq"] > seq:
+                _apply(presets, op)
+                seq = op["seq"]
+        self._presets, self._seq, self._log_ops = presets, seq, ops
+
+    def _edit(self, op):
+        presets = self.presets      # load first: _load() sets _seq
+        self._seq += 1
+        op["seq"] = self._seq
+        _apply(presets, op)
+        self._pending.append(op)
+
+    def add(self, preset):
+        if not _valid(preset):
+            raise ValueError("A preset needs string name, native and target.")
+        self._edit({"op": "add", "preset": _preset(preset)})
+
+    def _check(self, *indices):
+        for i in indices:
+            if not 0 <= i < len(self.presets):
+                raise IndexError(f"No preset at position {i}.")
+
+    def remove(self, index):
+        self._check(index)
+        self._edit({"op": "remove", "index": index})
+
+    def move(self, index, to):
+        self._check(index, to)
+        self._edit({"op": "move", "index": index, "to": to})
+
+    def flush(self):
+        """Append pending edits to the log (compacting when it is long); no-op if clean."""
+        if not self._pending:
+            return
+        if self._log_ops + len(self._pending) > COMPACT_OPS:
+            self.compact()
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in self._pending).encode("utf-8")
+        with open(self.log_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_ops += len(self._pending)
+        self._pending = []
+
+    def compact(self):
+        """Rewrite the snapshot with every edit folded in and empty the log."""
+        doc = {"version": PRESETS_VERSION, "seq": self._seq, "presets": self.presets}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(doc, indent=2, ensure_ascii=False).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.log_path.unlink(missing_ok=True)
+        self._log_ops = 0
+        self._pending = []
+
+def _apply(presets, op):
+    kind = op.get("op")
+    if kind == "add" and _valid(op.get("preset")):
+        presets.append(_preset(op["preset"]))
+    elif kind == "remove" and 0 <= op.get("index", -1) < len(presets):
+        del presets[op["index"]]
+    elif kind == "move" and 0 <= op.get("index", -1) < len(presets) and 0 <= op.get("to", -1) < len(presets):
+        presets.insert(op["to"], presets.pop(op["index"]))
+
+def preset_label(p):
+    return f"{p['name']}   [{p['native']} → {p['target']}]"
+
+class PresetIndex:
+    """Case-insensitive search over preset name / native / target.
+
+    Every space-separated term of the query must occur in one of the three fields.
+    A query that extends the previous one (typing) only re-checks the previous hits.
+    """
+
+    def __init__(self, presets):
+        self._keys = [f"{p['name']}\0{p['native']}\0{p['target']}".casefold() for p in presets]
+        self._last = ("", list(range(len(self._keys))))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def search(self, query):
+        """Indices of the matching presets, in list order."""
+        q = " ".join(query.casefold().split())
+        last_q, last_hits = self._last
+        if q == last_q:
+            return last_hits
+        pool = last_hits if q.startswith(last_q) else range(len(self._keys))
+        terms = q.split()
+        hits = [i for i in pool if all(t in self._keys[i] for t in terms)]
+        self._last = (q, hits)
+        return hits
@@ -0,0 +1,241 @@
+# ValorantTrueStretch_Profiles.py
+# Edit profiles: which GameUserSettings.ini keys an apply writes and which ones the
+# native check reads, as versioned JSON/TOML files instead of code.
+# Made by GlitchFL (credit required if you share)
+#
+# A profile (TOML shown; JSON has the same shape):
+#
+#   version = 1
+#   name = "stretch-240fps"
+#   extends = "true-stretch"          # optional: start from a built-in profile
+#
+#   [set]                             # every KEY= line rewritten (appended if absent)
+#   FrameRateLimit = "240.000000"     # {width} / {height} = the target resolution
+#
+#   [[after]]                         # pin `key` and keep `follow` right after every `key` line
+#   key = "HDRDisplayOutputNits"      # (both appended at the end if there is no `key` line)
+#   value = "1000"
+#   follow = "FullscreenMode"
+#   follow_value = "1"                # e.g. windowed fullscreen
+#
+#   [check]                           # root-file native check; {width} / {height} = native
+#   ResolutionSizeX = "{width}"
+#
+# A profile is compiled once (templates split, keys validated) and cached by content
+# digest, so one Profile object serves every file and root of a run; the per-resolution
+# update and check dicts are built once per resolution.
+
+import re
+import json
+import string
+import hashlib
+import threading
+from pathlib import Path
+
+from ValorantTrueStretch_Ini import FULLSCREEN_KEY, HDR_KEY
+
+PROFILE_VERSION = 1
+DEFAULT_NAME = "true-stretch"
+
+_RESOLUTION = {
+    "ResolutionSizeX": "{width}",
+    "ResolutionSizeY": "{height}",
+    "LastUserConfirmedResolutionSizeX": "{width}",
+    "LastUserConfirmedResolutionSizeY": "{height}",
+    "bShouldLetterbox": "False",
+    "bLastConfirmedShouldLetterbox": "False",
+}
+
+BUILTIN = {
+    DEFAULT_NAME: {
+        "version": PROFILE_VERSION,
+        "name": DEFAULT_NAME,
+        "set": _RESOLUTION,
+        "after": [{"key": HDR_KEY, "value": "1000", "follow": FULLSCREEN_KEY, "follow_value": "2"}],
+        "check": _RESOLUTION,
+    },
+}
+
+_KEY_RE = re.compile(r"[A-Za-z0-9_]+")   # what IniDocument can find again on the next run
+_FIELDS = {"width", "height"}
+
+def _value(v, where):
+    if isinstance(v, bool):
+        return "True" if v else "False"    # Unreal spelling
+    if isinstance(v, (int, float)):
+        return str(v)
+    if not isinstance(v, str) or "\n" in v or "\r" in v:
+        raise ValueError(f"{where}: value must be a single-line string or number")
+    return v
+
+def _template(v, where):
+    """(constant, None) or (None, format string) for a value that uses {width}/{height}."""
+    v = _value(v, where)
+    try:
+        names = {f for _, f, _, _ in string.Formatter().parse(v) if f is not None}
+    except ValueError as e:
+        raise ValueError(f"{where}: {e}") from None
+    if not names:
+        return v, None
+    if not names <= _FIELDS:
+        raise ValueError(f"{where}: unknown placeholder(s) {', '.join(sorted(names - _FIELDS))}")
+    return None, v
+
+def _key(k, where):
+    if not isinstance(k, str) or not _KEY_RE.fullmatch(k):
+        raise ValueError(f"{where}: {k!r} is not a valid INI key")
+    return k
+
+def _table(data, name):
+    t = data.get(name, {})
+    if not isinstance(t, dict):
+        raise ValueError(f"[{name}] must be a table of KEY = value")
+    return {_key(k, f"[{name}]"): _template(v, f"[{name}] {k}") for k, v in t.items()}
+
+def _after_rules(data):
+    rules = data.get("after", [])
+    if not isinstance(rules, list):
+        raise ValueError("[[after]] must be a list of rules")
+    out = {}
+    for i, r in enumerate(rules):
+        where = f"[[after]] #{i + 1}"
+        if not isinstance(r, dict) or not {"key", "value", "follow", "follow_value"} <= r.keys():
+            raise ValueError(f"{where}: needs key, value, follow and follow_value")
+        key = _key(r["key"], where)
+        out[key] = (key, _value(r["value"], where), _key(r["follow"], where),
+                    _value(r["follow_value"], where), bool(r.get("numeric", True)))
+    return out
+
+def _merge(data):
+    """`data` with its `extends` chain folded in (child values win; [[after]] by key)."""
+    base_name = data.get("extends")
+    if base_name is None:
+        return data
+    if base_name not in BUILTIN:
+        raise ValueError(f"extends: unknown profile {base_name!r} (built-in: {', '.join(BUILTIN)})")
+    base = _merge(BUILTIN[base_name])
+    after = {r["key"]: r for r in base.get("after", [])}
+    after.update((r.get("key"), r) for r in data.get("after", []) if isinstance(r, dict))
+    return base | data | {
+        "set": base.get("set", {}) | data.get("set", {}),
+        "check": base.get("check", {}) | data.get("check", {}),
+        "after": list(after.values()),
+    }
+
+class Profile:
+    """A compiled edit profile. Build with compile_profile() / load_profile(), not directly."""
+
+    def __init__(self, data: dict, digest: str):
+        version = data.get("version")
+        if version != PROFILE_VERSION:
+            raise ValueError(f"Unsupported profile version {version!r} (expected {PROFILE_VERSION})")
+        merged = _merge(data)
+        self.data = data        # the document as written (what a fleet push sends)
+        self.name = str(data.get("name") or "profile")
+        self.digest = digest
+        self._tables = {"set": _table(merged, "set"), "check": _table(merged, "check")}
+        self.after = tuple(_after_rules(merged).values())
+        self.keys = frozenset(self._tables["set"]) | {k for r in self.after for k in (r[0], r[2])}
+        self.check_keys = frozenset(self._tables["check"])
+        self._memo = {}         # (table, width, height) -> resolved dict
+
+    def __repr__(self):
+        return f"<Profile {self.name} {self.digest}>"
+
+    def _resolve(self, table, width, height):
+        key = (table, width, height)
+        out = self._memo.get(key)
+        if out is None:
+            fields = {"width": width, "height": height}
+            out = self._memo[key] = {
+                k: c if t is None else t.format_map(fields) for k, (c, t) in self._tables[table].items()
+            }
+        return out
+
+    def updates(self, width, height):
+        """{key: value} the [set] table writes for this target (shared: do not modify)."""
+        return self._resolve("set", width, height)
+
+    def checks(self, width, height):
+        """{key: value} the native check expects at this native resolution (shared: do not modify)."""
+        return self._resolve("check", width, height)
+
+    def apply(self, doc, width, height):
+        """Edit an IniDocument in place; returns doc.changed."""
+        doc.update(self.updates(width, height))
+        for key, value, follow, follow_value, numeric in self.after:
+            doc.pin_after(key, value, follow, follow_value, numeric)
+        return doc.changed
+
+    def target_key(self, width, height):
+        """What the state cache records as "already at target" (plain WxH for the default profile)."""
+        wh = f"{width}x{height}"
+        return wh if self is DEFAULT_PROFILE else f"{wh}@{self.name}:{self.digest}"
+
+_compiled = {}          # digest -> Profile
+_files = {}             # (path, size, mtime_ns) -> Profile
+_lock = threading.Lock()
+
+def compile_profile(data: dict):
+    """Profile for a parsed profile document; identical documents share one compiled Profile."""
+    if not isinstance(data, dict):
+        raise ValueError("A profile must be a JSON object / TOML table")
+    try:
+        canon = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Profile is not plain data: {e}") from None
+    digest = hashlib.sha256(canon.encode("utf-8")).hexdigest()[:12]
+    with _lock:
+        prof = _compiled.get(digest)
+    if prof is None:
+        prof = Profile(data, digest)
+        with _lock:
+            prof = _compiled.setdefault(digest, prof)
+    return prof
+
+def _toml():
+    try:
+        import tomllib
+    except ImportError:     # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ValueError("TOML profiles need Python 3.11+ (or the tomli package); use a .json profile") from None
+    return tomllib
+
+def read_profile(path: Path):
+    """Parse a .json or .toml profile file (no compiling)."""
+    path = Path(path)
+    raw = path.read_bytes()
+    try:
+        if path.suffix.lower() == ".toml":
+            return _toml().loads(raw.decode("utf-8"))
+        return json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+
+def load_profile(path: Path):
+    """Compiled profile from a file; re-read only when the file's size/mtime change."""
+    path = Path(path)
+    st = path.stat()
+    key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    prof = _files.get(key)
+    if prof is None:
+        data = read_profile(path)
+        try:
+            prof = _files[key] = compile_profile(data)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+    return prof
+
+def get_profile(spec=None):
+    """None or a built-in name -> built-in profile; a Profile passes through; else a file path."""
+    if spec is None:
+        return DEFAULT_PROFILE
+    if isinstance(spec, Profile):
+        return spec
+    if spec in BUILTIN:
+        return compile_profile(BUILTIN[spec])
+    return load_profile(spec)
+
+DEFAULT_PROFILE = compile_profile(BUILTIN[DEFAULT_NAME])
@@ -0,0 +1,206 @@
+# ValorantTrueStretch_Synth.py
+# Synthetic VALORANT config trees for load testing without Windows or the game,
+# plus a driver that runs the engine over thousands of them.
+# Made by GlitchFL (credit required if you share)
+#
+# Generated layout (per root):
+#   <root>/Config/WindowsClient/RiotLocalMachine.ini            LastKnownUser=<puuid>
+#   <root>/Config/WindowsClient/GameUserSettings.ini            root GUS (native-checked)
+#   <root>/Config/<puuid>-<region>/{Windows,WindowsClient}/GameUserSettings.ini
+#
+# Examples:
+#   python ValorantTrueStretch_Synth.py gen /tmp/fleet --roots 500 --accounts 4 --missing 0.05
+#   python ValorantTrueStretch_Synth.py drive --roots 2000 --accounts 3 -j 16 --apply
+
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import statistics
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from ValorantTrueStretch_Engine import run_batch, STATUS_MISSING
+
+REGIONS = ("na", "eu", "ap", "kr", "latam", "br")
+ORDERS = ("top", "bottom", "shuffled")
+
+NATIVE = (2560, 1440)
+TARGET = (1280, 1024)
+
+@dataclass
+class TreeSpec:
+    accounts: int = 3           # <puuid>-<region> folders per root
+    lines: int = 120            # approximate lines per GameUserSettings.ini
+    order: str = "top"          # where the tracked keys sit: top / bottom / shuffled / mixed (per file)
+    missing: float = 0.0        # chance each account GUS file is absent
+    wrong_native: float = 0.0   # chance a root's GUS is not at native (fails the native check)
+    no_last_user: float = 0.0   # chance RiotLocalMachine.ini has no LastKnownUser
+    crlf: bool = False          # Windows line endings
+    native: tuple = NATIVE
+
+def _tracked(nx, ny, letterbox="False"):
+    return [
+        f"ResolutionSizeX={nx}\n", f"ResolutionSizeY={ny}\n",
+        f"LastUserConfirmedResolutionSizeX={nx}\n", f"LastUserConfirmedResolutionSizeY={ny}\n",
+        f"bShouldLetterbox={letterbox}\n", f"bLastConfirmedShouldLetterbox={letterbox}\n",
+        "HDRDisplayOutputNits=1000\n", "FullscreenMode=0\n",
+    ]
+
+def gus_text(n_lines, native=NATIVE, order="top", rng=None, wrong=False, crlf=False):
+    """One GameUserSettings.ini body of about `n_lines` lines."""
+    rng = rng or random.Random(0)
+    nx, ny = native
+    tracked = _tracked(nx, ny) if not wrong else rng.choice((
+        _tracked(1920, 1080),
+        _tracked(nx, ny, letterbox="True"),
+    ))
+    filler = []
+    for i in range(max(0, n_lines - len(tracked) - 1)):
+        if i and i % 500 == 0:
+            filler.append(f"[/Script/Engine.Section{i // 500}]\n")
+        else:
+            filler.append(f"Setting{i}={i % 7}\n")
+    if order == "bottom":
+        body = filler + tracked
+    elif order == "shuffled":
+        body = filler[:]
+        for ln in tracked:
+            body.insert(rng.randint(0, len(body)), ln)
+    else:
+        body = tracked + filler
+    text = "".join(["[/Script/ShooterGame.ShooterGameUserSettings]\n"] + body)
+    return text.replace("\n", "\r\n") if crlf else text
+
+def generate_tree(root: Path, spec: TreeSpec, rng: random.Random):
+    """Write one config tree under `root`; returns (config base, expect native check to pass)."""
+    base = Path(root) / "Config"
+    wc = base / "WindowsClient"
+    wc.mkdir(parents=True, exist_ok=True)
+    puuids = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(spec.accounts)]
+    rlmi = "[Settings]\n"
+    if puuids and rng.random() >= spec.no_last_user:
+        rlmi += f"LastKnownUser={rng.choice(puuids)}\n"
+    (wc / "RiotLocalMachine.ini").write_text(rlmi, encoding="utf-8")
+
+    wrong = rng.random() < spec.wrong_native
+    def gus(wrong_native=False):
+        order = rng.choice(ORDERS) if spec.order == "mixed" else spec.order
+        return gus_text(spec.lines, spec.native, order, rng, wrong_native, spec.crlf).encode("utf-8")
+
+    (wc / "GameUserSettings.ini").write_bytes(gus(wrong))
+    for puuid in puuids:
+        acc = base / f"{puuid}-{rng.choice(REGIONS)}"
+        for sub in ("Windows", "WindowsClient"):
+            (acc / sub).mkdir(parents=True, exist_ok=True)
+            if rng.random() >= spec.missing:
+                (acc / sub / "GameUserSettings.ini").write_bytes(gus())
+    return base, not wrong
+
+def generate_fleet(out_dir: Path, roots, spec: TreeSpec, seed=0):
+    """`roots` trees under out_dir/m00000.../; returns [(config base, native ok)]."""
+    rng = random.Random(seed)
+    width = len(str(max(roots - 1, 0)))
+    return [generate_tree(Path(out_dir) / f"m{i:0{width}d}", spec, rng) for i in range(roots)]
+
+# Fixed-seed inputs for ValorantTrueStretch_Bench.py
+
+def synth_gus(n_lines, native=NATIVE):
+    return gus_text(n_lines, native)
+
+def synth_tree(root: Path, accounts, n_lines=40, native=NATIVE):
+    base, _ = generate_tree(root, TreeSpec(accounts=accounts, lines=n_lines, native=native), random.Random(0))
+    return base
+
+# Load driver
+
+def percentile(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+def drive(bases, apply_changes=False, workers=None, all_accounts=True, native=NATIVE, target=TARGET):
+    """Run the engine over `bases`; returns a report dict (throughput and latency percentiles)."""
+    t0 = time.perf_counter()
+    results = run_batch(bases, *native, *target, apply_changes=apply_changes, workers=workers,
+                        all_accounts=all_accounts)
+    wall = time.perf_counter() - t0
+    lat = sorted(r.elapsed for r in results)
+    files = sum(1 for r in results for s in r.statuses.values() if s != STATUS_MISSING)
+    return {
+        "roots": len(results),
+        "failed": sum(1 for r in results if not r.ok),
+        "files": files,
+        "wall_s": round(wall, 4),
+        "files_per_s": round(files / wall, 1) if wall else 0.0,
+        "roots_per_s": round(len(results) / wall, 1) if wall else 0.0,
+        "latency_ms": {
+            f"p{p}": round(percentile(lat, p) * 1000, 3) for p in (50, 90, 99)
+        } | {"max": round(lat[-1] * 1000, 3) if lat else 0.0,
+             "mean": round(statistics.fmean(lat) * 1000, 3) if lat else 0.0},
+    }
+
+def _add_spec_args(ap):
+    ap.add_argument("--roots", type=int, default=100, help="Config trees to generate (default: %(default)s)")
+    ap.add_argument("--accounts", type=int, default=3, help="Account folders per tree (default: %(default)s)")
+    ap.add_argument("--lines", type=int, default=120, help="Lines per GameUserSettings.ini (default: %(default)s)")
+    ap.add_argument("--order", choices=ORDERS + ("mixed",), default="top", help="Tracked key placement")
+    ap.add_argument("--missing", type=float, default=0.0, help="Chance each account GUS file is missing")
+    ap.add_argument("--wrong-native", type=float, default=0.0, help="Chance a tree fails the native check")
+    ap.add_argument("--no-last-user", type=float, default=0.0, help="Chance LastKnownUser is absent")
+    ap.add_argument("--crlf", action="store_true", help="Write CRLF line endings")
+    ap.add_argument("--seed", type=int, default=0)
+
+def _spec(args):
+    return TreeSpec(args.accounts, args.lines, args.order, args.missing, args.wrong_native,
+                    args.no_last_user, args.crlf)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate synthetic VALORANT config trees and load-test the engine.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    gen = sub.add_parser("gen", help="Write a fleet of config trees")
+    gen.add_argument("out", help="Output folder")
+    _add_spec_args(gen)
+    drv = sub.add_parser("drive", help="Generate a fleet (or use --dir) and run the engine over it")
+    drv.add_argument("--dir", help="Existing/kept fleet folder (default: a temp folder, deleted afterwards)")
+    drv.add_argument("--apply", action="store_true", help="Write changes (default is a preview)")
+    drv.add_argument("--last-user-only", action="store_true", help="Only LastKnownUser's folder (default: all)")
+    drv.add_argument("-j", "--workers", type=int, default=None, help="Worker threads (default: auto)")
+    drv.add_argument("--json", action="store_true", help="Print the report as JSON")
+    _add_spec_args(drv)
+    args = ap.parse_args(argv)
+
+    spec = _spec(args)
+    if args.cmd == "gen":
+        fleet = generate_fleet(Path(args.out), args.roots, spec, args.seed)
+        bad = sum(1 for _, ok in fleet if not ok)
+        print(f"Generated {len(fleet)} tree(s) under {args.out} ({bad} not at native).")
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="vts_fleet_") as tmp:
+        out = Path(args.dir or tmp)
+        t0 = time.perf_counter()
+        fleet = generate_fleet(out, args.roots, spec, args.seed)
+        gen_s = time.perf_counter() - t0
+        report = drive([b for b, _ in fleet], args.apply, args.workers, not args.last_user_only)
+    report["generate_s"] = round(gen_s, 4)
+    report["spec"] = asdict(spec)
+    report["expected_failed"] = sum(1 for _, ok in fleet if not ok)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        lat = report["latency_ms"]
+        print(f"{report['roots']} roots ({report['failed']} failed, {report['expected_failed']} expected), "
+              f"{report['files']} files in {report['wall_s']:.2f}s")
+        print(f"Throughput: {report['files_per_s']} files/s, {report['roots_per_s']} roots/s")
+        print(f"Latency per root: p50 {lat['p50']} ms, p90 {lat['p90']} ms, p99 {lat['p99']} ms, max {lat['max']} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
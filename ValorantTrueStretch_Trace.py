@@ -0,0 +1,132 @@
+# ValorantTrueStretch_Trace.py
+# Opt-in timing spans for the apply pipeline (discovery, read, parse, update, diff,
+# backup, write), summarized per run and exportable as a Chrome trace
+# (open in chrome://tracing or https://ui.perfetto.dev).
+# Made by GlitchFL (credit required if you share)
+#
+# Off by default: span()/@traced cost one global lookup until a Tracer is activated
+# with `with tracing(Tracer()):`.
+
+import os
+import json
+import time
+import threading
+import functools
+from pathlib import Path
+
+TRACE_DIR = Path.home() / "Documents" / "ValorantTrueStretch_Traces"
+
+_active = None
+
+class Tracer:
+    def __init__(self):
+        self.events = []    # (name, start_ns, end_ns, thread id, args)
+        self.t0 = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def add(self, name, start_ns, end_ns, args=None):
+        ev = (name, start_ns, end_ns, threading.get_ident(), args)
+        with self._lock:
+            self.events.append(ev)
+
+    def summary(self):
+        """[(name, count, total s, max s)], largest total first."""
+        agg = {}
+        for name, s, e, _tid, _args in self.events:
+            n, tot, mx = agg.get(name, (0, 0, 0))
+            agg[name] = (n + 1, tot + e - s, max(mx, e - s))
+        rows = [(name, n, tot / 1e9, mx / 1e9) for name, (n, tot, mx) in agg.items()]
+        return sorted(rows, key=lambda r: r[2], reverse=True)
+
+    def log_summary(self, log_func, title="Timings"):
+        rows = self.summary()
+        if not rows:
+            return
+        log_func(f"\n{title} (stage: calls, total, max):", tag="info")
+        for name, n, tot, mx in rows:
+            log_func(f"  {name:<20} {n:>6}  {tot * 1000:9.2f} ms  {mx * 1000:8.2f} ms", tag="muted")
+
+    def chrome_trace(self):
+        tids = {}
+        events = []
+        for name, s, e, tid, args in sorted(self.events, key=lambda ev: ev[1]):
+            ev = {
+                "name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": os.getpid(),
+                "tid": tids.setdefault(tid, len(tids) + 1),
+                "ts": (s - self.t0) / 1000, "dur": (e - s) / 1000,
+            }
+            if args:
+                ev["args"] = args
+            events.append(ev)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return path
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer, self.name, self.args = tracer, name, args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL = _NullSpan()
+
+def span(name, **args):
+    """Context manager timing one stage while a Tracer is active (a shared no-op otherwise)."""
+    t = _active
+    return _NULL if t is None else _Span(t, name, args or None)
+
+def traced(name):
+    """Decorator: time every call of the function as a `name` span while tracing."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            t = _active
+            if t is None:
+                return fn(*a, **kw)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*a, **kw)
+            finally:
+                t.add(name, start, time.perf_counter_ns())
+        return wrapper
+    return deco
+
+class tracing:
+    """`with tracing(tracer):` records spans from every thread into `tracer` (None = off)."""
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def __enter__(self):
+        global _active
+        self._prev, _active = _active, self.tracer
+        return self.tracer
+
+    def __exit__(self, *exc):
+        global _active
+        _active = self._prev
+        return False
+
+def trace_path(run_id):
+    return TRACE_DIR / f"trace_{run_id}.json"
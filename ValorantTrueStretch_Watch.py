@@ -0,0 +1,135 @@
+# ValorantTrueStretch_Watch.py
+# Watch mode: keep true stretch applied while VALORANT rewrites GameUserSettings.ini
+# (after patches or in-game settings changes).
+# Made by GlitchFL (credit required if you share)
+#
+# The root and account GUS files are stat()ed on a timer. A file whose (size, mtime)
+# changed is re-processed once it has held still for one poll (the game may write it in
+# several steps). The poll interval starts at `min_interval` after any activity and
+# doubles while idle up to `max_interval`, so a rewrite is re-stretched within about
+# max_interval + min_interval and an idle watch costs a few stat() calls every few seconds.
+# The native check runs once at start: afterwards the root file holds the target values.
+# The edit profile is compiled once by the caller and reused for every re-apply.
+# Each pass that writes (the initial apply, then every poll with re-applies) is one backup
+# run and one apply in the metrics, and the backup store is pruned after it, so a long
+# session stays within budget.
+
+import threading
+from pathlib import Path
+
+from ValorantTrueStretch_Metrics import inc
+from ValorantTrueStretch_Engine import (
+    read_doc, native_check_ok, process_gus, invalidate_discovery, new_run_id, prune_backups,
+    ROOT_LABEL, STATUS_UPDATED, JOURNAL_DIR,
+    root_gus, native_gate, stat_key, discovery_inputs, user_targets, all_account_targets,
+)
+
+MIN_INTERVAL = 0.25
+MAX_INTERVAL = 4.0
+
+class Watcher:
+    def __init__(self, base: Path, nx, ny, tx, ty, log_func, force=False, all_accounts=False,
+                 backup_dir: Path | None = None, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                 profile=None, journal_dir: Path = JOURNAL_DIR):
+        self.base = Path(base)
+        self.native, self.target = (nx, ny), (tx, ty)
+        self.log = log_func
+        self.force, self.all_accounts = force, all_accounts
+        self.backup_dir = backup_dir
+        self.profile = profile
+        self.journal_dir = journal_dir
+        self.min_interval, self.max_interval = min_interval, max(min_interval, max_interval)
+        self.targets = []       # [(path, label)], root first
+        self.reapplied = 0      # files re-stretched after a rewrite
+        self._keys = {}         # path -> stat key after our last look at it
+        self._pending = {}      # path -> stat key seen changed, waiting to settle
+        self._deps = {}         # discovery input -> stat key
+
+    def start(self):
+        """Native-check, resolve targets and stretch them once; False if the native check fails."""
+        gus_root = root_gus(self.base)
+        if not native_gate(gus_root, native_check_ok(read_doc(gus_root), *self.native, self.profile), *self.native,
+                            self.force, self.log):
+            return False
+        self._retarget()
+        run_id = new_run_id()
+        written = [self._process(path, label, run_id) == STATUS_UPDATED for path, label in self.targets]
+        self._pass_done(run_id, any(written))
+        self._deps = self._dep_keys()       # after our writes: replacing the root file touches WindowsClient/
+        self.log(f"\nWatching {len(self.targets)} file(s) under {self.base}.", tag="info")
+        return True
+
+    def _dep_keys(self):
+        return {p: stat_key(p) for p in discovery_inputs(self.base)}
+
+    def _retarget(self):
+        # LastKnownUser or the account folders changed: pick up the new set of files
+        invalidate_discovery(self.base)
+        root = (self.base / "WindowsClient" / "GameUserSettings.ini", ROOT_LABEL)
+        users = all_account_targets(self.base, self.log) if self.all_accounts else user_targets(self.base, self.log)
+        self.targets = [root] + users
+        live = {p for p, _ in self.targets}
+        for d in (self._keys, self._pending):
+            for p in [p for p in d if p not in live]:
+                del d[p]
+
+    def _process(self, path, label, run_id):
+        try:
+            status = process_gus(path, *self.target, True, label, self.log, self.backup_dir, run_id,
+                                 self.profile, self.journal_dir)
+        except (OSError, RuntimeError, ValueError) as e:
+            self.log(f"[!] {label}: {e}", tag="error")
+            status = None
+        self._keys[path] = stat_key(path)  # our own write is not a rewrite
+        return status
+
+    def _pass_done(self, run_id, wrote):
+        # A pass that wrote is one apply (as apply_plan counts a plan) and one backup run
+        if not wrote:
+            return
+        inc("vts_applies_total")
+        if self.backup_dir:
+            try:
+                prune_backups(self.backup_dir, keep_run=run_id)
+            except OSError as e:
+                self.log(f"[!] Backup prune failed: {e}", tag="error")
+
+    def poll(self):
+        """One stat() pass; re-processes files whose rewrite has settled. True if anything moved."""
+        deps = self._dep_keys()
+        if deps != self._deps:
+            self._deps = deps
+            self._retarget()
+            return True
+        active = False
+        run_id = None           # one backup run per pass that re-applies something
+        reapplied = self.reapplied
+        for path, label in self.targets:
+            key = stat_key(path)
+            if path in self._keys and key == self._keys[path]:
+                self._pending.pop(path, None)
+                continue
+            active = True
+            if self._pending.get(path, ...) != key:
+                self._pending[path] = key   # still being written (or just appeared): look again next poll
+                continue
+            del self._pending[path]
+            if key is None:
+                self._keys[path] = None
+                continue
+            self.log(f"\nRewrite detected: {label}", tag="warning")
+            run_id = run_id or new_run_id()
+            if self._process(path, label, run_id) == STATUS_UPDATED:
+                self.reapplied += 1
+        if run_id is not None:
+            self._pass_done(run_id, self.reapplied > reapplied)
+            self._deps = self._dep_keys()
+        return active
+
+    def run(self, stop: threading.Event | None = None):
+        """Poll until `stop` is set, backing off while nothing changes."""
+        stop = stop or threading.Event()
+        interval = self.min_interval
+        while not stop.wait(interval):
+            busy = self.poll() or bool(self._pending)
+            interval = self.min_interval if busy else min(interval * 2, self.max_interval)
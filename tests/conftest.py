@@ -0,0 +1,7 @@
+# The tool is a set of flat ValorantTrueStretch_*.py scripts; make them importable from tests/
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
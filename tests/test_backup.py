@@ -0,0 +1,70 @@
+# Content-addressed backup store: batched backups, catalog lookups and rollback.
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import ValorantTrueStretch_Journal as journal
+from ValorantTrueStretch_Backup import BackupStore
+
+def _files(tmp_path, n):
+    paths = []
+    for i in range(n):
+        p = tmp_path / "cfg" / f"f{i}.ini"
+        p.parent.mkdir(exist_ok=True)
+        p.write_bytes(b"ResolutionSizeX=%d\n" % (2560 + i % 2))
+        paths.append(p)
+    return paths
+
+def test_backup_many_writes_one_manifest(tmp_path, monkeypatch):
+    store = BackupStore(tmp_path / "backups")
+    saves = []
+    save = store._save_manifest
+    monkeypatch.setattr(store, "_save_manifest", lambda man: (saves.append(len(man["entries"])), save(man)))
+    paths = _files(tmp_path, 12)
+    with ThreadPoolExecutor(4) as pool:
+        blobs = store.backup_many([(p, None, f"diff {p.name}") for p in paths], "run1",
+                                  map_func=lambda fn, xs: list(pool.map(fn, xs)))
+    assert saves == [12]
+    assert len(set(blobs)) == 2                    # identical bodies share a blob
+    assert [e["src"] for e in store.load_manifest("run1")["entries"]] == [str(p) for p in paths]
+    assert len(store.catalog.run_entries("run1")) == 12
+    assert store.get_blob(store.catalog.latest(paths[3])["patch"]) == b"diff f3.ini"
+
+    store.backup(paths[0], "run1", data=b"later\n")    # appends to the same run
+    assert len(store.load_manifest("run1")["entries"]) == 13
+    assert store.get_blob(store.catalog.latest(paths[0])["sha256"]) == b"later\n"
+    first = {e["src"]: e for e in store.catalog.run_entries("run1")}
+    assert store.get_blob(first[str(paths[0])]["sha256"]) == b"ResolutionSizeX=2560\n"
+
+def test_rollback_restores_the_last_apply(tmp_path):
+    store = BackupStore(tmp_path / "backups")
+    paths = _files(tmp_path, 3)
+    old = [p.read_bytes() for p in paths]
+    store.backup_many([(p, None, None) for p in paths], "run1")
+    for p in paths:
+        p.write_bytes(b"ResolutionSizeX=1280\n")
+    run_id, restored = store.rollback(journal_dir=tmp_path / "journal")
+    assert run_id == "run1" and len(restored) == 3
+    assert [p.read_bytes() for p in paths] == old
+    assert store.rollback("run1", journal_dir=tmp_path / "journal")[1] == []   # already back
+    undo = store.catalog.last_run("restore")["run_id"]   # the rollback itself can be undone
+    assert store.rollback(undo, journal_dir=tmp_path / "journal")[1]
+    assert [p.read_bytes() for p in paths] == [b"ResolutionSizeX=1280\n"] * 3
+
+def test_failed_rollback_restores_nothing(tmp_path, monkeypatch):
+    store = BackupStore(tmp_path / "backups")
+    paths = _files(tmp_path, 3)
+    store.backup_many([(p, None, None) for p in paths], "run1")
+    for p in paths:
+        p.write_bytes(b"ResolutionSizeX=1280\n")
+    write = journal._write_durable
+
+    def flaky(path, data):
+        if ".f1.ini." in path.name:
+            raise OSError("disk full")
+        write(path, data)
+
+    monkeypatch.setattr(journal, "_write_durable", flaky)
+    with pytest.raises(OSError):
+        store.rollback("run1", journal_dir=tmp_path / "journal")
+    assert [p.read_bytes() for p in paths] == [b"ResolutionSizeX=1280\n"] * 3
@@ -0,0 +1,43 @@
+# State cache: unchanged files are skipped with one stat, racily-clean entries are not trusted.
+import os
+import time
+
+import ValorantTrueStretch_Engine as engine
+from ValorantTrueStretch_Cache import StateCache
+from ValorantTrueStretch_Synth import gus_text, TARGET
+
+def _age(path, seconds=10):
+    t = time.time_ns() - seconds * 1_000_000_000
+    os.utime(path, ns=(t, t))
+
+def test_racy_entry_is_not_trusted(tmp_path):
+    gus = tmp_path / "GameUserSettings.ini"
+    gus.write_text("ResolutionSizeX=1280\n")
+    cache = StateCache(tmp_path / "state.json")
+    key, _ = cache.lookup(gus)
+    cache.record(gus, *key, "d", "1280x1024", {})
+    assert cache.lookup(gus) == (key, None)                     # mtime too close to when it was seen
+
+    _age(gus)
+    key, _ = cache.lookup(gus)
+    cache.record(gus, *key, "d", "1280x1024", {})
+    cache.save()
+    assert StateCache(tmp_path / "state.json").lookup(gus)[1]["target"] == "1280x1024"
+
+    gus.write_text("ResolutionSizeX=1920\n")                    # same size, new mtime
+    assert StateCache(tmp_path / "state.json").lookup(gus)[1] is None
+
+def test_unchanged_file_is_not_read_again(tmp_path, monkeypatch):
+    gus = tmp_path / "GameUserSettings.ini"
+    gus.write_text(gus_text(40), encoding="utf-8")
+    gus.write_bytes(engine.plan_gus(gus, "root", *TARGET)[0].new_bytes)
+    _age(gus)
+    cache = StateCache(tmp_path / "state.json")
+    fp, _ = engine.plan_gus(gus, "root", *TARGET, cache=cache)
+    assert not fp.changed and fp.old_bytes is not None          # read once, recorded as at target
+
+    def no_read(path):
+        raise AssertionError(f"{path} was read")
+    monkeypatch.setattr(engine, "read_snapshot", no_read)
+    fp, _ = engine.plan_gus(gus, "root", *TARGET, cache=cache)
+    assert not fp.changed and fp.old_bytes is None
@@ -0,0 +1,68 @@
+# Display mode index and desktop changes against the in-memory FakeDisplay backend.
+import pytest
+
+from ValorantTrueStretch_Display import (
+    ModeIndex, FakeDisplay, mode_index, invalidate_modes, change_desktop_resolution,
+)
+
+MODES = [
+    (2560, 1440, 165, 32), (2560, 1440, 144, 32), (2560, 1440, 60, 32),
+    (1920, 1080, 144, 32), (1920, 1080, 60, 32), (1920, 1080, 60, 16),
+    (1280, 1024, 75, 32), (1280, 1024, 60, 32),
+    (1440, 1080, 60, 32),
+]
+
+@pytest.fixture(autouse=True)
+def _fresh_index():
+    invalidate_modes()
+    yield
+    invalidate_modes()
+
+def test_lookup():
+    idx = ModeIndex(MODES)
+    assert len(idx) == 4
+    assert idx.labels == ["2560x1440", "1920x1080", "1440x1080", "1280x1024"]
+    assert idx.supports(1280, 1024) and not idx.supports(1280, 960)
+    assert idx.refresh_rates(2560, 1440) == [165, 144, 60]
+    assert idx.bit_depths(1920, 1080) == [32, 16]
+    assert idx.filter("x1080") == ["1920x1080", "1440x1080"]
+    assert idx.filter(" 1280 × 10 ") == ["1280x1024"]
+    assert idx.filter("") == idx.labels
+
+def test_best_mode_falls_back_to_nearest_available():
+    idx = ModeIndex(MODES)
+    assert idx.best(2560, 1440, 144, 32) == (144, 32)     # exact match kept
+    assert idx.best(1280, 1024, 165, 32) == (75, 32)      # no 165 Hz: highest rate
+    assert idx.best(1920, 1080, 60, 24) == (60, 32)       # rate kept, deepest colour
+    assert idx.best(1920, 1080) == (144, 32)
+    assert idx.best(1280, 960) is None
+
+def test_modes_enumerated_once_per_adapter():
+    fake = FakeDisplay(MODES)
+    for _ in range(3):
+        assert mode_index(fake).supports(1920, 1080)
+    assert fake.enumerations == 1
+    other = FakeDisplay(MODES, adapter="Second Adapter")
+    mode_index(other)
+    assert other.enumerations == 1
+    mode_index(fake, refresh=True)
+    assert fake.enumerations == 2
+
+def test_set_and_restore_keeps_refresh_rate():
+    fake = FakeDisplay(MODES, current=(2560, 1440, 144, 32))
+    original = fake.current()
+
+    ok, msg = change_desktop_resolution(1280, 1024, backend=fake)
+    assert ok, msg
+    assert fake.current() == (1280, 1024, 75, 32)         # 144 Hz unavailable: best rate there
+
+    ok, msg = change_desktop_resolution(*original[:2], backend=fake)
+    assert ok, msg
+    assert fake.current() == (2560, 1440, 165, 32)        # 75 Hz unavailable back home either
+    assert fake.applied == [(1280, 1024, 75, 32), (2560, 1440, 165, 32)]
+
+def test_unsupported_target_is_rejected_without_a_mode_change():
+    fake = FakeDisplay(MODES, current=(2560, 1440, 144, 32))
+    ok, msg = change_desktop_resolution(1280, 960, backend=fake)
+    assert not ok and "1280x960" in msg
+    assert fake.applied == [] and fake.current() == (2560, 1440, 144, 32)
@@ -0,0 +1,82 @@
+# Engine: account discovery, byte-exact edits, plan freshness.
+import codecs
+
+import pytest
+
+from ValorantTrueStretch_Engine import (
+    discover, discovery_inputs, invalidate_discovery, stat_key, build_plan, apply_plan, parse_doc,
+    STATUS_UPDATED,
+)
+from ValorantTrueStretch_Profiles import DEFAULT_PROFILE
+from ValorantTrueStretch_Synth import synth_tree, NATIVE, TARGET
+
+def _base(tmp_path):
+    base = tmp_path / "Config"
+    (base / "WindowsClient").mkdir(parents=True)
+    (base / "WindowsClient" / "RiotLocalMachine.ini").write_text("[Settings]\nLastKnownUser=abc\n")
+    (base / "abc-eu").mkdir()
+    (base / "abc-na").mkdir()
+    return base
+
+def test_discovery_sees_a_new_config_dir_in_an_account_folder(tmp_path):
+    base = _base(tmp_path)
+    invalidate_discovery()
+    assert discover(base).user_folder() == base / "abc-eu"      # tie: first by name
+    deps = {p: stat_key(p) for p in discovery_inputs(base)}
+    assert discover(base) is discover(base)                     # cached while nothing changed
+
+    (base / "abc-na" / "WindowsClient").mkdir()                 # the game created the other account's config
+    assert discover(base).user_folder() == base / "abc-na"
+    assert {p: stat_key(p) for p in discovery_inputs(base)} != deps   # watchers and plans notice too
+
+TEXT = "[S]\r\nResolutionSizeX=2560\r\nName=Jos\u00e9\r\nHDRDisplayOutputNits=1000\r\nFullscreenMode=0"
+EDITED = ("[S]\r\nResolutionSizeX=1280\r\nName=Jos\u00e9\r\nHDRDisplayOutputNits=1000\r\nFullscreenMode=2\r\n"
+          "ResolutionSizeY=1024\r\nLastUserConfirmedResolutionSizeX=1280\r\n")
+
+@pytest.mark.parametrize("bom, enc", [
+    (b"", "utf-8"), (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"), (b"", "utf-16-le"), (b"", "utf-16-be"),
+])
+def test_encoding_round_trip(bom, enc):
+    raw = bom + TEXT.encode(enc)
+    doc, encode = parse_doc(raw)
+    assert encode() == raw                                      # nothing edited: same bytes
+    DEFAULT_PROFILE.apply(doc, *TARGET)
+    new = encode()
+    assert new.startswith(bom + EDITED.encode(enc))             # same BOM, encoding and CRLF
+
+def test_invalid_utf8_bytes_are_kept():
+    raw = b"[S]\nJunk=\xff\xfe\x80\n\xc3(\nResolutionSizeX=2560\n"
+    doc, encode = parse_doc(raw)
+    doc.set("ResolutionSizeX", "1280")
+    assert encode() == raw.replace(b"2560", b"1280")
+
+def _logger(log):
+    return lambda msg, tag=None: log.append(msg)
+
+def _plan(tmp_path, log):
+    base = synth_tree(tmp_path / "root", accounts=2)
+    return build_plan(base, *NATIVE, *TARGET, False, _logger(log))
+
+def test_apply_writes_the_previewed_bytes(tmp_path):
+    log = []
+    plan = _plan(tmp_path, log)
+    assert plan.matches(plan.base, *NATIVE, *TARGET, False) and not plan.matches(plan.base, *NATIVE, *TARGET, True)
+    assert plan.is_fresh()
+    applied, statuses = apply_plan(plan, _logger(log), None, journal_dir=tmp_path / "journal")
+    assert applied is plan                                      # fresh: reused, not rebuilt
+    assert set(statuses.values()) == {STATUS_UPDATED}
+    for fp in plan.files:
+        assert fp.path.read_bytes() == fp.new_bytes
+    assert not plan.is_fresh()                                  # the preview no longer describes the disk
+
+def test_stale_plan_is_rebuilt(tmp_path):
+    log = []
+    plan = _plan(tmp_path, log)
+    fp = plan.files[-1]
+    fp.path.write_bytes(fp.old_bytes + b"Extra=1\n")          # edited after the preview
+    assert not plan.is_fresh()
+    applied, _ = apply_plan(plan, _logger(log), None, journal_dir=tmp_path / "journal")
+    assert applied is not plan
+    assert any("changed since the preview" in msg for msg in log)
+    assert fp.path.read_bytes().endswith(b"Extra=1\n") and fp.path.read_bytes() != fp.new_bytes
@@ -0,0 +1,98 @@
+# Fleet agent and orchestrator over localhost TCP against a synthetic config tree.
+import time
+import socket
+import asyncio
+
+from ValorantTrueStretch_Synth import synth_tree
+from ValorantTrueStretch_Fleet import Agent, Orchestrator
+
+JOB = {"native": "2560x1440", "target": "1280x1024", "apply": True, "force": False, "all_accounts": False}
+
+def _statuses(r):
+    return sorted(set(r.result["files"].values()))
+
+async def _with_agent(agent, fn):
+    server = await agent.serve("127.0.0.1", 0)
+    host = "127.0.0.1:%d" % server.sockets[0].getsockname()[1]
+    try:
+        return await fn(host)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+def test_push_to_a_local_agent(tmp_path):
+    base = synth_tree(tmp_path / "root", accounts=2)
+    agent = Agent(base, token="s3cret", backup_dir=tmp_path / "backups", journal_dir=tmp_path / "journal")
+
+    async def push(host):
+        orch = Orchestrator([host], token="s3cret", timeout=30)
+        try:
+            [check] = await orch.run("check", native=JOB["native"])
+            [first] = await orch.run("run", **JOB)
+            [again] = await orch.run("run", **JOB | {"force": True})  # root no longer at native
+        finally:
+            await orch.close()
+        return check, first, again
+
+    check, first, again = asyncio.run(_with_agent(agent, push))
+    assert check.ok and check.result["native_ok"]
+    assert first.ok and first.result["ok"] and first.attempts == 1
+    assert _statuses(first) == ["updated"]
+    assert _statuses(again) == ["unchanged"]
+    assert "ResolutionSizeX=1280" in (base / "WindowsClient" / "GameUserSettings.ini").read_text()
+    assert list((tmp_path / "journal").iterdir()) == []
+
+def test_bad_token_is_not_retried(tmp_path):
+    agent = Agent(synth_tree(tmp_path / "root", accounts=1), token="s3cret", backup_dir=None,
+                  journal_dir=tmp_path / "journal")
+
+    async def push(host):
+        orch = Orchestrator([host], token="wrong", retries=2, backoff=0.01)
+        try:
+            return (await orch.run("ping"))[0]
+        finally:
+            await orch.close()
+
+    r = asyncio.run(_with_agent(agent, push))
+    assert not r.ok and r.attempts == 1 and "token" in r.error
+
+def test_dead_host_is_retried_then_reported():
+    with socket.socket() as s:      # a port nothing listens on once it is closed
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    async def push():
+        orch = Orchestrator([f"127.0.0.1:{port}"], retries=2, backoff=0.01, timeout=5)
+        try:
+            return (await orch.run("run", **JOB))[0]
+        finally:
+            await orch.close()
+
+    r = asyncio.run(push())
+    assert not r.ok and r.attempts == 3
+    assert r.error.startswith(("ConnectionRefusedError", "OSError"))
+
+def test_retry_after_timeout_does_not_rerun_the_apply(tmp_path):
+    agent = Agent(synth_tree(tmp_path / "root", accounts=1), backup_dir=tmp_path / "backups",
+                  journal_dir=tmp_path / "journal")
+    runs = []
+    run = agent._run
+
+    def slow_run(req):
+        runs.append(req["key"])
+        time.sleep(0.6)
+        return run(req)
+
+    agent._run = slow_run
+
+    async def push(host):
+        orch = Orchestrator([host], timeout=0.4, retries=3, backoff=0.01)
+        try:
+            return (await orch.run("run", **JOB))[0]
+        finally:
+            await orch.close()
+
+    r = asyncio.run(_with_agent(agent, push))
+    assert r.ok and r.attempts > 1
+    assert _statuses(r) == ["updated"]
+    assert len(runs) == 1
@@ -0,0 +1,93 @@
+# IniDocument edits, and edit-list diffs against difflib: file_diff() must print exactly what
+# difflib.unified_diff would.
+import random
+import difflib
+
+import pytest
+
+from ValorantTrueStretch_Engine import file_diff, parse_doc, _TextLines
+from ValorantTrueStretch_Ini import IniDocument, FULLSCREEN_KEY
+from ValorantTrueStretch_Profiles import DEFAULT_PROFILE
+from ValorantTrueStretch_Synth import gus_text
+
+KEYS = ["A", "B", "C", "HDRDisplayOutputNits", "FullscreenMode"]
+
+SAMPLE = (b"[S]\r\nResolutionSizeX=2560\r\n; keep \xff me\r\nHDRDisplayOutputNits=1000\r\n"
+          b"FullscreenMode=0\r\nFullscreenMode=1\r\nResolutionSizeX=1920\r\nOther=x")
+
+def test_document_index_and_edits():
+    doc = IniDocument.from_bytes(SAMPLE)
+    assert doc.index["ResolutionSizeX"] == [1, 6]
+    assert doc.get("ResolutionSizeX") == "1920"                 # last occurrence wins
+    assert doc.section_of(6) == "S"
+
+    doc.update({"ResolutionSizeX": 1280, "ResolutionSizeY": 1024})
+    doc.ensure_hdr_and_fullscreen()
+    assert doc.get("ResolutionSizeX") == "1280" and doc.get("ResolutionSizeY") == "1024"
+    assert doc.check({"ResolutionSizeX": "1280", FULLSCREEN_KEY: "2"}) == (True, None, None)
+    assert doc.check({"ResolutionSizeX": "2560"}) == (False, "ResolutionSizeX", "1280")
+    assert doc.text() == (b"[S]\r\nResolutionSizeX=1280\r\n; keep \xff me\r\nHDRDisplayOutputNits=1000\r\n"
+                          b"FullscreenMode=2\r\nResolutionSizeX=1280\r\nOther=x\r\nResolutionSizeY=1024\r\n")
+    assert doc.lines()[2] is doc.src[2]                          # untouched lines are the source objects
+
+def test_pin_after_appends_both_without_the_key():
+    doc = IniDocument.from_bytes(b"[S]\nFullscreenMode=1\n")
+    doc.ensure_hdr_and_fullscreen()
+    assert doc.text() == b"[S]\nHDRDisplayOutputNits=1000\nFullscreenMode=2\n"
+
+def test_unchanged_document_is_not_changed():
+    doc = IniDocument.from_bytes(b"ResolutionSizeX=1280\nHDRDisplayOutputNits=1000\nFullscreenMode=2\n")
+    doc.set("ResolutionSizeX", "1280")
+    doc.ensure_hdr_and_fullscreen()
+    assert not doc.changed
+
+def _diffs(doc):
+    a, b = _TextLines(doc.src), _TextLines(doc.lines())
+    want = "".join(difflib.unified_diff(a[:], b[:], "x (current)", "x (new)", n=3))
+    return file_diff(a, b, "x", doc), want
+
+def _random_doc(rng):
+    lines = []
+    for _ in range(rng.choice((5, 20, 60, 250))):
+        r = rng.random()
+        lines.append("\n" if r < 0.15 else "[S]\n" if r < 0.2 else f"{rng.choice(KEYS)}={rng.choice('0123')}\n")
+    if rng.random() < 0.2:
+        lines[-1] = lines[-1].rstrip("\n")
+    doc, _ = parse_doc("".join(lines).encode())
+    for _ in range(rng.randint(1, 5)):
+        if rng.random() < 0.5:
+            doc.set(rng.choice(KEYS + ["New"]), rng.choice("0123x"))
+        else:
+            key, follow = rng.sample(KEYS, 2)
+            doc.pin_after(key, rng.choice("0123"), follow, rng.choice("0123"), rng.random() < 0.5)
+    return doc
+
+@pytest.mark.parametrize("text", [
+    "[S]\nA=1\nB=1\nB=1\nC=1\n",            # dropped line next to a copy of itself
+    "[S]\nA=1\n\nHDRDisplayOutputNits=5\n\n",  # edit between blank lines
+    "A=1\nB=2\nC=3",                        # appended after a last line with no line break
+    "HDRDisplayOutputNits=1\nB=2\nB=1\nC=2\nB=2\n",
+])
+def test_tricky_edits_match_difflib(text):
+    doc, _ = parse_doc(text.encode())
+    doc.set("B", "9")
+    doc.set("New", "1")
+    doc.pin_after("HDRDisplayOutputNits", "1000", "FullscreenMode", "2")
+    ours, want = _diffs(doc)
+    assert ours == want
+
+def test_random_edits_match_difflib():
+    rng = random.Random(3)
+    for _ in range(1500):
+        doc = _random_doc(rng)
+        if doc.changed:
+            ours, want = _diffs(doc)
+            assert ours == want
+
+@pytest.mark.parametrize("n", [40, 2000])
+def test_game_files_use_the_edit_list(n):
+    doc, _ = parse_doc(gus_text(n, order="shuffled", rng=random.Random(n)).encode())
+    DEFAULT_PROFILE.apply(doc, 1280, 1024)
+    assert not doc.ambiguous()              # no whole-file matching for a normal config
+    ours, want = _diffs(doc)
+    assert ours == want
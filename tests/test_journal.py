@@ -0,0 +1,78 @@
+# Journal transactions: all-or-nothing commits and recovery of interrupted ones.
+import hashlib
+
+import pytest
+
+from ValorantTrueStretch_Journal import (
+    Transaction, recover, pending, STAGING, PREPARED, _temp_for, _write_journal, _lock_path, _try_lock, _unlock,
+)
+
+def _targets(tmp_path, n=3):
+    paths = []
+    for i in range(n):
+        p = tmp_path / f"f{i}.ini"
+        p.write_bytes(b"old %d\n" % i)
+        paths.append(p)
+    return paths
+
+def _interrupted(journal_dir, paths, state):
+    """A journal left in `state` by a process that died, with every temp staged."""
+    txn = Transaction(journal_dir)
+    files = []
+    for i, p in enumerate(paths):
+        data = b"new %d\n" % i
+        tmp = _temp_for(p, txn.id)
+        tmp.write_bytes(data)
+        files.append({"path": str(p), "tmp": str(tmp), "sha256": hashlib.sha256(data).hexdigest()})
+    journal_dir.mkdir(parents=True, exist_ok=True)
+    _write_journal(txn.journal, txn._doc(state, files))
+    return txn
+
+def _leftovers(tmp_path):
+    return sorted(p.name for p in tmp_path.glob(".*.tmp"))
+
+def test_commit_replaces_every_file(tmp_path):
+    paths = _targets(tmp_path)
+    jd = tmp_path / "journal"
+    done = Transaction(jd).commit([(p, b"new %d\n" % i) for i, p in enumerate(paths)])
+    assert done == paths
+    assert [p.read_bytes() for p in paths] == [b"new 0\n", b"new 1\n", b"new 2\n"]
+    assert _leftovers(tmp_path) == [] and list(jd.iterdir()) == []
+
+def test_failed_staging_replaces_nothing(tmp_path):
+    paths = _targets(tmp_path)
+    jd = tmp_path / "journal"
+    items = [(p, b"new\n") for p in paths] + [(tmp_path / "missing" / "f.ini", b"new\n")]
+    with pytest.raises(OSError):
+        Transaction(jd).commit(items)
+    assert [p.read_bytes() for p in paths] == [b"old 0\n", b"old 1\n", b"old 2\n"]
+    assert _leftovers(tmp_path) == [] and pending(jd) == []
+
+def test_recover_rolls_prepared_forward(tmp_path):
+    paths = _targets(tmp_path)
+    jd = tmp_path / "journal"
+    txn = _interrupted(jd, paths, PREPARED)
+    assert recover(jd) == [(txn.id, "rolled forward")]
+    assert [p.read_bytes() for p in paths] == [b"new 0\n", b"new 1\n", b"new 2\n"]
+    assert _leftovers(tmp_path) == [] and list(jd.iterdir()) == []
+
+def test_recover_rolls_staging_back(tmp_path):
+    paths = _targets(tmp_path)
+    jd = tmp_path / "journal"
+    txn = _interrupted(jd, paths, STAGING)
+    assert recover(jd) == [(txn.id, "rolled back")]
+    assert [p.read_bytes() for p in paths] == [b"old 0\n", b"old 1\n", b"old 2\n"]
+    assert _leftovers(tmp_path) == [] and list(jd.iterdir()) == []
+
+def test_recover_leaves_a_live_transaction_alone(tmp_path):
+    paths = _targets(tmp_path)
+    jd = tmp_path / "journal"
+    txn = _interrupted(jd, paths, STAGING)
+    lock_path = _lock_path(jd, txn.id)
+    lock = _try_lock(lock_path)         # the "owner" is still committing
+    try:
+        assert recover(jd) == []
+        assert pending(jd) == [txn.journal] and len(_leftovers(tmp_path)) == 3
+    finally:
+        _unlock(lock, lock_path)
+    assert recover(jd) == [(txn.id, "rolled back")]
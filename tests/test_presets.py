@@ -0,0 +1,66 @@
+# Preset store: append-only log, compaction, torn-line recovery; and the type-ahead index.
+import json
+
+import ValorantTrueStretch_Presets as presets_mod
+from ValorantTrueStretch_Presets import PresetStore, PresetIndex, DEFAULT_PRESETS
+
+P = {"name": "x", "native": "1920x1080", "target": "1440x1080"}
+
+def _names(store):
+    return [p["name"] for p in store.presets]
+
+def test_edits_survive_reload(tmp_path):
+    store = PresetStore(tmp_path / "presets.json")
+    store.add(P)
+    store.move(3, 0)
+    store.remove(1)
+    assert store.dirty
+    store.flush()
+    assert not store.dirty and not store.path.exists()          # only the log was written
+    assert len(store.log_path.read_bytes().splitlines()) == 3
+
+    again = PresetStore(store.path)
+    assert _names(again) == _names(store) == ["x", DEFAULT_PRESETS[1]["name"], DEFAULT_PRESETS[2]["name"]]
+    again.remove(0)                                             # seq continues after the lazy load
+    again.flush()
+    assert json.loads(again.log_path.read_bytes().splitlines()[-1])["seq"] == 4
+    assert len(PresetStore(store.path).presets) == 2
+
+def test_torn_log_line_is_dropped(tmp_path, monkeypatch):
+    store = PresetStore(tmp_path / "presets.json")
+    store.add(P)
+    store.flush()
+    with open(store.log_path, "ab") as f:
+        f.write(b'{"seq": 2, "op": "rem')                      # interrupted append
+
+    def locked(*a):
+        raise OSError("locked")
+    monkeypatch.setattr(presets_mod.os, "truncate", locked)
+    assert _names(PresetStore(store.path))[-1] == "x"           # read-only log: torn line ignored
+    monkeypatch.undo()
+
+    assert _names(PresetStore(store.path))[-1] == "x"
+    assert store.log_path.read_bytes().endswith(b"\n")          # and trimmed when writable
+
+def test_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(presets_mod, "COMPACT_OPS", 4)
+    store = PresetStore(tmp_path / "presets.json")
+    for i in range(3):
+        store.add(dict(P, name=f"p{i}"))
+        store.flush()
+    old_log = store.log_path.read_bytes()
+    store.add(dict(P, name="p3"))
+    store.add(dict(P, name="p4"))
+    store.flush()
+    assert not store.log_path.exists()
+    assert json.loads(store.path.read_text(encoding="utf-8"))["seq"] == 5
+
+    store.log_path.write_bytes(old_log)                         # crash before the log was emptied
+    assert _names(PresetStore(store.path)) == _names(store)     # folded-in edits are not replayed
+
+def test_index_search():
+    idx = PresetIndex(DEFAULT_PRESETS)
+    assert idx.search("") == [0, 1, 2]
+    assert idx.search("1440") == [1, 2]
+    assert idx.search("1440 1024") == [1]
+    assert idx.search("1440") == [1, 2]
@@ -0,0 +1,66 @@
+# Edit profiles: compile cache, `extends` merging, TOML/JSON loading and validation errors.
+import sys
+
+import pytest
+
+from ValorantTrueStretch_Ini import IniDocument
+from ValorantTrueStretch_Profiles import (
+    compile_profile, load_profile, get_profile, DEFAULT_PROFILE, DEFAULT_NAME,
+)
+
+TOML = b'''version = 1
+name = "stretch-240fps"
+extends = "true-stretch"
+
+[set]
+FrameRateLimit = "240.000000"
+
+[[after]]
+key = "HDRDisplayOutputNits"
+value = "1000"
+follow = "FullscreenMode"
+follow_value = "1"
+'''
+
+def test_identical_documents_share_one_profile():
+    data = {"version": 1, "name": "p", "set": {"A": "{width}"}}
+    prof = compile_profile(data)
+    assert compile_profile(dict(data)) is prof
+    assert compile_profile(data | {"name": "q"}) is not prof
+    assert get_profile(DEFAULT_NAME) is DEFAULT_PROFILE is get_profile()
+    assert prof.updates(1280, 1024) == {"A": "1280"}
+    assert prof.updates(1280, 1024) is prof.updates(1280, 1024)     # resolved once per resolution
+
+def test_toml_profile_extends_the_builtin(tmp_path):
+    path = tmp_path / "p.toml"
+    path.write_bytes(TOML)
+    prof = load_profile(path)
+    assert load_profile(path) is prof and get_profile(str(path)) is prof
+    assert prof.updates(1280, 1024)["ResolutionSizeX"] == "1280"       # inherited
+    assert prof.updates(1280, 1024)["FrameRateLimit"] == "240.000000"
+    assert prof.check_keys == DEFAULT_PROFILE.check_keys
+    assert prof.target_key(1280, 1024) == f"1280x1024@stretch-240fps:{prof.digest}"
+
+    doc = IniDocument(["HDRDisplayOutputNits=0\n", "FullscreenMode=2\n"])
+    prof.apply(doc, 1280, 1024)
+    assert doc.lines()[:2] == ["HDRDisplayOutputNits=1000\n", "FullscreenMode=1\n"]   # child rule wins
+
+@pytest.mark.parametrize("data, msg", [
+    ({"version": 2}, "Unsupported profile version"),
+    ({"version": 1, "set": {"Bad Key": "1"}}, "not a valid INI key"),
+    ({"version": 1, "set": {"A": "{depth}"}}, "unknown placeholder"),
+    ({"version": 1, "set": {"A": "1\n2"}}, "single-line"),
+    ({"version": 1, "extends": "nope"}, "unknown profile"),
+    ({"version": 1, "after": [{"key": "A"}]}, "needs key, value"),
+])
+def test_invalid_profiles(data, msg):
+    with pytest.raises(ValueError, match=msg):
+        compile_profile(data)
+
+def test_toml_without_a_parser(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "tomllib", None)
+    monkeypatch.setitem(sys.modules, "tomli", None)
+    path = tmp_path / "p.toml"
+    path.write_bytes(TOML)
+    with pytest.raises(ValueError, match="use a .json profile"):
+        load_profile(path)
@@ -0,0 +1,37 @@
+# Headless entry points must start fast and never pull in the GUI stack.
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEADLESS = ("ValorantTrueStretch_Engine", "ValorantTrueStretch_CLI", "ValorantTrueStretch_Watch",
+            "ValorantTrueStretch_Fleet", "ValorantTrueStretch_Drift")
+GUI_ONLY = ("tkinter", "_tkinter", "ttkbootstrap", "ctypes")
+
+# Seconds for the imports alone (~0.1 s on a dev box); generous for slow CI machines
+STARTUP_BUDGET = 0.5
+
+def _import_in_fresh_python(mod):
+    code = (
+        "import sys, json, time\n"
+        "t = time.perf_counter()\n"
+        f"import {mod}\n"
+        "elapsed = time.perf_counter() - t\n"
+        f"loaded = sorted(m for m in sys.modules if m.split('.')[0] in {GUI_ONLY!r})\n"
+        "print(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+@pytest.mark.parametrize("mod", HEADLESS)
+def test_headless_import_skips_gui_modules(mod):
+    assert _import_in_fresh_python(mod)["loaded"] == []
+
+@pytest.mark.parametrize("mod", ("ValorantTrueStretch_Engine", "ValorantTrueStretch_CLI"))
+def test_headless_import_within_budget(mod):
+    best = min(_import_in_fresh_python(mod)["elapsed"] for _ in range(3))
+    assert best < STARTUP_BUDGET, f"importing {mod} took {best:.3f}s (budget {STARTUP_BUDGET}s)"
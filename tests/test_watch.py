@@ -0,0 +1,54 @@
+# Watch mode over a synthetic config tree: a rewrite by the "game" is re-stretched.
+import os
+
+from ValorantTrueStretch_Synth import synth_tree, gus_text, NATIVE, TARGET
+from ValorantTrueStretch_Watch import Watcher
+from ValorantTrueStretch_Metrics import Registry, collecting
+
+def _log(msg, tag=None):
+    pass
+
+def _resolution(path):
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [ln for ln in lines if ln.startswith("ResolutionSize")]
+
+def test_rewrite_is_restretched(tmp_path):
+    base = synth_tree(tmp_path / "root", accounts=2)
+    gus = base / "WindowsClient" / "GameUserSettings.ini"
+    w = Watcher(base, *NATIVE, *TARGET, _log, backup_dir=tmp_path / "backups", journal_dir=tmp_path / "journal")
+    assert w.start()
+    assert _resolution(gus) == ["ResolutionSizeX=1280", "ResolutionSizeY=1024"]
+    assert not w.poll()                     # our own writes are not rewrites
+
+    gus.write_text(gus_text(40, NATIVE), encoding="utf-8")
+    st = gus.stat()
+    os.utime(gus, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert _resolution(gus) == ["ResolutionSizeX=2560", "ResolutionSizeY=1440"]
+
+    assert w.poll()                         # seen changed: waits one poll to settle
+    assert w.reapplied == 0
+    assert w.poll()
+    assert w.reapplied == 1
+    assert _resolution(gus) == ["ResolutionSizeX=1280", "ResolutionSizeY=1024"]
+    assert not w.poll()
+    assert list((tmp_path / "journal").iterdir()) == []
+
+def test_native_check_failure_stops_the_watch(tmp_path):
+    base = synth_tree(tmp_path / "root", accounts=1, native=(1920, 1080))
+    assert not Watcher(base, *NATIVE, *TARGET, _log, journal_dir=tmp_path / "journal").start()
+
+def test_each_pass_that_writes_counts_one_apply(tmp_path):
+    base = synth_tree(tmp_path / "root", accounts=2)
+    gus = base / "WindowsClient" / "GameUserSettings.ini"
+    registry = Registry()
+    with collecting(registry):
+        w = Watcher(base, *NATIVE, *TARGET, _log, journal_dir=tmp_path / "journal")
+        assert w.start()                    # three files written: one apply
+        gus.write_text(gus_text(40, NATIVE), encoding="utf-8")
+        st = gus.stat()
+        os.utime(gus, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        w.poll()
+        w.poll()                            # one file re-stretched: one more
+        w.poll()
+    assert registry.counters["vts_applies_total"] == {(): 2}
+    assert registry.counters["vts_files_total"][(("status", "updated"),)] == 4